@@ -4,14 +4,61 @@ A.I.VOICE Editor API Python Wrapper
 A Python library for controlling A.I.VOICE Editor through its API.
 """
 
+import importlib
+from typing import TYPE_CHECKING
+
 from .aivoice_control import (
     AIVoiceTTsControl, 
     HostStatus, 
     TextEditMode,
     VoicePreset,
+    MasterControl,
+    VoicePresetSyncReport,
     Style,
-    MergedVoice
+    MergedVoice,
+    load_voice_presets,
 )
+from .audio import SynthesizedAudio, WavFormat, concatenate_wavs, read_wav
+from .cache import AudioCache, synthesis_key
+from .duration import DurationEstimator
+from .instrumentation import Instrumentation, InstrumentedTtsControl
+from .list_document import ListDocument, ListItem, ListSyncReport
+from .normalize import TextNormalizer, normalize_text
+from .trace import RecordedError, RecordingTtsControl, ReplayTtsControl, TraceMismatchError, load_trace
+
+# asyncio や concurrent.futures などの読み込みが重いオプション機能は、最初に参照したときに読み込む
+_LAZY_IMPORTS = {
+    "AsyncAIVoiceTTsControl": ".async_control",
+    "AIVoiceClient": ".client",
+    "AIVoiceClientError": ".client",
+    "DictionaryManager": ".dictionary",
+    "DictionaryType": ".dictionary",
+    "ControllerPool": ".pool",
+    "SimulatedTtsControl": ".simulator",
+    "SingleFlight": ".singleflight",
+}
+
+if TYPE_CHECKING:
+    from .async_control import AsyncAIVoiceTTsControl
+    from .client import AIVoiceClient, AIVoiceClientError
+    from .dictionary import DictionaryManager, DictionaryType
+    from .pool import ControllerPool
+    from .simulator import SimulatedTtsControl
+    from .singleflight import SingleFlight
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
 
 __version__ = "0.1.5"
 __author__ = "yupix"
@@ -23,5 +70,35 @@ __all__ = [
     "TextEditMode",
     "VoicePreset",
     "Style",
-    "MergedVoice"
+    "MergedVoice",
+    "MasterControl",
+    "VoicePresetSyncReport",
+    "load_voice_presets",
+    "SynthesizedAudio",
+    "WavFormat",
+    "read_wav",
+    "concatenate_wavs",
+    "AsyncAIVoiceTTsControl",
+    "AIVoiceClient",
+    "AIVoiceClientError",
+    "AudioCache",
+    "synthesis_key",
+    "DictionaryManager",
+    "DictionaryType",
+    "DurationEstimator",
+    "Instrumentation",
+    "InstrumentedTtsControl",
+    "ListDocument",
+    "ListItem",
+    "ListSyncReport",
+    "TextNormalizer",
+    "normalize_text",
+    "ControllerPool",
+    "SimulatedTtsControl",
+    "SingleFlight",
+    "RecordingTtsControl",
+    "ReplayTtsControl",
+    "RecordedError",
+    "TraceMismatchError",
+    "load_trace",
 ]
@@ -5,17 +5,36 @@ This module provides a Python interface for controlling A.I.VOICE Editor
 through its COM API.
 """
 
+from collections import OrderedDict
+import copy
 from enum import Enum
 import json
 import os
-import clr
+import shutil
+import tempfile
+import threading
+import time
+
+from .audio import SynthesizedAudio, default_temp_dir, read_wav, read_wav_format
+from .cache import AudioCache, synthesis_key
+from .duration import DurationEstimator, pause_settings
+from .instrumentation import Instrumentation, InstrumentedTtsControl
+from .list_document import ListItem
+from .text import split_sentences
+from .trace import RecordingTtsControl
 
 try:
-    from typing import Required, TypedDict, List
+    from typing import Required, TypedDict, Callable, Iterable, Iterator, List, Optional, Tuple, Union
 except ImportError:
     # Python < 3.11 のサポート
-    from typing import TypedDict, List
+    from typing import TypedDict, Callable, Iterable, Iterator, List, Optional, Tuple, Union
     from typing_extensions import Required
+from typing import TYPE_CHECKING, Any, Dict, TypeVar, cast
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future, ThreadPoolExecutor
+
+_T = TypeVar("_T")
 
 
 class HostStatus(Enum):
@@ -61,10 +80,222 @@ class VoicePreset(TypedDict, total=False):
     Styles: List[Style]  # スタイル設定のリスト
 
 
+class MasterControl(TypedDict, total=False):
+    """A.I.VOICE マスターコントロールの設定"""
+    Volume: float  # 音量 (0.0-5.0)
+    Speed: float  # 話速 (0.5-4.0)
+    Pitch: float  # 高さ (0.5-2.0)
+    PitchRange: float  # 抑揚 (0.0-2.0)
+    MiddlePause: int  # 短ポーズ時間 (ミリ秒)
+    LongPause: int  # 長ポーズ時間 (ミリ秒)
+    SentencePause: int  # 文末ポーズ時間 (ミリ秒)
+
+
+class VoicePresetSyncReport(TypedDict):
+    """sync_voice_presets() の結果"""
+    added: List[str]  # 追加したプリセット名
+    updated: List[str]  # 値を更新したプリセット名
+    unchanged: List[str]  # 変更が無かったプリセット名
+    reloaded: bool  # reload_voice_preset() を呼び出したかどうか
+
+
+def _named_items(values: list) -> bool:
+    """リストの要素がすべて Name を持つ辞書かどうか"""
+    return all(isinstance(value, dict) and "Name" in value for value in values)
+
+
+def _preset_value_differs(current, desired) -> bool:
+    """desired で指定された値が current と異なるかどうか
+
+    辞書は desired に含まれるキーのみを比較し、浮動小数点数は丸め誤差を無視します。
+    Styles のように Name を持つ辞書のリストは、並び順ではなく Name で対応する要素同士を比較します。
+    """
+    if isinstance(desired, dict):
+        if not isinstance(current, dict):
+            return True
+        return any(_preset_value_differs(current.get(key), value) for key, value in desired.items())
+    if isinstance(desired, list):
+        if not isinstance(current, list):
+            return True
+        if _named_items(desired) and _named_items(current):
+            by_name = {item["Name"]: item for item in current}
+            return any(
+                item["Name"] not in by_name or _preset_value_differs(by_name[item["Name"]], item) for item in desired
+            )
+        if len(current) != len(desired):
+            return True
+        return any(_preset_value_differs(c, d) for c, d in zip(current, desired))
+    if isinstance(desired, float) or isinstance(current, float):
+        if not isinstance(current, (int, float)) or not isinstance(desired, (int, float)):
+            return True
+        return abs(current - desired) > 1e-6
+    return bool(current != desired)
+
+
+def _merge_preset_value(current, desired):
+    """current に desired で指定された値を重ねた値を返します。
+
+    _preset_value_differs() と同じく、辞書は desired に含まれるキーのみを置き換え、
+    Name を持つ辞書のリストは Name で対応する要素同士を重ね、current に無い要素は末尾に追加します。
+    それ以外の値は desired で置き換えます。
+    """
+    if isinstance(desired, dict) and isinstance(current, dict):
+        merged = dict(current)
+        for key, value in desired.items():
+            merged[key] = _merge_preset_value(current[key], value) if key in current else copy.deepcopy(value)
+        return merged
+    if isinstance(desired, list) and isinstance(current, list) and _named_items(desired) and _named_items(current):
+        by_name = {item["Name"]: item for item in desired}
+        merged_items = [
+            _merge_preset_value(item, by_name.pop(item["Name"])) if item["Name"] in by_name else item
+            for item in current
+        ]
+        return merged_items + [copy.deepcopy(item) for item in by_name.values()]
+    return copy.deepcopy(desired)
+
+
+def load_voice_presets(directory: str) -> List[VoicePreset]:
+    """ディレクトリ内の JSON ファイル (*.json) からボイスプリセットを読み込みます。
+
+    1つのファイルにはボイスプリセット1つ、またはボイスプリセットのリストを記述します。
+    """
+    presets: List[VoicePreset] = []
+    for name in sorted(os.listdir(directory)):
+        if not name.lower().endswith(".json"):
+            continue
+        with open(os.path.join(directory, name), encoding="utf-8") as f:
+            values = json.load(f)
+        presets.extend(values if isinstance(values, list) else [values])
+    return presets
+
+
+# エディターのディレクトリ毎に読み込み済みの TtsControl 型
+_tts_control_types: Dict[str, Any] = {}
+_tts_control_types_lock = threading.Lock()
+
+
+def load_tts_control_type(editor_dir: str):
+    """A.I.VOICE Editor API の DLL を読み込み、TtsControl 型を返します。
+
+    pythonnet はこの関数が初めて呼び出された時点で読み込まれ、
+    読み込んだ型はディレクトリ毎にキャッシュされます。
+    """
+    with _tts_control_types_lock:
+        tts_control_type = _tts_control_types.get(editor_dir)
+        if tts_control_type is None:
+            # pythonnet の読み込みは .NET ランタイムの起動を伴うため必要になるまで遅らせる
+            import clr
+
+            clr.AddReference(editor_dir + "AI.Talk.Editor.Api")
+            from AI.Talk.Editor.Api import TtsControl
+
+            tts_control_type = _tts_control_types[editor_dir] = TtsControl
+        return tts_control_type
+
+
+def to_host_status(raw_status) -> HostStatus:
+    """TtsControl.Status の値を HostStatus に変換します。"""
+    # C#のEnumから文字列が返ってくる場合の対応
+    if isinstance(raw_status, str):
+        status_mapping = {
+            "NotRunning": HostStatus.NotRunning,
+            "NotConnected": HostStatus.NotConnected,
+            "Idle": HostStatus.Idle,
+            "Busy": HostStatus.Busy
+        }
+        return status_mapping.get(raw_status, HostStatus.NotConnected)
+
+    # 数値の場合はそのまま変換
+    try:
+        return HostStatus(raw_status)
+    except ValueError:
+        return HostStatus.NotConnected
+
+
+def next_poll_interval(
+    elapsed: float,
+    expected: Optional[float],
+    previous: Optional[float],
+    min_interval: float = 0.005,
+    max_interval: float = 0.1,
+) -> float:
+    """ステータス確認の次の待機時間 (秒) を決定します。
+
+    終了予定時刻 expected が分かっている場合は、残り時間の半分だけ待機するため
+    終了間際ほど細かく確認します。終了予定時刻を過ぎた後は min_interval で確認します。
+    分からない場合は min_interval から倍々に待機時間を延ばします。
+    """
+    if expected is not None:
+        interval = (expected - elapsed) / 2
+    elif previous is None:
+        interval = min_interval
+    else:
+        interval = previous * 2
+    return min(max(interval, min_interval), max_interval)
+
+
+class _ReconnectingTtsControl:
+    """接続が切れていた場合に再接続してから呼び出しを1回だけやり直す TtsControl のラッパー"""
+
+    # 接続管理そのものに関わる呼び出しはやり直さない
+    _NO_RETRY = frozenset({
+        "Connect", "Disconnect", "Initialize", "StartHost", "TerminateHost",
+        "Status", "IsInitialized", "GetAvailableHostNames",
+    })
+
+    def __init__(self, inner, owner: "AIVoiceTTsControl"):
+        object.__setattr__(self, "_inner", inner)
+        object.__setattr__(self, "_owner", owner)
+
+    def _retry(self, name: str, func):
+        try:
+            return func()
+        except Exception as error:
+            owner = self._owner
+            if owner._reconnecting or name in self._NO_RETRY:
+                raise
+            try:
+                status = to_host_status(self._inner.Status)
+            except Exception:
+                raise error
+            if status != HostStatus.NotConnected:
+                raise
+            owner._emit("retry", name=name, error=error)
+            owner._reconnect()
+            return func()
+
+    def __getattr__(self, name: str):
+        value = self._retry(name, lambda: getattr(self._inner, name))
+        if not callable(value):
+            return value
+
+        def call(*args):
+            return self._retry(name, lambda: getattr(self._inner, name)(*args))
+
+        return call
+
+    def __setattr__(self, name: str, value) -> None:
+        self._retry(name, lambda: setattr(self._inner, name, value))
+
+
 class AIVoiceTTsControl:
     """A.I.VOICE Editor API制御クラス"""
     
-    def __init__(self, editor_dir: str = None):
+    def __init__(
+        self,
+        editor_dir: Optional[str] = None,
+        backend=None,
+        audio_cache: Optional[AudioCache] = None,
+        cache_metadata: bool = True,
+        elide_writes: bool = True,
+        auto_reconnect: bool = False,
+        instrumentation: Optional[Instrumentation] = None,
+        duration_estimator: Optional[DurationEstimator] = None,
+        play_time_cache_size: int = 4096,
+        cache_list_items: bool = True,
+        normalizer: Optional[Callable[[str], str]] = None,
+        record_trace: Optional[str] = None,
+    ):
         """
         A.I.VOICE Editor API制御クラスを初期化します。
         
@@ -74,41 +305,208 @@ class AIVoiceTTsControl:
             A.I.VOICE Editorのインストールディレクトリパス。
             指定されない場合は、デフォルトのインストールパスを使用します。
             例: "C:\\Program Files\\AI\\AIVoice\\AIVoiceEditor\\"
+        backend : object, optional
+            ``TtsControl`` と同じインターフェースを持つオブジェクト。
+            指定された場合は DLL を読み込まずにこのオブジェクトを使用します。
+            例: ``SimulatedTtsControl()``
+        audio_cache : AudioCache, optional
+            synthesize() で使用する合成済み音声のキャッシュ
+        cache_metadata : bool
+            ボイス名・ボイスプリセットの取得結果をキャッシュするかどうか。
+            キャッシュはボイスプリセットの追加・更新・再読込み、接続時、refresh() で破棄されます。
+        elide_writes : bool
+            current_voice_preset_name・text_edit_mode・master_control の値を手元に保持し、
+            同じ値の再設定ではホストプログラムを呼び出さないかどうか。
+            保持した値は接続時と refresh() で破棄されます。
+        auto_reconnect : bool
+            API 呼び出しが接続切れで失敗した場合に、再接続してこのオブジェクトで設定したボイスプリセット・
+            テキスト入力形式・マスターコントロールを設定し直してから1回だけやり直すかどうか (elide_writes に関わらず行います)。
+            再接続とやり直しは add_event_listener() で登録した関数に通知されます。
+        instrumentation : Instrumentation, optional
+            指定された場合、TtsControl へのすべての呼び出しの回数・エラー・所要時間を記録します。
+            指定しない場合は計測用のラッパーを挟まないため、オーバーヘッドはありません。
+        duration_estimator : DurationEstimator, optional
+            estimate_play_time() で使用する再生時間の見積もり。
+            play_time() と synthesize() で得た実際の再生時間で補正されます。
+        play_time_cache_size : int
+            テキスト・ボイスプリセット・マスターコントロール毎に保持する再生時間の最大件数。0 の場合は保持しません。
+            synthesize() で保存した音声の再生時間は、cache_metadata と elide_writes が有効でボイスプリセットと
+            マスターコントロールを手元に保持できる場合 (または audio_cache が設定されている場合) のみ保持します。
+        cache_list_items : bool
+            get_list_items() の結果を、リスト形式の行を変更する呼び出しや refresh() まで保持するかどうか。
+            add_list_item() と clear_list_items() は保持した内容に反映されます。
+        normalizer : Callable[[str], str], optional
+            synthesize()・synthesize_many()・synthesize_stream()・play_time()・estimate_play_time() で
+            ホストプログラムに渡す前、およびキャッシュのキーを求める前にテキストを変換する関数。
+            例: ``TextNormalizer()``
+        record_trace : str, optional
+            指定された場合、TtsControl へのすべての呼び出しと戻り値・所要時間をこのファイルに記録します。
+            記録したファイルは ``ReplayTtsControl`` を backend に渡すことで、ホストプログラム無しで再生できます。
         """
-        # A.I.VOICE Editor APIの初期化
-        if editor_dir is None:
-            self._editor_dir = os.environ.get("ProgramW6432", "") + "\\AI\\AIVoice\\AIVoiceEditor\\"
+        self.audio_cache = audio_cache
+        self.cache_metadata = cache_metadata
+        self._voice_names_cache: Optional[List[str]] = None
+        self._voice_preset_names_cache: Optional[List[str]] = None
+        self._voice_preset_cache: Dict[str, VoicePreset] = {}
+        self.cache_list_items = cache_list_items
+        self._list_items_cache: Optional[List[ListItem]] = None
+        self.elide_writes = elide_writes
+        self._state: Dict[str, Any] = {}
+        # このオブジェクトで設定した値。elide_writes に関わらず保持し、再接続時に設定し直す
+        self._session: Dict[str, Any] = {}
+        self._listeners: List[Callable[[str, dict], None]] = []
+        self._reconnecting = False
+        self._keepalive_thread: Optional[threading.Thread] = None
+        self._keepalive_stop = threading.Event()
+        self.duration_estimator = duration_estimator if duration_estimator is not None else DurationEstimator()
+        self.play_time_cache_size = play_time_cache_size
+        self._play_time_cache: "OrderedDict[str, int]" = OrderedDict()
+        # (JSON 文字列, 解析結果) の組
+        self._master_control_cache: Optional[Tuple[str, MasterControl]] = None
+        self.normalizer = normalizer
+        # 合成・再生の間は保持され、辞書の再読込みなどと重ならないようにする
+        self.job_lock = threading.RLock()
+
+        if backend is not None:
+            self._editor_dir = editor_dir
         else:
-            # パスの末尾にバックスラッシュを確実に付ける
-            self._editor_dir = editor_dir.rstrip("\\") + "\\"
-        
-        dll_path = self._editor_dir + "AI.Talk.Editor.Api.dll"
-        if not os.path.isfile(dll_path):
-            raise FileNotFoundError(f"A.I.VOICE Editor API DLL が見つかりません: {dll_path}")
-        
-        # pythonnet DLLの読み込み
-        clr.AddReference(self._editor_dir + "AI.Talk.Editor.Api")
-        from AI.Talk.Editor.Api import TtsControl
-        
-        self.tts_control = TtsControl()
+            # A.I.VOICE Editor APIの初期化
+            if editor_dir is None:
+                self._editor_dir = os.environ.get("ProgramW6432", "") + "\\AI\\AIVoice\\AIVoiceEditor\\"
+            else:
+                # パスの末尾にバックスラッシュを確実に付ける
+                self._editor_dir = editor_dir.rstrip("\\") + "\\"
+            
+            dll_path = self._editor_dir + "AI.Talk.Editor.Api.dll"
+            if not os.path.isfile(dll_path):
+                raise FileNotFoundError(f"A.I.VOICE Editor API DLL が見つかりません: {dll_path}")
+            
+            # pythonnet DLLの読み込み
+            backend = load_tts_control_type(self._editor_dir)()
+
+        self.instrumentation = instrumentation
+        if instrumentation is not None:
+            backend = InstrumentedTtsControl(backend, instrumentation)
+            self.add_event_listener(instrumentation.record_event)
+
+        self.trace_recorder = None
+        if record_trace is not None:
+            backend = self.trace_recorder = RecordingTtsControl(backend, record_trace)
+
+        # 再接続時はこのオブジェクトを直接使用する
+        self._backend = backend
+        self.tts_control = backend
+        if auto_reconnect:
+            self.tts_control = _ReconnectingTtsControl(self.tts_control, self)
+
+    def add_event_listener(self, listener: Callable[[str, dict], None]) -> None:
+        """再接続などのイベントを受け取る関数を登録します。
+
+        関数はイベント名 ("reconnect", "retry", "keepalive", "keepalive_error",
+        "dictionary_reload", "dictionary_error") と
+        詳細を表す辞書を引数に呼び出されます。
+        """
+        self._listeners.append(listener)
+
+    def remove_event_listener(self, listener: Callable[[str, dict], None]) -> None:
+        """add_event_listener() で登録した関数を解除します。"""
+        self._listeners.remove(listener)
+
+    def _emit(self, event: str, **info) -> None:
+        for listener in list(self._listeners):
+            try:
+                listener(event, info)
+            except Exception as e:
+                print(f"Warning: Event listener failed: {e}")
+
+    def _reconnect(self) -> None:
+        """再接続し、このオブジェクトで設定したプロパティの値を設定し直します。"""
+        state = dict(self._session)
+        self._reconnecting = True
+        try:
+            self._backend.Connect()
+            self.refresh()
+            for name in ("current_voice_preset_name", "text_edit_mode", "master_control"):
+                if name in state:
+                    setattr(self, name, state[name])
+        finally:
+            self._reconnecting = False
+        self._emit("reconnect", state=state)
+
+    def _get_state(self, name: str, read: Callable[[], _T]) -> _T:
+        """elide_writes が有効な場合は手元に保持した値を、それ以外はホストプログラムの値を返します。"""
+        if self.elide_writes and name in self._state:
+            return cast(_T, self._state[name])
+        value = read()
+        if self.elide_writes:
+            self._state[name] = value
+        return value
+
+    def _set_state(self, name: str, value, write, same=None, read=None) -> None:
+        """値が変化している場合のみホストプログラムへ書き込みます。
+
+        read が指定された場合は、書き込んだ値ではなく書き込み後に read() で読み直した値を保持します。
+        """
+        self._session[name] = value
+        if self.elide_writes and name in self._state:
+            current = self._state[name]
+            if (same(current, value) if same is not None else current == value):
+                return
+        try:
+            write()
+        except Exception:
+            self._state.pop(name, None)
+            raise
+        if self.elide_writes:
+            self._state[name] = read() if read is not None else value
+
+    @staticmethod
+    def _same_master_control(current: str, value: str) -> bool:
+        """value で指定された項目がすべて current と同じ値かどうか"""
+        if current == value:
+            return True
+        try:
+            return not _preset_value_differs(json.loads(current), json.loads(value))
+        except (TypeError, ValueError):
+            return False
 
     @property
     def current_voice_preset_name(self) -> str:
         """現在のボイスプリセット名を取得または設定します。"""
-        return self.tts_control.CurrentVoicePresetName
+        return self._get_state(
+            "current_voice_preset_name", lambda: self.tts_control.CurrentVoicePresetName
+        )
     
     @current_voice_preset_name.setter
     def current_voice_preset_name(self, value: str) -> None:
-        self.tts_control.CurrentVoicePresetName = value
+        def write():
+            self.tts_control.CurrentVoicePresetName = value
+        self._set_state("current_voice_preset_name", value, write)
 
     @property
     def master_control(self) -> str:
         """マスターコントロールの各値を表す JSON 形式の文字列を取得または設定します。"""
-        return self.tts_control.MasterControl
+        return self._get_state("master_control", lambda: self.tts_control.MasterControl)
     
     @master_control.setter
     def master_control(self, value: str) -> None:
-        self.tts_control.MasterControl = value
+        def write():
+            self.tts_control.MasterControl = value
+
+        # ホストプログラムは指定された項目のみを変更するため、書き込んだ文字列ではなく読み直した値を保持する
+        previous = self._session.get("master_control")
+        self._set_state(
+            "master_control", value, write,
+            same=self._same_master_control, read=lambda: self.tts_control.MasterControl,
+        )
+        if previous is not None:
+            # 再接続時に設定し直す値は、これまでに設定した項目をすべて含める
+            try:
+                merged = json.loads(previous)
+                merged.update(json.loads(value))
+            except (TypeError, ValueError, AttributeError):
+                return
+            self._session["master_control"] = json.dumps(merged, ensure_ascii=False)
 
     @property
     def is_initialized(self) -> bool:
@@ -127,11 +525,15 @@ class AIVoiceTTsControl:
     @property
     def text_edit_mode(self) -> TextEditMode:
         """選択されているテキスト入力形式を取得または設定します。"""
-        return TextEditMode(self.tts_control.TextEditMode)
+        return self._get_state(
+            "text_edit_mode", lambda: TextEditMode(self.tts_control.TextEditMode)
+        )
 
     @text_edit_mode.setter
     def text_edit_mode(self, value: TextEditMode) -> None:
-        self.tts_control.TextEditMode = value.value
+        def write():
+            self.tts_control.TextEditMode = value.value
+        self._set_state("text_edit_mode", value, write)
 
     @property
     def text_selection_length(self) -> int:
@@ -159,49 +561,59 @@ class AIVoiceTTsControl:
     @property
     def status(self) -> HostStatus:
         """ホストプログラムのステータスを取得します。"""
-        raw_status = self.tts_control.Status
-        
-        # C#のEnumから文字列が返ってくる場合の対応
-        if isinstance(raw_status, str):
-            status_mapping = {
-                "NotRunning": HostStatus.NotRunning,
-                "NotConnected": HostStatus.NotConnected,
-                "Idle": HostStatus.Idle,
-                "Busy": HostStatus.Busy
-            }
-            return status_mapping.get(raw_status, HostStatus.NotConnected)
-        
-        # 数値の場合はそのまま変換
-        try:
-            return HostStatus(raw_status)
-        except ValueError:
-            return HostStatus.NotConnected
+        return to_host_status(self.tts_control.Status)
 
     @property
     def voice_names(self) -> list[str]:
         """利用可能なボイス名を取得します。"""
+        if self.cache_metadata and self._voice_names_cache is not None:
+            return list(self._voice_names_cache)
         raw_names = self.tts_control.VoiceNames
         # C#のString[]をPythonのlistに変換
-        return list(raw_names) if raw_names else []
+        names = list(raw_names) if raw_names else []
+        if self.cache_metadata:
+            self._voice_names_cache = names
+        return list(names)
 
     @property
     def voice_preset_names(self) -> list[str]:
         """登録されているボイスプリセット名を取得します。"""
+        if self.cache_metadata and self._voice_preset_names_cache is not None:
+            return list(self._voice_preset_names_cache)
         raw_names = self.tts_control.VoicePresetNames
         # C#のString[]をPythonのlistに変換
-        return list(raw_names) if raw_names else []
+        names = list(raw_names) if raw_names else []
+        if self.cache_metadata:
+            self._voice_preset_names_cache = names
+        return list(names)
 
     def add_list_item(self, voice_preset_name: str, text: str) -> None:
         """リスト形式の末尾に行を追加します。"""
-        self.tts_control.AddListItem(voice_preset_name, text)
+        try:
+            self.tts_control.AddListItem(voice_preset_name, text)
+        except Exception:
+            self._list_items_cache = None
+            raise
+        if self._list_items_cache is not None:
+            self._list_items_cache.append(ListItem(voice_preset_name, text))
 
     def add_voice_preset(self, voice_preset: VoicePreset) -> None:
         """新規ボイスプリセットを作成し JSON 形式で指定された各値を設定します。"""
-        self.tts_control.AddVoicePreset(json.dumps(voice_preset, ensure_ascii=False))
+        try:
+            self.tts_control.AddVoicePreset(json.dumps(voice_preset, ensure_ascii=False))
+        finally:
+            self._voice_preset_names_cache = None
+            self._voice_preset_cache.pop(voice_preset["PresetName"], None)
 
     def clear_list_items(self):
         """リスト形式の行をすべて削除します。"""
-        self.tts_control.ClearListItems()
+        try:
+            self.tts_control.ClearListItems()
+        except Exception:
+            self._list_items_cache = None
+            raise
+        if self.cache_list_items:
+            self._list_items_cache = []
 
     def __enter__(self):
         """コンテキストマネージャー: with文の開始時"""
@@ -209,12 +621,15 @@ class AIVoiceTTsControl:
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         """コンテキストマネージャー: with文の終了時"""
+        self.stop_keepalive()
         try:
             if hasattr(self, 'tts_control') and self.status == HostStatus.Idle:
                 self.disconnect()
         except Exception as e:
             # ログに記録するかエラーハンドリング
             print(f"Warning: Failed to disconnect: {e}")
+        if self.trace_recorder is not None:
+            self.trace_recorder.close()
         return False  # 例外を再発生させる
     
     def connect(self):
@@ -224,6 +639,7 @@ class AIVoiceTTsControl:
         """
         if hasattr(self, 'tts_control'):
             self.tts_control.Connect()
+            self.refresh()
             return self  # コンテキストマネージャーチェーン用
         else:
             raise RuntimeError("TtsControlが初期化されていません")
@@ -231,6 +647,21 @@ class AIVoiceTTsControl:
     def disconnect(self):
         """ホストプログラムとの接続を解除します。"""
         self.tts_control.Disconnect()
+        self._state.clear()
+
+    def estimate_play_time(self, text: str) -> float:
+        """テキスト形式でテキストを読み上げた場合の再生時間 (ミリ秒) を、ホストプログラムで合成せずに求めます。
+
+        play_time() または synthesize() で得た実際の再生時間があればその値を、
+        無い場合は duration_estimator による見積もりを返します。
+        """
+        text = self._normalize(text)
+        voice_preset = self.get_voice_preset(self.current_voice_preset_name)
+        master_control = self.master_control
+        cached = self._play_time_cache.get(synthesis_key(text, voice_preset, master_control))
+        if cached is not None:
+            return cached
+        return self.duration_estimator.estimate_for(text, voice_preset, master_control)
 
     def get_available_host_names(self) -> list[str]:
         """利用可能なホストの名称のリストを取得します。"""
@@ -242,6 +673,28 @@ class AIVoiceTTsControl:
         """リストのアイテム数を取得します。"""
         return self.tts_control.GetListCount()
 
+    def get_list_items(self) -> List[ListItem]:
+        """リスト形式のすべての行のボイスプリセット名とセンテンスを取得します。
+
+        ホストプログラムには一括で取得する API が無いため行毎に選択して取得しますが、
+        選択状態は取得後に元に戻されます。
+        cache_list_items が有効な場合、結果はリスト形式の行を変更する呼び出しまで保持されます。
+        """
+        if self._list_items_cache is not None:
+            return list(self._list_items_cache)
+
+        selection = self.get_list_selection_indices()
+        items = []
+        try:
+            for index in range(self.get_list_count()):
+                self.set_list_selection_indexes(index)
+                items.append(ListItem(self.get_list_voice_preset(), self.get_list_sentence(index)))
+        finally:
+            self.set_list_selection_indices(selection)
+        if self.cache_list_items:
+            self._list_items_cache = items
+        return list(items)
+
     def get_list_selection_count(self) -> int:
         """リスト形式の選択行数を取得します。"""
         return self.tts_control.GetListSelectionCount()
@@ -260,13 +713,32 @@ class AIVoiceTTsControl:
         """リスト形式の選択行のボイスプリセット名を取得します。"""
         return self.tts_control.GetListVoicePreset()
 
+    def get_master_control(self) -> MasterControl:
+        """マスターコントロールの各値を取得します。
+
+        master_control の JSON 文字列が前回と同じ場合は、解析済みの値を再利用します。
+        elide_writes が無効な場合、JSON 文字列は毎回ホストプログラムから読み込みます。
+        """
+        raw = self.master_control
+        cached = self._master_control_cache
+        if cached is None or cached[0] != raw:
+            cached = (raw, cast(MasterControl, json.loads(raw)))
+            self._master_control_cache = cached
+        return cast(MasterControl, dict(cached[1]))
+
     def get_play_time(self) -> int:
         """読み上げ音声の再生時間を取得します。"""
         return self.tts_control.GetPlayTime()
 
-    def get_voice_preset(self, preset_name: str) -> str:
-        """引数で指定された名称のボイスプリセットの各値を JSON 形式で取得します。"""
-        return VoicePreset(json.loads(self.tts_control.GetVoicePreset(preset_name)))
+    def get_voice_preset(self, preset_name: str) -> VoicePreset:
+        """引数で指定された名称のボイスプリセットの各値を取得します。"""
+        if self.cache_metadata:
+            preset = self._voice_preset_cache.get(preset_name)
+            if preset is None:
+                preset = cast(VoicePreset, json.loads(self.tts_control.GetVoicePreset(preset_name)))
+                self._voice_preset_cache[preset_name] = preset
+            return copy.deepcopy(preset)
+        return cast(VoicePreset, json.loads(self.tts_control.GetVoicePreset(preset_name)))
 
     def initialize(self, service_name: str):
         """APIを初期化します。"""
@@ -274,14 +746,107 @@ class AIVoiceTTsControl:
 
     def insert_list_item(self, voice_preset_name: str, text: str) -> None:
         """リスト形式の選択位置に行を挿入します。"""
+        self._list_items_cache = None
         self.tts_control.InsertListItem(voice_preset_name, text)
 
     def play(self):
         """音声の再生を開始または一時停止します。
 
-        再生が完了するまで待機しません。
+        再生が完了するまで待機しません。完了まで待機する場合は play_and_wait() を使用してください。
+        再生の開始は job_lock を保持して行うため、辞書の再読込みなどの最中には開始されません。
         """
-        self.tts_control.Play()
+        with self.job_lock:
+            self.tts_control.Play()
+
+    def play_and_wait(
+        self,
+        timeout: Optional[float] = None,
+        expected_ms: Optional[float] = None,
+        start_timeout: float = 0.5,
+    ) -> bool:
+        """音声を再生し、再生が完了するまで待機します。
+
+        Parameters
+        ----------
+        timeout : float, optional
+            再生完了を待つ最大時間 (秒)
+        expected_ms : float, optional
+            おおよその再生時間 (ミリ秒)。指定すると終了予定時刻の前後のみ細かくステータスを確認します。
+        start_timeout : float
+            再生開始直後、ステータスが Busy になるまで待つ最大時間 (秒)
+
+        Returns
+        -------
+        bool
+            タイムアウトした場合は False
+        """
+        with self.job_lock:
+            self.play()
+            started = time.monotonic()
+            interval = None
+            # 再生開始直後はまだ Busy になっていない場合がある
+            while self.status != HostStatus.Busy:
+                elapsed = time.monotonic() - started
+                if elapsed >= start_timeout:
+                    return True
+                interval = next_poll_interval(elapsed, None, interval)
+                time.sleep(interval)
+            elapsed = time.monotonic() - started
+            if timeout is not None:
+                timeout = max(timeout - elapsed, 0.0)
+            if expected_ms is not None:
+                expected_ms = max(expected_ms - elapsed * 1000, 0)
+            return self.wait_until_idle(timeout, expected_ms)
+
+    def play_time(self, text: str) -> int:
+        """テキスト形式でテキストを読み上げた音声の再生時間 (ミリ秒) を取得します。
+
+        テキスト・現在のボイスプリセット・マスターコントロールが同じ場合は、
+        ホストプログラムで再度合成せずに以前の結果を返します。
+        """
+        with self.job_lock:
+            text = self._normalize(text)
+            voice_preset = self.get_voice_preset(self.current_voice_preset_name)
+            master_control = self.master_control
+            key = synthesis_key(text, voice_preset, master_control)
+            cached = self._play_time_cache.get(key)
+            if cached is not None:
+                self._play_time_cache.move_to_end(key)
+                return cached
+
+            self.text_edit_mode = TextEditMode.Text
+            self.text = text
+            play_time = self.get_play_time()
+            self._remember_play_time(key, text, play_time, voice_preset, master_control)
+            return play_time
+
+    def _normalize(self, text: str) -> str:
+        """normalizer が設定されていればテキストを変換します。"""
+        if self.normalizer is None:
+            return text
+        return self.normalizer(text)
+
+    def _remember_play_time(self, key: str, text: str, play_time: int, voice_preset, master_control) -> None:
+        """再生時間を保持し、duration_estimator を補正します。"""
+        self.duration_estimator.observe(text, play_time, *pause_settings(voice_preset, master_control))
+        if self.play_time_cache_size <= 0:
+            return
+        self._play_time_cache[key] = play_time
+        self._play_time_cache.move_to_end(key)
+        while len(self._play_time_cache) > self.play_time_cache_size:
+            self._play_time_cache.popitem(last=False)
+
+    def refresh(self) -> None:
+        """ボイス名・ボイスプリセット・リスト形式の行のキャッシュと、手元に保持したプロパティの値を破棄します。
+
+        A.I.VOICE Editor 上で直接ボイスプリセットや設定を変更した場合などに呼び出してください。
+        """
+        self._state.clear()
+        self._voice_names_cache = None
+        self._voice_preset_names_cache = None
+        self._voice_preset_cache.clear()
+        self._list_items_cache = None
+        self._master_control_cache = None
 
     def reload_phrase_dictionary(self):
         """フレーズ辞書を再読込みします。"""
@@ -293,7 +858,12 @@ class AIVoiceTTsControl:
 
     def reload_voice_preset(self):
         """ボイスプリセットを再読込みします。"""
-        self.tts_control.ReloadVoicePreset()
+        try:
+            self.tts_control.ReloadVoicePreset()
+        finally:
+            self._state.pop("current_voice_preset_name", None)
+            self._voice_preset_names_cache = None
+            self._voice_preset_cache.clear()
 
     def reload_word_dictionary(self):
         """単語辞書を再読込みします。"""
@@ -301,6 +871,7 @@ class AIVoiceTTsControl:
 
     def remove_list_item(self, index: int) -> None:
         """リスト形式の選択行を削除します。"""
+        self._list_items_cache = None
         self.tts_control.RemoveListItem(index)
 
     def save_audio_to_file(self, path: str) -> None:
@@ -336,15 +907,58 @@ class AIVoiceTTsControl:
 
     def set_list_sentence(self, sentence: str, synthesize: bool) -> None:
         """リスト形式の選択行のセンテンスを設定します。"""
+        self._list_items_cache = None
         self.tts_control.SetListSentence(sentence, synthesize)
 
     def set_list_voice_preset(self, voice_preset_name: str) -> None:
         """リスト形式の選択行のボイスプリセット名を設定します。"""
+        self._list_items_cache = None
         self.tts_control.SetListVoicePreset(voice_preset_name)
 
     def set_voice_preset(self, voice_preset: VoicePreset) -> None:
         """既存のボイスプリセットに JSON 形式で指定された各値を設定します。"""
-        self.tts_control.SetVoicePreset(json.dumps(voice_preset, ensure_ascii=False))
+        try:
+            self.tts_control.SetVoicePreset(json.dumps(voice_preset, ensure_ascii=False))
+        finally:
+            self._voice_preset_cache.pop(voice_preset["PresetName"], None)
+
+    def start_keepalive(self, interval: float = 300.0) -> None:
+        """接続を維持するため、一定間隔でステータスを取得するバックグラウンドスレッドを開始します。
+
+        ホストプログラムは10分間 API を介した操作が無いと接続を解除するため、それより短い間隔を指定してください。
+        auto_reconnect が有効で接続が切れていた場合は再接続します。
+        job_lock が保持されている間 (合成などの実行中) は確認を省略します。
+        """
+        self.stop_keepalive()
+        self._keepalive_stop = stop = threading.Event()
+
+        def run():
+            while not stop.wait(interval):
+                # 合成などの実行中は接続が使われているため、確認を省略する
+                if not self.job_lock.acquire(blocking=False):
+                    continue
+                try:
+                    status = self.status
+                    if status == HostStatus.NotConnected and isinstance(self.tts_control, _ReconnectingTtsControl):
+                        self._reconnect()
+                        status = self.status
+                    self._emit("keepalive", status=status)
+                except Exception as e:
+                    self._emit("keepalive_error", error=e)
+                finally:
+                    self.job_lock.release()
+
+        thread = threading.Thread(target=run, name="aivoice-keepalive", daemon=True)
+        self._keepalive_thread = thread
+        thread.start()
+
+    def stop_keepalive(self) -> None:
+        """start_keepalive() で開始したスレッドを停止します。"""
+        self._keepalive_stop.set()
+        if self._keepalive_thread is not None:
+            if self._keepalive_thread is not threading.current_thread():
+                self._keepalive_thread.join()
+            self._keepalive_thread = None
 
     def start_host(self):
         """ホストプログラムを起動します。"""
@@ -352,8 +966,321 @@ class AIVoiceTTsControl:
 
     def stop(self):
         """音声の再生を停止します。"""
-        self.tts_control.StopHost()
+        self.tts_control.Stop()
+
+    def sync_voice_presets(self, presets: Iterable[VoicePreset], reload: bool = True) -> VoicePresetSyncReport:
+        """ボイスプリセットをまとめて登録し、必要な追加・更新のみをホストプログラムへ送ります。
+
+        現在のボイスプリセットと比較し、存在しないものは add_voice_preset()、
+        指定された値が異なるものは set_voice_preset() で更新します。
+        指定しなかったフィールドは比較せず、更新時も現在の値が維持されます。
+        Styles のように Name を持つ辞書のリストは Name で対応する要素のみを更新し、指定しなかった要素も維持されます。
+
+        Parameters
+        ----------
+        presets : Iterable[VoicePreset]
+            登録するボイスプリセット。プリセット名が重複してはいけません。
+        reload : bool
+            追加・更新があった場合に最後に1回だけ reload_voice_preset() を呼び出すかどうか
+        """
+        desired = {}
+        for preset in presets:
+            name = preset["PresetName"]
+            if name in desired:
+                raise ValueError(f"ボイスプリセット名が重複しています: {name}")
+            desired[name] = preset
+
+        existing = set(self.voice_preset_names)
+        report = VoicePresetSyncReport(added=[], updated=[], unchanged=[], reloaded=False)
+        for name, preset in desired.items():
+            if name not in existing:
+                self.add_voice_preset(preset)
+                report["added"].append(name)
+                continue
+            current = self.get_voice_preset(name)
+            if _preset_value_differs(current, preset):
+                self.set_voice_preset(cast(VoicePreset, _merge_preset_value(current, preset)))
+                report["updated"].append(name)
+            else:
+                report["unchanged"].append(name)
+
+        if reload and (report["added"] or report["updated"]):
+            self.reload_voice_preset()
+            report["reloaded"] = True
+        return report
+
+    def synthesize(self, text: str, path: str) -> str:
+        """テキスト形式でテキストを読み上げた音声をファイルに保存します。
+
+        audio_cache が設定されている場合、テキスト・現在のボイスプリセット・マスターコントロールが
+        同じ音声はホストプログラムを介さずにキャッシュからコピーされます。
+        保存した音声の長さは再生時間として保持されるため、続く play_time() で再度合成は行われません。
+
+        Returns
+        -------
+        str
+            保存先のファイルパス。ホストプログラムが拡張子を付加した場合は付加後のパスです。
+        """
+        with self.job_lock:
+            text = self._normalize(text)
+            key: Optional[str] = None
+            # 再生時間を保持するためだけに、合成の度にホストプログラムから値を読み込まない
+            remember_play_time = self.play_time_cache_size > 0 and self.cache_metadata and self.elide_writes
+            if self.audio_cache is not None or remember_play_time:
+                voice_preset = self.get_voice_preset(self.current_voice_preset_name)
+                master_control = self.master_control
+                key = synthesis_key(text, voice_preset, master_control)
+            if self.audio_cache is not None and key is not None:
+                # ホストプログラムと同様に、拡張子が異なる場合は付加する
+                cached_path = path if os.path.splitext(path)[1].lower() == ".wav" else path + ".wav"
+                if self.audio_cache.copy_to(key, cached_path):
+                    return cached_path
+
+            self.text_edit_mode = TextEditMode.Text
+            self.text = text
+            self.save_audio_to_file(path)
+            if not os.path.exists(path) and os.path.exists(path + ".wav"):
+                # ホストプログラムが拡張子を付加した場合
+                path += ".wav"
+
+            if self.play_time_cache_size > 0 and key is not None:
+                try:
+                    wav_format = read_wav_format(path)
+                except (OSError, ValueError):
+                    # ファイル命名規則で保存された場合など、保存先を読めない場合は再生時間を保持しない
+                    pass
+                else:
+                    frames = wav_format.data_size // wav_format.frame_size
+                    play_time = int(round(frames * 1000 / wav_format.sample_rate))
+                    self._remember_play_time(key, text, play_time, voice_preset, master_control)
+
+            if self.audio_cache is not None and key is not None:
+                self.audio_cache.put(key, path)
+            return path
+
+    def synthesize_many(
+        self,
+        items: Iterable[Union[str, Tuple[str, str]]],
+        out_dir: str,
+    ) -> List[str]:
+        """複数のテキストをまとめて音声ファイルに保存します。
+
+        同じボイスプリセットの行をまとめて合成するため、ボイスプリセットの切り替えはプリセット毎に1回で済みます。
+        ボイスプリセットとテキストが同じ行は1回だけ合成し、保存したファイルを複製します。
+        リスト形式で1行毎にファイルを保存するには行の追加・選択・保存の呼び出しが必要になり、
+        テキスト形式より呼び出しが多くなるため、テキスト形式で合成します。リスト形式の行と選択状態は変更されません。
+        ボイスプリセットとテキスト入力形式は処理後に元へ戻されます。
+
+        Parameters
+        ----------
+        items : Iterable[str | tuple[str, str]]
+            読み上げるテキスト、または (ボイスプリセット名, テキスト) のタプル。
+            テキストのみの場合は現在のボイスプリセットが使用されます。
+        out_dir : str
+            音声ファイルの保存先ディレクトリ
+
+        Returns
+        -------
+        list[str]
+            items と同じ順序で並んだ保存先のファイルパス
+        """
+        with self.job_lock:
+            current_preset = self.current_voice_preset_name
+            # ボイスプリセット名毎に、テキストとそのテキストを読み上げる行の番号。現在のボイスプリセットから合成する
+            groups: Dict[str, Dict[str, List[int]]] = {current_preset: {}}
+            count = 0
+            for index, item in enumerate(items):
+                if isinstance(item, str):
+                    voice_preset_name, text = current_preset, item
+                else:
+                    voice_preset_name, text = item
+                groups.setdefault(voice_preset_name, {}).setdefault(self._normalize(text), []).append(index)
+                count += 1
+
+            os.makedirs(out_dir, exist_ok=True)
+            paths = [os.path.join(out_dir, f"{index:06d}.wav") for index in range(count)]
+            if not count:
+                return paths
+
+            previous_mode = self.text_edit_mode
+            active_preset = current_preset
+            try:
+                for voice_preset_name, texts in groups.items():
+                    if not texts:
+                        continue
+                    if voice_preset_name != active_preset:
+                        self.current_voice_preset_name = voice_preset_name
+                        active_preset = voice_preset_name
+                    for text, indices in texts.items():
+                        path = self.synthesize(text, paths[indices[0]])
+                        for index in indices[1:]:
+                            shutil.copyfile(path, paths[index])
+            finally:
+                if active_preset != current_preset:
+                    self.current_voice_preset_name = current_preset
+                if previous_mode != TextEditMode.Text:
+                    self.text_edit_mode = previous_mode
+            return paths
+
+    def update_master_control(self, **fields) -> bool:
+        """マスターコントロールの指定した項目のみを変更します。
+
+        ホストプログラムは書き込まれた項目のみを変更するため、指定した項目のみを書き込みます。
+        elide_writes が有効な場合は手元に保持したホストプログラムの値と比較し、異なる項目がある場合のみ書き込みます。
+        elide_writes が無効な場合は読み込まずに毎回書き込みます。
+        例: ``update_master_control(Volume=1.2)``
+
+        Returns
+        -------
+        bool
+            ホストプログラムへ書き込んだかどうか
+        """
+        unknown = set(fields) - set(MasterControl.__annotations__)
+        if unknown:
+            raise TypeError(f"不明なマスターコントロールの項目です: {sorted(unknown)}")
+        if self.elide_writes and not _preset_value_differs(self.get_master_control(), fields):
+            return False
+        self.master_control = json.dumps(fields, ensure_ascii=False)
+        return True
+
+    def wait_until_idle(
+        self,
+        timeout: Optional[float] = None,
+        expected_ms: Optional[float] = None,
+        min_interval: float = 0.005,
+        max_interval: float = 0.1,
+    ) -> bool:
+        """ホストプログラムのステータスが Busy でなくなるまで待機します。
+
+        Parameters
+        ----------
+        timeout : float, optional
+            最大待機時間 (秒)。省略時は無制限に待機します。
+        expected_ms : float, optional
+            処理が終わるまでのおおよその時間 (ミリ秒)。
+            指定すると終了予定時刻までは粗く、終了予定時刻の付近では細かくステータスを確認します。
+        min_interval : float
+            ステータス確認の最短間隔 (秒)
+        max_interval : float
+            ステータス確認の最長間隔 (秒)
+
+        Returns
+        -------
+        bool
+            タイムアウトした場合は False
+        """
+        started = time.monotonic()
+        deadline = None if timeout is None else started + timeout
+        expected = None if expected_ms is None else expected_ms / 1000
+        interval = None
+        while self.status == HostStatus.Busy:
+            now = time.monotonic()
+            if deadline is not None and now >= deadline:
+                return False
+            interval = next_poll_interval(now - started, expected, interval, min_interval, max_interval)
+            if deadline is not None:
+                interval = min(interval, deadline - now)
+            time.sleep(interval)
+        return True
+
+    def synthesize_stream(
+        self,
+        text: str,
+        max_chars: int = 120,
+        prefetch: bool = True,
+    ) -> Iterator[Tuple[str, bytes]]:
+        """長いテキストを文単位で読み上げ、合成できた文から順に音声を返すジェネレーターです。
+
+        全文の合成を待たずに最初の文の音声を取得できます。
+        prefetch が有効な場合、呼び出し側が音声を処理している間に次の文を合成しておきます。
+        その間、このインスタンスの API 呼び出しは専用のワーカースレッドから行われます。
+
+        Parameters
+        ----------
+        text : str
+            読み上げるテキスト。文末記号・改行と、長い文は読点などで分割されます。
+        max_chars : int
+            1回で合成する最大文字数
+        prefetch : bool
+            次の文を先に合成しておくかどうか
+
+        Yields
+        ------
+        tuple[str, bytes]
+            (文, WAV 形式の音声データ)
+        """
+        chunks = split_sentences(text, max_chars)
+        if not chunks:
+            return
+
+        tmp_dir = tempfile.mkdtemp(prefix="aivoice-stream-")
+
+        def render(index: int) -> bytes:
+            path = self.synthesize(chunks[index], os.path.join(tmp_dir, f"{index}.wav"))
+            try:
+                with open(path, "rb") as f:
+                    return f.read()
+            finally:
+                os.remove(path)
+
+        executor: Optional["ThreadPoolExecutor"] = None
+        future: Optional["Future[bytes]"] = None
+        if prefetch:
+            # concurrent.futures は読み込みが重いため、先読みする場合のみ読み込む
+            import concurrent.futures
+
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="aivoice-stream")
+        try:
+            if executor is not None:
+                future = executor.submit(render, 0)
+            for index, chunk in enumerate(chunks):
+                if executor is None or future is None:
+                    audio = render(index)
+                else:
+                    audio = future.result()
+                    if index + 1 < len(chunks):
+                        future = executor.submit(render, index + 1)
+                yield chunk, audio
+        finally:
+            if executor is not None:
+                # 途中で中断された場合は先読み中の合成が終わるのを待ってから片付ける
+                executor.shutdown(wait=True)
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def synthesize_to_array(self, text: str):
+        """テキストを読み上げた音声を NumPy 配列として取得します。
+
+        Returns
+        -------
+        tuple[numpy.ndarray, int]
+            (フレーム数, チャンネル数) の配列とサンプリングレート。配列はコピーを伴わないビューです。
+        """
+        audio = self.synthesize_to_bytes(text)
+        return audio.to_array(), audio.sample_rate
+
+    def synthesize_to_bytes(self, text: str) -> SynthesizedAudio:
+        """テキストを読み上げた音声をメモリ上に取得します。
+
+        一時ファイル (利用可能であれば /dev/shm 上) に保存して1回で読み込み、一時ファイルは直ちに削除します。
+        返り値の pcm は読み込んだバッファの PCM データ部分を指す memoryview です。
+
+        Returns
+        -------
+        SynthesizedAudio
+            WAV 全体・PCM データ・サンプリングレート・チャンネル数などを持つオブジェクト
+        """
+        fd, path = tempfile.mkstemp(suffix=".wav", prefix="aivoice-", dir=default_temp_dir())
+        os.close(fd)
+        try:
+            path = self.synthesize(text, path)
+            return read_wav(path)
+        finally:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
 
     def terminate_host(self):
         """ホストプログラムを終了します。"""
         self.tts_control.TerminateHost()
+        self._state.clear()
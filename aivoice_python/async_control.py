@@ -0,0 +1,180 @@
+"""
+A.I.VOICE Editor API asyncio Front-end
+
+This module provides an asyncio interface that runs every API call on a
+single dedicated worker thread.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import time
+from typing import Any, Callable, Optional, cast
+
+from .aivoice_control import AIVoiceTTsControl, HostStatus, TextEditMode, next_poll_interval
+
+
+class AsyncAIVoiceTTsControl:
+    """A.I.VOICE Editor API の asyncio 版制御クラス
+
+    AIVoiceTTsControl の生成を含むすべての API 呼び出しを専用のワーカースレッド1本で実行するため、
+    イベントループをブロックせずに A.I.VOICE Editor を操作できます。
+
+    Parameters
+    ----------
+    factory : Callable[[], AIVoiceTTsControl], optional
+        ワーカースレッド上で AIVoiceTTsControl を生成する関数。
+        省略時は kwargs を渡して AIVoiceTTsControl を生成します。
+    poll_interval : float
+        再生完了を待つ間にステータスを確認する最長間隔 (秒)。
+        終了予定時刻が分かっている場合、その付近ではより細かく確認します。
+    start_timeout : float
+        Play() 実行後、ステータスが Busy になるまで待つ最大時間 (秒)
+    **kwargs
+        AIVoiceTTsControl に渡す引数
+    """
+
+    def __init__(
+        self,
+        factory: Optional[Callable[[], AIVoiceTTsControl]] = None,
+        poll_interval: float = 0.05,
+        start_timeout: float = 0.5,
+        **kwargs,
+    ):
+        self.poll_interval = poll_interval
+        self.start_timeout = start_timeout
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="aivoice")
+        self._control_future = self._executor.submit(factory or functools.partial(AIVoiceTTsControl, **kwargs))
+        self._job_lock: Optional[asyncio.Lock] = None
+
+    def _lock(self) -> asyncio.Lock:
+        # Python 3.8/3.9 ではイベントループ外で生成した Lock が使えないため遅延生成する
+        if self._job_lock is None:
+            self._job_lock = asyncio.Lock()
+        return self._job_lock
+
+    async def run(self, func: Callable[..., Any], *args) -> Any:
+        """ワーカースレッド上で func(control, *args) を実行し、その結果を返します。"""
+        loop = asyncio.get_running_loop()
+
+        def call():
+            control = self._control_future.result()
+            # start_keepalive() のスレッドが呼び出しの途中に割り込まないよう job_lock を保持する
+            with control.job_lock:
+                return func(control, *args)
+
+        return await loop.run_in_executor(self._executor, call)
+
+    async def call(self, method_name: str, *args) -> Any:
+        """AIVoiceTTsControl のメソッドをワーカースレッド上で呼び出します。"""
+        return await self.run(lambda control: getattr(control, method_name)(*args))
+
+    async def get(self, property_name: str) -> Any:
+        """AIVoiceTTsControl のプロパティの値を取得します。"""
+        return await self.run(lambda control: getattr(control, property_name))
+
+    async def set(self, property_name: str, value: Any) -> None:
+        """AIVoiceTTsControl のプロパティに値を設定します。"""
+        await self.run(lambda control: setattr(control, property_name, value))
+
+    async def status(self) -> HostStatus:
+        """ホストプログラムのステータスを取得します。"""
+        return cast(HostStatus, await self.get("status"))
+
+    async def open(self, host_name: Optional[str] = None, start_host: bool = True) -> "AsyncAIVoiceTTsControl":
+        """API を初期化し、必要であればホストプログラムを起動して接続します。
+
+        Parameters
+        ----------
+        host_name : str, optional
+            接続するホスト名。省略時は利用可能な最初のホストに接続します。
+        start_host : bool
+            ホストプログラムが起動していない場合に起動するかどうか
+        """
+
+        def open_control(control: AIVoiceTTsControl) -> None:
+            name = host_name
+            if name is None:
+                host_names = control.get_available_host_names()
+                if not host_names:
+                    raise RuntimeError("利用可能なホストが見つかりません")
+                name = host_names[0]
+            control.initialize(name)
+            if start_host and control.status == HostStatus.NotRunning:
+                control.start_host()
+            control.connect()
+
+        await self.run(open_control)
+        return self
+
+    async def wait_until_idle(self, timeout: Optional[float] = None, expected_ms: Optional[int] = None) -> bool:
+        """ステータスが Busy でなくなるまで待機します。
+
+        Returns
+        -------
+        bool
+            タイムアウトした場合は False
+        """
+        started = time.monotonic()
+        deadline = None if timeout is None else started + timeout
+        expected = None if expected_ms is None else expected_ms / 1000
+        interval = None
+        while await self.status() == HostStatus.Busy:
+            now = time.monotonic()
+            if deadline is not None and now >= deadline:
+                return False
+            interval = next_poll_interval(now - started, expected, interval, max_interval=self.poll_interval)
+            await asyncio.sleep(interval)
+        return True
+
+    async def speak(
+        self,
+        text: str,
+        timeout: Optional[float] = None,
+        expected_ms: Optional[int] = None,
+    ) -> None:
+        """テキストを読み上げ、再生が完了するまで待機します。
+
+        固定時間のスリープではなく、ステータスが Busy から戻った時点で完了します。
+        """
+        async with self._lock():
+
+            def play(control: AIVoiceTTsControl) -> None:
+                control.text_edit_mode = TextEditMode.Text
+                control.text = text
+                control.play()
+
+            await self.run(play)
+
+            # 再生開始直後はまだ Busy になっていない場合がある
+            started = time.monotonic()
+            interval = None
+            while await self.status() != HostStatus.Busy:
+                elapsed = time.monotonic() - started
+                if elapsed >= self.start_timeout:
+                    return
+                interval = next_poll_interval(elapsed, None, interval, max_interval=self.poll_interval)
+                await asyncio.sleep(interval)
+
+            if not await self.wait_until_idle(timeout, expected_ms):
+                raise asyncio.TimeoutError("再生の完了待ちがタイムアウトしました")
+
+    async def save(self, text: str, path: str) -> str:
+        """テキストを読み上げた音声をファイルに保存し、保存先のファイルパスを返します。"""
+        async with self._lock():
+            return cast(str, await self.run(lambda control: control.synthesize(text, path)))
+
+    async def close(self, disconnect: bool = True) -> None:
+        """ホストプログラムとの接続を解除し、ワーカースレッドを終了します。"""
+        try:
+            if disconnect and self._control_future.done() and self._control_future.exception() is None:
+                await self.run(lambda control: control.disconnect())
+        finally:
+            self._executor.shutdown(wait=False)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+        return False
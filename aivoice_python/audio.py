@@ -0,0 +1,328 @@
+"""
+A.I.VOICE Audio Utilities
+
+This module provides helpers for reading the WAV files written by
+``SaveAudioToFile`` without extra buffer copies, and for assembling many of
+them into one file.
+"""
+
+import mmap
+import os
+import struct
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# WAVE_FORMAT_PCM / WAVE_FORMAT_EXTENSIBLE
+_FORMAT_PCM = 0x0001
+_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+class WavFormat:
+    """WAV ファイルのフォーマット情報と PCM データの位置"""
+
+    __slots__ = ("sample_rate", "channels", "sample_width", "data_offset", "data_size")
+
+    def __init__(self, sample_rate: int, channels: int, sample_width: int, data_offset: int, data_size: int):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.sample_width = sample_width
+        self.data_offset = data_offset
+        self.data_size = data_size
+
+    @property
+    def frame_size(self) -> int:
+        """1フレームあたりのバイト数"""
+        return self.channels * self.sample_width
+
+    def same_format(self, other: "WavFormat") -> bool:
+        """サンプリングレート・チャンネル数・量子化ビット数が一致するかどうか"""
+        return (
+            self.sample_rate == other.sample_rate
+            and self.channels == other.channels
+            and self.sample_width == other.sample_width
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"WavFormat(sample_rate={self.sample_rate}, channels={self.channels}, "
+            f"sample_width={self.sample_width}, data_offset={self.data_offset}, data_size={self.data_size})"
+        )
+
+
+def _parse_fmt(body) -> tuple:
+    """fmt チャンクの本体から (サンプリングレート, チャンネル数, 1サンプルあたりのバイト数) を取得します。"""
+    if len(body) < 16:
+        raise ValueError("fmt チャンクが不正です")
+    format_tag, channels, sample_rate = struct.unpack_from("<HHI", body, 0)
+    bits = struct.unpack_from("<H", body, 14)[0]
+    if format_tag not in (_FORMAT_PCM, _FORMAT_EXTENSIBLE):
+        raise ValueError(f"リニア PCM 以外の WAV には対応していません: {format_tag:#x}")
+    return (sample_rate, channels, bits // 8)
+
+
+def _locate_data(read: Callable[[int, int], Any], length: int, size: int) -> WavFormat:
+    """チャンクのヘッダーを順にたどり、PCM フォーマットと data チャンクの位置を取得します。
+
+    Parameters
+    ----------
+    read : Callable[[int, int], bytes]
+        (位置, バイト数) を受け取り、その範囲の内容を返す関数
+    length : int
+        read で読み込める範囲の長さ
+    size : int
+        ファイル全体のサイズ
+    """
+    riff = read(0, 12)
+    if len(riff) < 12 or bytes(riff[0:4]) != b"RIFF" or bytes(riff[8:12]) != b"WAVE":
+        raise ValueError("WAV ファイルではありません")
+
+    fmt = None
+    offset = 12
+    while offset + 8 <= length:
+        header = read(offset, 8)
+        chunk_id = bytes(header[0:4])
+        chunk_size = struct.unpack_from("<I", header, 4)[0]
+        body = offset + 8
+        if chunk_id == b"fmt ":
+            fmt = _parse_fmt(read(body, 16))
+        elif chunk_id == b"data":
+            if fmt is None:
+                raise ValueError("fmt チャンクが見つかりません")
+            # 書き込み途中などでサイズが不正な場合はファイル末尾までを data とみなす
+            data_size = min(chunk_size, size - body)
+            return WavFormat(fmt[0], fmt[1], fmt[2], body, data_size)
+        offset = body + chunk_size + (chunk_size & 1)
+    raise ValueError("data チャンクが見つかりません")
+
+
+def parse_wav_header(buffer, size: Optional[int] = None) -> WavFormat:
+    """WAV ファイルの先頭部分から PCM フォーマットと data チャンクの位置を取得します。
+
+    Parameters
+    ----------
+    buffer : bytes | bytearray | memoryview | mmap
+        WAV ファイルの内容 (少なくとも data チャンクのヘッダーまで)
+    size : int, optional
+        ファイル全体のサイズ。data チャンクのサイズが不正な場合の補正に使用します。
+    """
+    view = memoryview(buffer)
+    return _locate_data(lambda offset, n: view[offset:offset + n], len(view), len(view) if size is None else size)
+
+
+def read_wav_format(path: str) -> WavFormat:
+    """WAV ファイルのヘッダーのみを読み込んでフォーマット情報を取得します。
+
+    チャンクのヘッダーを順に読み、data チャンクの前にある LIST などのチャンクは大きさに関わらず読み飛ばします。
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+
+        def read(offset: int, n: int) -> bytes:
+            f.seek(offset)
+            return f.read(n)
+
+        return _locate_data(read, size, size)
+
+
+class SynthesizedAudio:
+    """メモリ上に読み込んだ合成音声
+
+    Attributes
+    ----------
+    data : bytearray
+        WAV ファイル全体
+    pcm : memoryview
+        data のうち PCM データ部分のビュー (コピーではありません)
+    sample_rate : int
+        サンプリングレート
+    channels : int
+        チャンネル数
+    sample_width : int
+        1サンプルあたりのバイト数
+    """
+
+    __slots__ = ("data", "pcm", "sample_rate", "channels", "sample_width")
+
+    def __init__(self, data: bytearray, wav_format: WavFormat):
+        self.data = data
+        self.pcm = memoryview(data)[wav_format.data_offset:wav_format.data_offset + wav_format.data_size]
+        self.sample_rate = wav_format.sample_rate
+        self.channels = wav_format.channels
+        self.sample_width = wav_format.sample_width
+
+    @property
+    def frames(self) -> int:
+        """フレーム数"""
+        return len(self.pcm) // (self.channels * self.sample_width)
+
+    @property
+    def duration_ms(self) -> float:
+        """再生時間 (ミリ秒)"""
+        return self.frames * 1000 / self.sample_rate
+
+    def to_array(self):
+        """PCM データを (フレーム数, チャンネル数) の NumPy 配列として返します。
+
+        配列は data を共有するビューで、コピーは行いません。NumPy が必要です。
+        """
+        try:
+            import numpy as np
+        except ImportError as e:
+            raise ImportError("to_array() には NumPy が必要です: pip install aivoice-python[numpy]") from e
+        dtypes = {1: np.uint8, 2: np.dtype("<i2"), 4: np.dtype("<i4")}
+        if self.sample_width not in dtypes:
+            raise ValueError(f"{self.sample_width * 8} bit の PCM には対応していません")
+        samples = np.frombuffer(self.pcm, dtype=dtypes[self.sample_width])
+        return samples[: self.frames * self.channels].reshape(-1, self.channels)
+
+
+def read_wav(path: str) -> SynthesizedAudio:
+    """WAV ファイルをメモリに読み込みます。
+
+    ファイルサイズ分のバッファを確保して1回で読み込むため、ヘッダー解析や PCM の切り出しでコピーは発生しません。
+    """
+    size = os.path.getsize(path)
+    data = bytearray(size)
+    read = 0
+    with open(path, "rb", buffering=0) as f, memoryview(data) as view:
+        while read < size:
+            n = f.readinto(view[read:])
+            if not n:
+                break
+            read += n
+    del data[read:]
+    return SynthesizedAudio(data, parse_wav_header(data))
+
+
+def default_temp_dir() -> Optional[str]:
+    """一時的な音声ファイルの書き出し先を返します。
+
+    メモリ上のファイルシステム (/dev/shm) が利用できる場合はそれを、
+    それ以外は None (tempfile の既定の一時ディレクトリ) を返します。
+    """
+    shm = "/dev/shm"
+    if os.path.isdir(shm) and os.access(shm, os.W_OK):
+        return shm
+    return None
+
+
+def build_wav_header(wav_format: WavFormat, data_size: int) -> bytes:
+    """リニア PCM の WAV ヘッダー (44 バイト) を作成します。"""
+    block_align = wav_format.channels * wav_format.sample_width
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + data_size, b"WAVE",
+        b"fmt ", 16, _FORMAT_PCM, wav_format.channels, wav_format.sample_rate,
+        wav_format.sample_rate * block_align, block_align, wav_format.sample_width * 8,
+        b"data", data_size,
+    )
+
+
+def _crossfade(out: mmap.mmap, position: int, f, frames: int, wav_format: WavFormat) -> None:
+    """出力済みの末尾 frames フレームと、入力の先頭 frames フレームを線形にクロスフェードします。"""
+    try:
+        import numpy as np
+    except ImportError as e:
+        raise ImportError("クロスフェードには NumPy が必要です: pip install aivoice-python[numpy]") from e
+
+    dtypes: Dict[int, Any] = {1: np.uint8, 2: np.dtype("<i2"), 4: np.dtype("<i4")}
+    dtype = dtypes.get(wav_format.sample_width)
+    if dtype is None:
+        raise ValueError(f"{wav_format.sample_width * 8} bit の PCM には対応していません")
+    size = frames * wav_format.frame_size
+    head = np.frombuffer(f.read(size), dtype=dtype).reshape(-1, wav_format.channels)
+    tail = np.frombuffer(out, dtype=dtype, count=head.size, offset=position - size).reshape(-1, wav_format.channels)
+
+    offset = 128.0 if wav_format.sample_width == 1 else 0.0
+    fade_in = np.linspace(0.0, 1.0, frames, dtype=np.float32)[:, None]
+    mixed = (tail - offset) * (1.0 - fade_in) + (head - offset) * fade_in + offset
+    info = np.iinfo(dtype)
+    tail[:] = np.clip(np.rint(mixed), info.min, info.max).astype(dtype)
+
+
+def concatenate_wavs(
+    inputs: Iterable[str],
+    output: str,
+    silence_ms: float = 0,
+    crossfade_ms: float = 0,
+) -> WavFormat:
+    """複数の WAV ファイルを連結して1つの WAV ファイルに書き出します。
+
+    出力ファイルは最終的なサイズで確保してからメモリマップし、各入力の PCM データを直接読み込むため、
+    入力の数や長さに関わらずメモリ使用量はほぼ一定です。
+
+    Parameters
+    ----------
+    inputs : Iterable[str]
+        連結する WAV ファイルのパス。すべて同じフォーマットである必要があります。
+    output : str
+        出力先の WAV ファイルのパス
+    silence_ms : float
+        各ファイルの間に挿入する無音の長さ (ミリ秒)
+    crossfade_ms : float
+        隣り合うファイルを重ねてクロスフェードする長さ (ミリ秒)。NumPy が必要です。
+
+    Returns
+    -------
+    WavFormat
+        出力ファイルのフォーマット情報
+    """
+    if silence_ms < 0 or crossfade_ms < 0:
+        raise ValueError("silence_ms と crossfade_ms は 0 以上である必要があります")
+    if silence_ms and crossfade_ms:
+        raise ValueError("silence_ms と crossfade_ms は同時に指定できません")
+
+    paths = list(inputs)
+    if not paths:
+        raise ValueError("連結する WAV ファイルが指定されていません")
+    formats: List[WavFormat] = [read_wav_format(path) for path in paths]
+    base = formats[0]
+    for path, wav_format in zip(paths[1:], formats[1:]):
+        if not wav_format.same_format(base):
+            raise ValueError(f"WAV ファイルのフォーマットが一致しません: {path} ({wav_format!r})")
+
+    frame_size = base.frame_size
+    silence_frames = int(base.sample_rate * silence_ms / 1000)
+    crossfade_frames = int(base.sample_rate * crossfade_ms / 1000)
+    clip_frames = [wav_format.data_size // frame_size for wav_format in formats]
+    overlaps = [0] + [
+        min(crossfade_frames, previous, current)
+        for previous, current in zip(clip_frames, clip_frames[1:])
+    ]
+    total_frames = sum(clip_frames) + silence_frames * (len(paths) - 1) - sum(overlaps)
+    data_size = total_frames * frame_size
+    if data_size + 36 > 0xFFFFFFFF:
+        raise ValueError("出力が WAV ファイルの最大サイズ (4 GiB) を超えます")
+
+    header = build_wav_header(base, data_size)
+    with open(output, "w+b") as out_file:
+        out_file.write(header)
+        out_file.truncate(len(header) + data_size)
+        if data_size == 0:
+            return parse_wav_header(header, len(header) + data_size)
+        with mmap.mmap(out_file.fileno(), 0) as out:
+            position = len(header)
+            for index, (path, wav_format) in enumerate(zip(paths, formats)):
+                if index > 0 and silence_frames:
+                    if base.sample_width == 1:
+                        # 8 bit PCM の無音は 0x80 (それ以外は確保時の 0 のまま)
+                        out[position:position + silence_frames * frame_size] = b"\x80" * (silence_frames * frame_size)
+                    position += silence_frames * frame_size
+                size = clip_frames[index] * frame_size
+                with open(path, "rb", buffering=0) as f:
+                    f.seek(wav_format.data_offset)
+                    overlap = overlaps[index]
+                    if overlap:
+                        _crossfade(out, position, f, overlap, base)
+                        size -= overlap * frame_size
+                    with memoryview(out) as view:
+                        target = view[position:position + size]
+                        read = 0
+                        while read < size:
+                            n = f.readinto(target[read:])
+                            if not n:
+                                raise ValueError(f"WAV ファイルが途中で終わっています: {path}")
+                            read += n
+                        target.release()
+                position += size
+            out.flush()
+    return parse_wav_header(header, len(header) + data_size)
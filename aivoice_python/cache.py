@@ -0,0 +1,215 @@
+"""
+A.I.VOICE Synthesis Cache
+
+This module provides a content-addressed on-disk cache for synthesized audio.
+"""
+
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from typing import Any, Dict, Mapping, Optional, Union
+
+
+def _canonical_json(value: Union[str, Mapping[str, Any], None]) -> str:
+    """JSON 文字列または辞書をキー順に並べた JSON 文字列に変換します。"""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        value = json.loads(value)
+    return json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
+
+def synthesis_key(
+    text: str,
+    voice_preset: Union[str, Mapping[str, Any], None],
+    master_control: Union[str, Mapping[str, Any], None],
+) -> str:
+    """合成結果を識別するキーを作成します。
+
+    Parameters
+    ----------
+    text : str
+        読み上げるテキスト。前後の空白と連続する空白は無視されます。
+    voice_preset : str | dict
+        ボイスプリセットの各値 (JSON 文字列または辞書)
+    master_control : str | dict
+        マスターコントロールの各値 (JSON 文字列または辞書)
+    """
+    digest = hashlib.sha256()
+    for part in (" ".join(text.split()), _canonical_json(voice_preset), _canonical_json(master_control)):
+        encoded = part.encode("utf-8")
+        digest.update(len(encoded).to_bytes(8, "little"))
+        digest.update(encoded)
+    return digest.hexdigest()
+
+
+class AudioCache:
+    """合成済み音声のディスクキャッシュ
+
+    テキスト・ボイスプリセット・マスターコントロールから作成したキーで WAV ファイルを保存します。
+    合計サイズが max_bytes を超えると、最も長く使用されていないファイルから削除されます。
+
+    Parameters
+    ----------
+    directory : str
+        キャッシュファイルの保存先ディレクトリ
+    max_bytes : int
+        キャッシュの最大合計サイズ (バイト)
+    """
+
+    SUFFIX = ".wav"
+
+    def __init__(self, directory: str, max_bytes: int = 512 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    def _load(self) -> None:
+        """既存のキャッシュファイルを更新日時の古い順に読み込みます。"""
+        found = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(self.SUFFIX):
+                stat = entry.stat()
+                found.append((stat.st_mtime, entry.name[: -len(self.SUFFIX)], stat.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+            self._total_bytes += size
+        self._evict()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.SUFFIX)
+
+    def _evict(self) -> None:
+        while self._total_bytes > self.max_bytes and self._entries:
+            key, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        """キャッシュファイルの合計サイズを取得します。"""
+        return self._total_bytes
+
+    def get(self, key: str) -> Optional[str]:
+        """キーに対応するキャッシュファイルのパスを取得します。存在しない場合は None を返します。
+
+        返したファイルは、ほかのスレッドの put() による削除から保護されません。
+        ファイルを複製する場合は copy_to() を使用してください。
+        """
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            path = self._path(key)
+            if not os.path.isfile(path):
+                # 外部から削除された場合
+                self._total_bytes -= self._entries.pop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return path
+
+    def copy_to(self, key: str, path: str) -> bool:
+        """キーに対応するキャッシュファイルを path へ複製します。存在しない場合は False を返します。
+
+        複製中にほかのスレッドの put() で削除されないよう、ロックを保持したまま複製します。
+        """
+        source = self._path(key)
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return False
+            try:
+                shutil.copyfile(source, path)
+            except FileNotFoundError:
+                if os.path.isfile(source):
+                    raise
+                # 外部から削除された場合
+                self._total_bytes -= self._entries.pop(key)
+                self.misses += 1
+                return False
+            self._entries.move_to_end(key)
+            self.hits += 1
+            try:
+                os.utime(source)
+            except OSError:
+                pass
+        return True
+
+    def put(self, key: str, source_path: str) -> str:
+        """音声ファイルをキャッシュに保存し、キャッシュファイルのパスを返します。
+
+        一時ファイルへ書き込んだ後に置き換えるため、書き込み途中のファイルが読まれることはありません。
+        """
+        fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+        try:
+            with os.fdopen(fd, "wb") as dst, open(source_path, "rb") as src:
+                shutil.copyfileobj(src, dst)
+            size = os.path.getsize(tmp_path)
+            path = self._path(key)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+        with self._lock:
+            self._total_bytes -= self._entries.pop(key, 0)
+            self._entries[key] = size
+            self._total_bytes += size
+            self._evict()
+        return path
+
+    def clear(self) -> None:
+        """キャッシュファイルをすべて削除します。"""
+        with self._lock:
+            for key in self._entries:
+                try:
+                    os.remove(self._path(key))
+                except FileNotFoundError:
+                    pass
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """ヒット数・ミス数などの統計情報を取得します。"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+            }
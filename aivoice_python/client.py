@@ -0,0 +1,130 @@
+"""
+A.I.VOICE Synthesis Daemon Client
+
+This module provides a pure-Python client for ``python -m aivoice_python.server``.
+It does not require pythonnet.
+"""
+
+import base64
+import io
+import json
+import socket
+import threading
+from typing import Any, List, Optional, Tuple, Union, cast
+
+DEFAULT_ADDRESS = ("127.0.0.1", 50080)
+
+
+class AIVoiceClientError(RuntimeError):
+    """デーモンがエラーを返した場合の例外"""
+
+
+class AIVoiceClient:
+    """合成デーモンのクライアント
+
+    Parameters
+    ----------
+    address : tuple[str, int] | str
+        デーモンのアドレス。文字列の場合は Unix ドメインソケットのパスとして扱います。
+    timeout : float, optional
+        ソケットのタイムアウト (秒)
+    """
+
+    def __init__(self, address: Union[Tuple[str, int], str] = DEFAULT_ADDRESS, timeout: Optional[float] = None):
+        self.address = address
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._socket: Optional[socket.socket] = None
+        self._file: Optional[io.BufferedRWPair] = None
+
+    def _connect(self) -> io.BufferedRWPair:
+        if isinstance(self.address, str):
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.settimeout(self.timeout)
+        sock.connect(self.address)
+        self._socket = sock
+        self._file = file = sock.makefile("rwb")
+        return file
+
+    def request(self, op: str, **params) -> Any:
+        """リクエストを送信し、結果を返します。"""
+        payload = dict(params, op=op)
+        line = json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n"
+        with self._lock:
+            file = self._file
+            if self._socket is None or file is None:
+                file = self._connect()
+            try:
+                file.write(line)
+                file.flush()
+                response = file.readline()
+            except OSError:
+                self.close()
+                raise
+            if not response:
+                self.close()
+                raise ConnectionError("デーモンとの接続が切断されました")
+        response = json.loads(response)
+        if not response["ok"]:
+            raise AIVoiceClientError(response["error"])
+        return response["result"]
+
+    def ping(self) -> str:
+        return cast(str, self.request("ping"))
+
+    def status(self) -> str:
+        """ホストプログラムのステータス名を取得します。"""
+        return cast(str, self.request("status"))
+
+    def stats(self) -> dict:
+        """save リクエストの合成回数と合成結果を共有した回数を取得します。"""
+        return cast(dict, self.request("stats"))
+
+    def voice_names(self) -> List[str]:
+        return cast(List[str], self.request("voice_names"))
+
+    def voice_preset_names(self) -> List[str]:
+        return cast(List[str], self.request("voice_preset_names"))
+
+    def get_voice_preset(self, preset_name: str) -> dict:
+        return cast(dict, self.request("get_voice_preset", preset_name=preset_name))
+
+    def play_time(self, text: str, voice_preset_name: Optional[str] = None) -> int:
+        return cast(int, self.request("play_time", text=text, voice_preset_name=voice_preset_name))
+
+    def speak(self, text: str, voice_preset_name: Optional[str] = None, timeout: Optional[float] = None) -> bool:
+        """テキストを読み上げ、再生が完了するまで待機します。"""
+        return cast(bool, self.request("speak", text=text, voice_preset_name=voice_preset_name, timeout=timeout))
+
+    def save(self, text: str, path: Optional[str] = None, voice_preset_name: Optional[str] = None) -> str:
+        """テキストを読み上げた音声をデーモン側のファイルに保存し、そのパスを返します。
+
+        path はデーモンの output_dir からの相対パスで指定します。
+        """
+        return cast(str, self.request("save", text=text, path=path, voice_preset_name=voice_preset_name))
+
+    def synthesize_bytes(self, text: str, voice_preset_name: Optional[str] = None) -> bytes:
+        """テキストを読み上げた音声を WAV 形式のバイト列で取得します。"""
+        encoded = self.request("save", text=text, voice_preset_name=voice_preset_name, return_audio=True)
+        return base64.b64decode(encoded)
+
+    def close(self) -> None:
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
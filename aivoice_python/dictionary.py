@@ -0,0 +1,205 @@
+"""
+A.I.VOICE Dictionary Reload Manager
+
+This module batches dictionary edits and coalesces the resulting
+``Reload*Dictionary`` calls so that bursts of changes stall the host once.
+"""
+
+from enum import Enum
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .aivoice_control import AIVoiceTTsControl
+
+
+class DictionaryType(Enum):
+    """辞書の種類"""
+    Word = "word"  # 単語辞書
+    Phrase = "phrase"  # フレーズ辞書
+    Symbol = "symbol"  # 記号ポーズ辞書
+
+
+class DictionaryManager:
+    """辞書の編集をまとめ、再読込みを辞書の種類毎に1回へまとめるクラス
+
+    request_reload() や edit() の呼び出しから window 秒間新たな要求が無い時点で
+    (ただし最初の要求から max_delay 秒以内に)、溜まった編集を順に実行し、
+    対象の辞書を種類毎に1回だけ再読込みします。
+    編集と再読込みは AIVoiceTTsControl.job_lock を保持し、ホストプログラムが Busy でなくなるのを待ってから行うため、
+    合成や再生の途中には実行されません。再読込みに失敗した要求は破棄されず、window 秒後に再試行されます。
+
+    ホストプログラムの API には単語やフレーズを編集する機能が無いため、
+    辞書ファイルの編集は edit() に渡す関数で行います。
+
+    Parameters
+    ----------
+    control : AIVoiceTTsControl
+        再読込みを行う制御クラス
+    window : float
+        要求をまとめる時間 (秒)
+    max_delay : float, optional
+        最初の要求から再読込みまでの最大時間 (秒)。省略時は window の 10 倍です。
+    """
+
+    def __init__(self, control: "AIVoiceTTsControl", window: float = 1.0, max_delay: Optional[float] = None):
+        if window < 0:
+            raise ValueError("window は 0 以上である必要があります")
+        self.control = control
+        self.window = window
+        self.max_delay = max_delay if max_delay is not None else window * 10
+        self._condition = threading.Condition()
+        self._edits: List[Tuple[DictionaryType, Callable[[], None]]] = []
+        self._pending: Dict[DictionaryType, int] = {}
+        self._first_request: Optional[float] = None
+        self._last_request: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self.requests = 0
+        self.edits = 0
+        self.reloads = {kind: 0 for kind in DictionaryType}
+
+    def request_reload(self, kind: DictionaryType) -> None:
+        """辞書の再読込みを要求します。"""
+        self._enqueue(kind, None)
+
+    def edit(self, kind: DictionaryType, func: Callable[[], None]) -> None:
+        """辞書ファイルを編集する関数を登録し、その辞書の再読込みを要求します。
+
+        func は再読込みの直前に、登録された順に呼び出されます。
+        """
+        self._enqueue(kind, func)
+
+    def _enqueue(self, kind: DictionaryType, func: Optional[Callable[[], None]]) -> None:
+        kind = DictionaryType(kind)
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("DictionaryManager は終了しています")
+            now = time.monotonic()
+            if func is not None:
+                self._edits.append((kind, func))
+            self._pending[kind] = self._pending.get(kind, 0) + 1
+            self.requests += 1
+            if self._first_request is None:
+                self._first_request = now
+            self._last_request = now
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="aivoice-dictionary", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def _due(self) -> Optional[float]:
+        """溜まった要求を処理する時刻 (要求が無い場合は None)"""
+        if self._first_request is None or self._last_request is None:
+            return None
+        return min(self._last_request + self.window, self._first_request + self.max_delay)
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while True:
+                    if self._closed:
+                        return
+                    due = self._due()
+                    if due is None:
+                        self._condition.wait()
+                        continue
+                    remaining = due - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+            self.flush()
+
+    def flush(self) -> Dict[DictionaryType, int]:
+        """溜まった編集と再読込みを直ちに実行します。
+
+        Returns
+        -------
+        dict[DictionaryType, int]
+            再読込みした辞書の種類と、それにまとめられた要求の数 (失敗して要求に戻した種類は含みません)
+        """
+        with self._condition:
+            edits, self._edits = self._edits, []
+            pending, self._pending = self._pending, {}
+            self._first_request = None
+            self._last_request = None
+        if not pending:
+            return {}
+
+        reloads = {
+            DictionaryType.Word: self.control.reload_word_dictionary,
+            DictionaryType.Phrase: self.control.reload_phrase_dictionary,
+            DictionaryType.Symbol: self.control.reload_symbol_dictionary,
+        }
+        failed: Dict[DictionaryType, int] = {}
+        with self.control.job_lock:
+            try:
+                # job_lock を保持しない処理 (AsyncAIVoiceTTsControl.speak() など) による再生の完了を待つ
+                self.control.wait_until_idle()
+            except Exception as e:
+                for kind in pending:
+                    self.control._emit("dictionary_error", kind=kind, error=e)
+                self._requeue(edits, pending)
+                return {}
+            for kind, func in edits:
+                try:
+                    func()
+                except Exception as e:
+                    self.control._emit("dictionary_error", kind=kind, error=e)
+                with self._condition:
+                    self.edits += 1
+            for kind in DictionaryType:
+                if kind not in pending:
+                    continue
+                try:
+                    reloads[kind]()
+                except Exception as e:
+                    self.control._emit("dictionary_error", kind=kind, error=e)
+                    failed[kind] = pending[kind]
+                    continue
+                with self._condition:
+                    self.reloads[kind] += 1
+                self.control._emit("dictionary_reload", kind=kind, requests=pending[kind])
+        if failed:
+            self._requeue([], failed)
+        return {kind: count for kind, count in pending.items() if kind not in failed}
+
+    def _requeue(self, edits: List[Tuple[DictionaryType, Callable[[], None]]], pending: Dict[DictionaryType, int]) -> None:
+        """実行できなかった編集と再読込みを要求に戻し、window 秒後に再試行します。"""
+        with self._condition:
+            self._edits[:0] = edits
+            for kind, count in pending.items():
+                self._pending[kind] = self._pending.get(kind, 0) + count
+            now = time.monotonic()
+            if self._first_request is None:
+                self._first_request = now
+            self._last_request = now
+            self._condition.notify()
+
+    def stats(self) -> Dict[str, object]:
+        """要求・編集・再読込みの回数を取得します。"""
+        with self._condition:
+            return {
+                "requests": self.requests,
+                "edits": self.edits,
+                "reloads": {kind.value: count for kind, count in self.reloads.items()},
+                "pending": sum(self._pending.values()),
+            }
+
+    def close(self, flush: bool = True) -> None:
+        """バックグラウンドスレッドを終了します。flush が有効な場合は溜まった要求を実行してから終了します。"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        if flush:
+            self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
@@ -0,0 +1,168 @@
+"""
+A.I.VOICE Duration Estimator
+
+This module predicts the play time of a text from its mora count and the
+pause settings, without asking the host to synthesize it.
+"""
+
+import json
+import re
+import threading
+from typing import Any, Mapping, Tuple, Union
+
+# 直前の文字と合わせて1モーラになる小書きの仮名
+_SMALL_KANA = frozenset("ぁぃぅぇぉゃゅょゎァィゥェォャュョヮ")
+
+_KANA_PATTERN = re.compile(r"[ぁ-ゖァ-ヺーｦ-ﾝ]")
+_KANJI_PATTERN = re.compile(r"[一-鿿㐀-䶿々]")
+_LATIN_PATTERN = re.compile(r"[A-Za-zＡ-Ｚａ-ｚ]")
+_DIGIT_PATTERN = re.compile(r"[0-9０-９]")
+_MIDDLE_PAUSE_PATTERN = re.compile(r"[、，,]")
+_LONG_PAUSE_PATTERN = re.compile(r"[。．！？!?]|\.(?=\s|$)")
+
+# 既定のポーズの長さ (ミリ秒)
+DEFAULT_MIDDLE_PAUSE = 150
+DEFAULT_LONG_PAUSE = 370
+
+
+def pause_settings(
+    voice_preset: Union[str, Mapping[str, Any], None],
+    master_control: Union[str, Mapping[str, Any], None],
+) -> Tuple[float, float, float]:
+    """ボイスプリセットとマスターコントロールから (話速, 短ポーズ (ミリ秒), 長ポーズ (ミリ秒)) を求めます。
+
+    マスターコントロールの値は既定値に対する倍率としてボイスプリセットの値に掛け合わせます。
+    """
+    preset: Mapping[str, Any] = json.loads(voice_preset) if isinstance(voice_preset, str) else voice_preset or {}
+    master: Mapping[str, Any] = (
+        json.loads(master_control) if isinstance(master_control, str) else master_control or {}
+    )
+    speed = preset.get("Speed", 1.0) * master.get("Speed", 1.0) or 1.0
+    middle = (
+        preset.get("MiddlePause", DEFAULT_MIDDLE_PAUSE)
+        * master.get("MiddlePause", DEFAULT_MIDDLE_PAUSE) / DEFAULT_MIDDLE_PAUSE
+    )
+    long = (
+        preset.get("LongPause", DEFAULT_LONG_PAUSE)
+        * master.get("LongPause", DEFAULT_LONG_PAUSE) / DEFAULT_LONG_PAUSE
+    )
+    return speed, middle, long
+
+
+class DurationEstimator:
+    """モーラ数とポーズ設定から再生時間を見積もるクラス
+
+    再生時間は ``モーラ数 × 1モーラあたりの時間 / 話速 + 短ポーズ数 × 短ポーズ + 長ポーズ数 × 長ポーズ`` で求めます。
+    observe() で実際の再生時間を与えると、1モーラあたりの時間を最小二乗法で補正します。
+
+    Parameters
+    ----------
+    ms_per_mora : float
+        補正前の話速 1.0 における1モーラあたりの時間 (ミリ秒)
+    kanji_mora : float
+        漢字1文字あたりのモーラ数の見込み
+    latin_mora : float
+        英字1文字あたりのモーラ数の見込み
+    digit_mora : float
+        数字1文字あたりのモーラ数の見込み
+    """
+
+    def __init__(
+        self,
+        ms_per_mora: float = 120.0,
+        kanji_mora: float = 2.0,
+        latin_mora: float = 1.0,
+        digit_mora: float = 2.0,
+    ):
+        self.kanji_mora = kanji_mora
+        self.latin_mora = latin_mora
+        self.digit_mora = digit_mora
+        self._initial_ms_per_mora = ms_per_mora
+        self._lock = threading.Lock()
+        self._samples = 0
+        self._sum_xy = 0.0
+        self._sum_xx = 0.0
+
+    @property
+    def ms_per_mora(self) -> float:
+        """話速 1.0 における1モーラあたりの時間 (ミリ秒)"""
+        with self._lock:
+            if self._sum_xx > 0:
+                return self._sum_xy / self._sum_xx
+            return self._initial_ms_per_mora
+
+    @property
+    def samples(self) -> int:
+        """補正に使用した実測値の数"""
+        return self._samples
+
+    def count_mora(self, text: str) -> float:
+        """テキストのモーラ数の見込みを求めます。"""
+        kana = _KANA_PATTERN.findall(text)
+        mora: float = len(kana) - sum(1 for c in kana if c in _SMALL_KANA)
+        mora += len(_KANJI_PATTERN.findall(text)) * self.kanji_mora
+        mora += len(_LATIN_PATTERN.findall(text)) * self.latin_mora
+        mora += len(_DIGIT_PATTERN.findall(text)) * self.digit_mora
+        return mora
+
+    @staticmethod
+    def count_pauses(text: str) -> Tuple[int, int]:
+        """テキストに含まれる (短ポーズ, 長ポーズ) の数を求めます。"""
+        return len(_MIDDLE_PAUSE_PATTERN.findall(text)), len(_LONG_PAUSE_PATTERN.findall(text))
+
+    def estimate(
+        self,
+        text: str,
+        speed: float = 1.0,
+        middle_pause: float = DEFAULT_MIDDLE_PAUSE,
+        long_pause: float = DEFAULT_LONG_PAUSE,
+    ) -> float:
+        """再生時間 (ミリ秒) を見積もります。
+
+        Parameters
+        ----------
+        speed : float
+            話速
+        middle_pause : float
+            短ポーズの長さ (ミリ秒)
+        long_pause : float
+            長ポーズの長さ (ミリ秒)
+        """
+        middle, long = self.count_pauses(text)
+        return self.count_mora(text) * self.ms_per_mora / (speed or 1.0) + middle * middle_pause + long * long_pause
+
+    def estimate_for(
+        self,
+        text: str,
+        voice_preset: Union[str, Mapping[str, Any], None],
+        master_control: Union[str, Mapping[str, Any], None],
+    ) -> float:
+        """ボイスプリセットとマスターコントロールの設定で読み上げた場合の再生時間 (ミリ秒) を見積もります。"""
+        return self.estimate(text, *pause_settings(voice_preset, master_control))
+
+    def observe(
+        self,
+        text: str,
+        play_time_ms: float,
+        speed: float = 1.0,
+        middle_pause: float = DEFAULT_MIDDLE_PAUSE,
+        long_pause: float = DEFAULT_LONG_PAUSE,
+    ) -> None:
+        """get_play_time() などで得た実際の再生時間を与え、1モーラあたりの時間を補正します。"""
+        mora = self.count_mora(text)
+        if mora <= 0:
+            return
+        middle, long = self.count_pauses(text)
+        # ポーズを除いた時間を話速 1.0 に換算する
+        speech_ms = (play_time_ms - middle * middle_pause - long * long_pause) * (speed or 1.0)
+        with self._lock:
+            self._samples += 1
+            self._sum_xy += mora * speech_ms
+            self._sum_xx += mora * mora
+
+    def reset(self) -> None:
+        """補正結果を破棄します。"""
+        with self._lock:
+            self._samples = 0
+            self._sum_xy = 0.0
+            self._sum_xx = 0.0
@@ -0,0 +1,213 @@
+"""
+A.I.VOICE Editor API Instrumentation
+
+This module times every call forwarded to ``TtsControl`` and exposes call
+counts, errors and latency histograms in the Prometheus text format.
+"""
+
+from bisect import bisect_left
+import threading
+import time
+from typing import Callable, ContextManager, Dict, List, Optional, Sequence
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _MethodStats:
+    __slots__ = ("count", "errors", "total", "buckets")
+
+    def __init__(self, bucket_count: int):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        # 最後の要素は +Inf
+        self.buckets = [0] * (bucket_count + 1)
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class Instrumentation:
+    """ホストプログラムへの API 呼び出しの計測結果を集計するクラス
+
+    AIVoiceTTsControl(instrumentation=Instrumentation()) のように渡すと、
+    TtsControl へのすべての呼び出し (プロパティの取得・設定を含む) の所要時間が記録されます。
+
+    Parameters
+    ----------
+    buckets : Sequence[float]
+        所要時間のヒストグラムの上限値 (秒) の一覧
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._methods: Dict[str, _MethodStats] = {}
+        self._events: Dict[str, int] = {}
+        self._hooks: List[Callable[[str, float, Optional[BaseException]], None]] = []
+        self._span_factories: List[Callable[[str], ContextManager]] = []
+
+    def add_hook(self, hook: Callable[[str, float, Optional[BaseException]], None]) -> None:
+        """呼び出し毎に (メソッド名, 所要時間 (秒), 例外または None) を受け取る関数を登録します。"""
+        self._hooks.append(hook)
+
+    def add_span_factory(self, factory: Callable[[str], ContextManager]) -> None:
+        """呼び出し毎にメソッド名を受け取り、呼び出しの間有効なコンテキストマネージャーを返す関数を登録します。
+
+        例: ``instrumentation.add_span_factory(tracer.start_as_current_span)`` (OpenTelemetry)
+        """
+        self._span_factories.append(factory)
+
+    def record(self, name: str, elapsed: float, error: Optional[BaseException] = None) -> None:
+        """1回分の呼び出しを記録します。"""
+        with self._lock:
+            stats = self._methods.get(name)
+            if stats is None:
+                stats = self._methods[name] = _MethodStats(len(self.buckets))
+            stats.count += 1
+            stats.total += elapsed
+            stats.buckets[bisect_left(self.buckets, elapsed)] += 1
+            if error is not None:
+                stats.errors += 1
+        for hook in self._hooks:
+            # 計測側の不具合でホストプログラムへの呼び出しの結果を変えない
+            try:
+                hook(name, elapsed, error)
+            except Exception as e:
+                print(f"Warning: Instrumentation hook failed: {e}")
+
+    def record_event(self, event: str, info: Optional[dict] = None) -> None:
+        """再接続などのイベントを記録します。AIVoiceTTsControl のイベントリスナーとして使用できます。"""
+        with self._lock:
+            self._events[event] = self._events.get(event, 0) + 1
+
+    def measure(self, name: str, func: Callable):
+        """func() を実行し、その所要時間を name として記録します。
+
+        フックやスパンで発生した例外は警告を表示して無視し、func() の戻り値や例外はそのまま呼び出し元へ返します。
+        """
+        spans = []
+        for factory in self._span_factories:
+            try:
+                span = factory(name)
+                span.__enter__()
+            except Exception as e:
+                print(f"Warning: Instrumentation span failed: {e}")
+            else:
+                spans.append(span)
+        started = time.perf_counter()
+        error = None
+        try:
+            return func()
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            for span in reversed(spans):
+                try:
+                    if error is None:
+                        span.__exit__(None, None, None)
+                    else:
+                        span.__exit__(type(error), error, error.__traceback__)
+                except Exception as e:
+                    print(f"Warning: Instrumentation span failed: {e}")
+            self.record(name, elapsed, error)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """メソッド毎の呼び出し回数・エラー数・合計所要時間・平均所要時間を取得します。"""
+        with self._lock:
+            return {
+                name: {
+                    "count": stats.count,
+                    "errors": stats.errors,
+                    "total_seconds": stats.total,
+                    "mean_seconds": stats.total / stats.count if stats.count else 0.0,
+                }
+                for name, stats in self._methods.items()
+            }
+
+    def reset(self) -> None:
+        """記録した内容をすべて破棄します。"""
+        with self._lock:
+            self._methods.clear()
+            self._events.clear()
+
+    def render_prometheus(self, prefix: str = "aivoice") -> str:
+        """記録した内容を Prometheus のテキスト形式で出力します。"""
+        lines = [
+            f"# HELP {prefix}_host_calls_total Number of calls forwarded to the A.I.VOICE Editor host.",
+            f"# TYPE {prefix}_host_calls_total counter",
+        ]
+        with self._lock:
+            methods = sorted(self._methods.items())
+            events = sorted(self._events.items())
+            for name, stats in methods:
+                lines.append(f'{prefix}_host_calls_total{{method="{_escape_label(name)}"}} {stats.count}')
+
+            lines += [
+                f"# HELP {prefix}_host_call_errors_total Number of host calls that raised an exception.",
+                f"# TYPE {prefix}_host_call_errors_total counter",
+            ]
+            for name, stats in methods:
+                lines.append(f'{prefix}_host_call_errors_total{{method="{_escape_label(name)}"}} {stats.errors}')
+
+            lines += [
+                f"# HELP {prefix}_host_call_duration_seconds Latency of host calls.",
+                f"# TYPE {prefix}_host_call_duration_seconds histogram",
+            ]
+            for name, stats in methods:
+                label = _escape_label(name)
+                cumulative = 0
+                for bound, count in zip(self.buckets + (float("inf"),), stats.buckets):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{prefix}_host_call_duration_seconds_bucket{{method="{label}",le="{le}"}} {cumulative}')
+                lines.append(f'{prefix}_host_call_duration_seconds_sum{{method="{label}"}} {stats.total!r}')
+                lines.append(f'{prefix}_host_call_duration_seconds_count{{method="{label}"}} {stats.count}')
+
+            lines += [
+                f"# HELP {prefix}_events_total Number of controller events such as reconnects and retries.",
+                f"# TYPE {prefix}_events_total counter",
+            ]
+            for event, count in events:
+                lines.append(f'{prefix}_events_total{{event="{_escape_label(event)}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+class InstrumentedTtsControl:
+    """すべての呼び出しの所要時間を Instrumentation に記録する TtsControl のラッパー
+
+    プロパティの取得は "get_<名前>"、設定は "set_<名前>"、メソッドはメソッド名で記録されます。
+    """
+
+    def __init__(self, inner, instrumentation: Instrumentation):
+        object.__setattr__(self, "_inner", inner)
+        object.__setattr__(self, "_instrumentation", instrumentation)
+
+    def __getattr__(self, name: str):
+        inner = self._inner
+        attribute = getattr(type(inner), name, None)
+        if attribute is not None and callable(attribute) and not isinstance(attribute, property):
+            # メソッドの取得自体はホストを呼び出さないため計測しない
+            method = getattr(inner, name)
+            instrumentation = self._instrumentation
+
+            def call(*args):
+                return instrumentation.measure(name, lambda: method(*args))
+
+            return call
+
+        value = self._instrumentation.measure("get_" + name, lambda: getattr(inner, name))
+        if callable(value):
+            instrumentation = self._instrumentation
+
+            def call(*args):
+                return instrumentation.measure(name, lambda: value(*args))
+
+            return call
+        return value
+
+    def __setattr__(self, name: str, value) -> None:
+        self._instrumentation.measure("set_" + name, lambda: setattr(self._inner, name, value))
@@ -0,0 +1,179 @@
+"""
+A.I.VOICE List Mode Document
+
+This module keeps a local copy of the editor's list-mode rows and brings the
+host in line with it using a minimal sequence of list API calls.
+"""
+
+from difflib import SequenceMatcher
+from typing import TYPE_CHECKING, Iterable, List, NamedTuple, Optional, Tuple, TypedDict
+
+if TYPE_CHECKING:
+    from .aivoice_control import AIVoiceTTsControl
+
+
+class ListItem(NamedTuple):
+    """リスト形式の1行"""
+    voice_preset_name: str  # ボイスプリセット名
+    sentence: str  # センテンス
+
+
+class ListSyncReport(TypedDict):
+    """ListDocument.sync() の結果"""
+    inserted: int  # 挿入した行数
+    removed: int  # 削除した行数
+    sentences: int  # センテンスを変更した行数
+    voice_presets: int  # ボイスプリセットを変更した行数
+    calls: int  # ホストプログラムの API 呼び出し回数
+
+
+def list_edit_script(old: Iterable[ListItem], new: Iterable[ListItem]) -> List[Tuple]:
+    """old の行を new に変えるための操作の一覧を求めます。
+
+    操作は先頭から順に適用します。
+
+    - ``("remove", index)``: index の行を削除
+    - ``("insert", index, item)``: index の位置に行を挿入 (index が行数と等しい場合は末尾に追加)
+    - ``("sentence", index, sentence)``: index の行のセンテンスを変更
+    - ``("voice_preset", index, voice_preset_name)``: index の行のボイスプリセットを変更
+    """
+    old = [ListItem(*item) for item in old]
+    new = [ListItem(*item) for item in new]
+    structural: List[Tuple] = []
+    # 変更する行の (new での位置, 変更前の行)
+    modified: List[Tuple[int, ListItem]] = []
+
+    opcodes = SequenceMatcher(None, old, new, autojunk=False).get_opcodes()
+    # 後ろから処理すると、前方の行の位置は変わらない
+    for tag, i1, i2, j1, j2 in reversed(opcodes):
+        if tag == "equal":
+            continue
+        common = min(i2 - i1, j2 - j1) if tag == "replace" else 0
+        for k in range(common):
+            modified.append((j1 + k, old[i1 + k]))
+        for index in range(i2 - 1, i1 + common - 1, -1):
+            structural.append(("remove", index))
+        for offset, item in enumerate(new[j1 + common:j2]):
+            structural.append(("insert", i1 + common + offset, item))
+
+    # 行の追加・削除の後は new と同じ並びになるため、変更は new での位置で指定する
+    script = structural
+    for index, before in sorted(modified):
+        after = new[index]
+        if after.sentence != before.sentence:
+            script.append(("sentence", index, after.sentence))
+        if after.voice_preset_name != before.voice_preset_name:
+            script.append(("voice_preset", index, after.voice_preset_name))
+    return script
+
+
+class ListDocument:
+    """ホストプログラムのリスト形式の行を手元に保持し、差分のみを反映するクラス
+
+    items を編集してから sync() を呼び出すと、前回の同期時からの差分を
+    insert_list_item・remove_list_item・set_list_sentence・set_list_voice_preset の最小限の呼び出しで反映します。
+    複数行を選択した状態での set_list_sentence・set_list_voice_preset の動作には依存せず、変更する行は1行ずつ選択します。
+    選択状態は同期後に元に戻されます (削除された行の選択は解除されます)。
+
+    ホストプログラム上で直接行を編集した場合は、手元の内容と一致しなくなります。
+
+    Parameters
+    ----------
+    control : AIVoiceTTsControl
+        リスト形式を操作する制御クラス
+    items : Iterable[ListItem], optional
+        ホストプログラムのリストに現在ある行。省略時は空とみなします。
+        ホストプログラムから読み込む場合は pull() を使用してください。
+    """
+
+    def __init__(self, control: "AIVoiceTTsControl", items: Optional[Iterable[Tuple[str, str]]] = None):
+        self.control = control
+        self._synced: List[ListItem] = [ListItem(*item) for item in items or []]
+        self.items: List[ListItem] = list(self._synced)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def pull(self) -> None:
+        """ホストプログラムのリストの行を読み込み、手元の内容を置き換えます。"""
+        self._synced = self.control.get_list_items()
+        self.items = list(self._synced)
+
+    def diff(self) -> List[Tuple]:
+        """前回の同期時から items への変更を反映する操作の一覧を求めます。"""
+        return list_edit_script(self._synced, self.items)
+
+    def sync(self, synthesize: bool = False) -> ListSyncReport:
+        """items の内容をホストプログラムのリストに反映します。
+
+        Parameters
+        ----------
+        synthesize : bool
+            センテンスの変更時に合成を行うかどうか (set_list_sentence の synthesize)
+        """
+        control = self.control
+        report = ListSyncReport(inserted=0, removed=0, sentences=0, voice_presets=0, calls=0)
+        length = len(self._synced)
+        script = self.diff()
+        # 末尾への追加のみの場合は選択状態を変更しない
+        changes_selection = any(
+            operation[0] != "insert" or operation[1] != length + position for position, operation in enumerate(script)
+        )
+        selection: List[int] = []
+        if changes_selection:
+            selection = control.get_list_selection_indices()
+            report["calls"] += 1
+        # 現在1行だけ選択している行
+        selected: Optional[int] = None
+
+        def select(index: int) -> None:
+            nonlocal selected
+            if selected != index:
+                control.set_list_selection_range(index, 1)
+                selected = index
+                report["calls"] += 1
+
+        try:
+            for operation in script:
+                kind = operation[0]
+                if kind == "remove":
+                    index = operation[1]
+                    select(index)
+                    control.remove_list_item(index)
+                    selected = None
+                    selection = [i - (i > index) for i in selection if i != index]
+                    length -= 1
+                    report["removed"] += 1
+                    report["calls"] += 1
+                elif kind == "insert":
+                    index, item = operation[1], operation[2]
+                    if index == length:
+                        control.add_list_item(item.voice_preset_name, item.sentence)
+                    else:
+                        # 選択行の位置に挿入される
+                        select(index)
+                        control.insert_list_item(item.voice_preset_name, item.sentence)
+                        selected = None
+                    selection = [i + (i >= index) for i in selection]
+                    length += 1
+                    report["inserted"] += 1
+                    report["calls"] += 1
+                elif kind == "sentence":
+                    index, sentence = operation[1], operation[2]
+                    select(index)
+                    control.set_list_sentence(sentence, synthesize)
+                    report["sentences"] += 1
+                    report["calls"] += 1
+                elif kind == "voice_preset":
+                    index, voice_preset_name = operation[1], operation[2]
+                    select(index)
+                    control.set_list_voice_preset(voice_preset_name)
+                    report["voice_presets"] += 1
+                    report["calls"] += 1
+        finally:
+            if changes_selection:
+                control.set_list_selection_indices([i for i in selection if i < length])
+                report["calls"] += 1
+        self.items = [ListItem(*item) for item in self.items]
+        self._synced = list(self.items)
+        return report
@@ -0,0 +1,176 @@
+"""
+A.I.VOICE Text Normalization
+
+This module canonicalizes input text before synthesis so that utterances that
+differ only in character width, whitespace or punctuation variants are sent
+to the host (and looked up in the caches) as the same string.
+"""
+
+from functools import lru_cache
+import re
+import unicodedata
+from typing import Dict, Optional
+
+# NFKC の後に適用するため、キーは NFKC 正規化後の文字列で指定する
+DEFAULT_SYMBOLS: Dict[str, str] = {
+    "...": "…",
+    "~": "〜",
+    "“": "「",
+    "”": "」",
+}
+
+DEFAULT_NUMBER_READINGS: Dict[str, str] = {
+    "%": "パーセント",
+}
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+_REPEATED_PUNCTUATION_PATTERN = re.compile(r"([!?。、…])\1+")
+_NUMBER_PATTERN = re.compile(r"\d+(?:,\d{3})+(?!\d)(?:\.\d+)?|\d+(?:\.\d+)?")
+
+_DIGITS = "〇一二三四五六七八九"
+_SMALL_UNITS = ("千", "百", "十", "")
+_LARGE_UNITS = ("", "万", "億", "兆", "京")
+
+
+def _read_digits(digits: str) -> str:
+    return "".join(_DIGITS[int(d)] for d in digits)
+
+
+def _read_integer(digits: str) -> str:
+    """整数を漢数字の読みに変換します。"""
+    if (len(digits) > 1 and digits.startswith("0")) or len(digits) > 4 * len(_LARGE_UNITS):
+        # 先頭が 0 の番号や大きすぎる数は1桁ずつ読む
+        return _read_digits(digits)
+    value = int(digits)
+    if value == 0:
+        return "零"
+    parts = []
+    for position in range(len(_LARGE_UNITS) - 1, -1, -1):
+        group = value // 10 ** (4 * position) % 10000
+        if group == 0:
+            continue
+        text = ""
+        for digit_char, unit in zip(f"{group:04d}", _SMALL_UNITS):
+            digit = int(digit_char)
+            if digit == 0:
+                continue
+            # 一千・一百・一十は「一」を付けずに読む
+            text += unit if digit == 1 and unit else _DIGITS[digit] + unit
+        parts.append(text + _LARGE_UNITS[position])
+    return "".join(parts)
+
+
+def read_number(number: str) -> str:
+    """"1,234.5" のような数字の並びを漢数字の読み ("千二百三十四点五") に変換します。"""
+    integer, _, fraction = number.replace(",", "").partition(".")
+    text = _read_integer(integer)
+    if fraction:
+        text += "点" + _read_digits(fraction)
+    return text
+
+
+class TextNormalizer:
+    """合成前にテキストを正規化するクラス
+
+    次の順に処理します。結果は LRU キャッシュに保持されるため、同じテキストの2回目以降は辞書参照のみで済みます。
+
+    1. Unicode NFKC 正規化 (全角英数字・半角カナなどの統一)
+    2. 記号の置き換え (symbols)
+    3. 連続する同じ句読点・記号の短縮 (collapse_punctuation)
+    4. 数字の読み (read_numbers)
+    5. 連続する空白を1つにまとめ、前後の空白を削除 (collapse_whitespace)
+
+    Parameters
+    ----------
+    nfkc : bool
+        Unicode NFKC 正規化を行うかどうか
+    symbols : dict[str, str], optional
+        置き換える記号と置き換え後の文字列。省略時は DEFAULT_SYMBOLS、空の辞書で無効になります。
+    collapse_punctuation : bool
+        "！！！" や "。。" のような連続する同じ記号を1つにまとめるかどうか
+    read_numbers : bool
+        数字を漢数字の読みに変換するかどうか
+    number_readings : dict[str, str], optional
+        数字の直後の記号・単位の読み (例: {"%": "パーセント"})。read_numbers が有効な場合に使用します。
+    collapse_whitespace : bool
+        連続する空白を1つにまとめるかどうか
+    cache_size : int
+        正規化結果を保持する最大件数
+    """
+
+    def __init__(
+        self,
+        nfkc: bool = True,
+        symbols: Optional[Dict[str, str]] = None,
+        collapse_punctuation: bool = True,
+        read_numbers: bool = False,
+        number_readings: Optional[Dict[str, str]] = None,
+        collapse_whitespace: bool = True,
+        cache_size: int = 4096,
+    ):
+        self.nfkc = nfkc
+        self.symbols = dict(DEFAULT_SYMBOLS if symbols is None else symbols)
+        self.collapse_punctuation = collapse_punctuation
+        self.read_numbers = read_numbers
+        self.number_readings = dict(DEFAULT_NUMBER_READINGS if number_readings is None else number_readings)
+        self.collapse_whitespace = collapse_whitespace
+
+        self._symbol_pattern = self._compile_alternation(self.symbols)
+        unit_pattern = self._compile_alternation(self.number_readings)
+        if unit_pattern is not None:
+            self._number_pattern = re.compile(f"({_NUMBER_PATTERN.pattern})({unit_pattern.pattern})?")
+        else:
+            self._number_pattern = re.compile(f"({_NUMBER_PATTERN.pattern})()")
+        self._cached = lru_cache(maxsize=cache_size)(self._normalize)
+
+    @staticmethod
+    def _compile_alternation(table: Dict[str, str]) -> Optional["re.Pattern"]:
+        if not table:
+            return None
+        # 長いものを優先して一致させる
+        keys = sorted(table, key=len, reverse=True)
+        return re.compile("|".join(re.escape(key) for key in keys))
+
+    def _read_number_match(self, match: "re.Match") -> str:
+        number, unit = match.group(1), match.group(2)
+        text = read_number(number)
+        if unit:
+            text += self.number_readings[unit]
+        return text
+
+    def _normalize(self, text: str) -> str:
+        if self.nfkc:
+            text = unicodedata.normalize("NFKC", text)
+        if self._symbol_pattern is not None:
+            symbols = self.symbols
+            text = self._symbol_pattern.sub(lambda m: symbols[m.group()], text)
+        if self.collapse_punctuation:
+            text = _REPEATED_PUNCTUATION_PATTERN.sub(r"\1", text)
+        if self.read_numbers:
+            text = self._number_pattern.sub(self._read_number_match, text)
+        if self.collapse_whitespace:
+            text = _WHITESPACE_PATTERN.sub(" ", text).strip()
+        return text
+
+    def __call__(self, text: str) -> str:
+        """テキストを正規化します。"""
+        return self._cached(text)
+
+    def cache_info(self):
+        """正規化結果のキャッシュの統計 (functools.lru_cache の cache_info())"""
+        return self._cached.cache_info()
+
+    def cache_clear(self) -> None:
+        """正規化結果のキャッシュを破棄します。"""
+        self._cached.cache_clear()
+
+
+_default_normalizer: Optional[TextNormalizer] = None
+
+
+def normalize_text(text: str) -> str:
+    """既定の設定の TextNormalizer でテキストを正規化します。"""
+    global _default_normalizer
+    if _default_normalizer is None:
+        _default_normalizer = TextNormalizer()
+    return _default_normalizer(text)
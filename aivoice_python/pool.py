@@ -0,0 +1,267 @@
+"""
+A.I.VOICE Editor Controller Pool
+
+This module provides a pool of connected controllers, one worker thread each,
+that dispatches synthesis jobs to the least-loaded host.
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from .aivoice_control import AIVoiceTTsControl, HostStatus
+from .cache import synthesis_key
+from .singleflight import SingleFlight
+
+
+def connect_controller(host_name: str, **kwargs) -> AIVoiceTTsControl:
+    """指定されたホストに接続済みの AIVoiceTTsControl を作成します。
+
+    ホストプログラムが起動していない場合は起動します。
+    """
+    control = AIVoiceTTsControl(**kwargs)
+    control.initialize(host_name)
+    if control.status == HostStatus.NotRunning:
+        control.start_host()
+    control.connect()
+    return control
+
+
+class _Worker:
+    """1つの AIVoiceTTsControl とそれを専有するワーカースレッド"""
+
+    def __init__(self, host_name: str, factory: Callable[[str], AIVoiceTTsControl]):
+        self.host_name = host_name
+        self.pending = 0
+        self.jobs = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self.status: Optional[HostStatus] = None
+        # ワーカースレッドで最後に確認したマスターコントロール (未確認の場合は None)
+        self.master_control: Optional[str] = None
+        # ワーカースレッドで確認したボイスプリセット名毎の各値 (JSON 文字列)
+        self.voice_presets: Dict[str, str] = {}
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"aivoice-{host_name}")
+        self.control_future = self.executor.submit(factory, host_name)
+        self.executor.submit(self.observe)
+
+    def observe(self) -> None:
+        """ワーカースレッド上でホストのマスターコントロールと、現在および確認済みのボイスプリセットを確認します。"""
+        try:
+            control = self.control_future.result()
+            self.master_control = control.master_control
+            names = set(self.voice_presets)
+            names.add(control.current_voice_preset_name)
+        except Exception:
+            self.master_control = None
+            self.voice_presets = {}
+            return
+        voice_presets = {}
+        for name in names:
+            try:
+                voice_presets[name] = json.dumps(control.get_voice_preset(name), ensure_ascii=False, sort_keys=True)
+            except Exception:
+                # 削除されたボイスプリセット
+                pass
+        self.voice_presets = voice_presets
+
+    def load(self) -> tuple:
+        """ディスパッチ先を選ぶための負荷 (小さいほど空いている)"""
+        unavailable = self.status in (HostStatus.NotRunning, HostStatus.NotConnected)
+        return (unavailable, self.pending + (self.status == HostStatus.Busy), self.jobs)
+
+
+class ControllerPool:
+    """複数の A.I.VOICE Editor ホストに接続した制御クラスのプール
+
+    ホスト毎に接続済みの AIVoiceTTsControl と専用のワーカースレッドを1つずつ用意し、
+    ジョブを待ち行列の短いホストへ振り分けます。
+    1つのホストプログラムのテキスト・ボイスプリセット・テキスト入力形式はすべての接続で共有されるため、
+    同じホストのジョブは常に1つのワーカースレッドで順に実行します。
+
+    Parameters
+    ----------
+    host_names : Iterable[str], optional
+        接続するホスト名。省略時は get_available_host_names() で取得したすべてのホストに接続します。
+    factory : Callable[[str], AIVoiceTTsControl], optional
+        ホスト名を受け取り、接続済みの AIVoiceTTsControl を返す関数。ワーカースレッド上で呼び出されます。
+        省略時は connect_controller() に kwargs を渡して作成します。
+    coalesce : bool
+        synthesize() で、実行中のジョブと同じテキスト・ボイスプリセット・マスターコントロールのジョブを合成せず、
+        その結果を共有するかどうか
+    **kwargs
+        AIVoiceTTsControl に渡す引数
+    """
+
+    def __init__(
+        self,
+        host_names: Optional[Iterable[str]] = None,
+        factory: Optional[Callable[[str], AIVoiceTTsControl]] = None,
+        coalesce: bool = True,
+        **kwargs,
+    ):
+        if host_names is None:
+            if factory is not None:
+                raise ValueError("factory を指定する場合は host_names も指定してください")
+            host_names = AIVoiceTTsControl(**kwargs).get_available_host_names()
+        host_names = list(host_names)
+        if not host_names:
+            raise RuntimeError("利用可能なホストが見つかりません")
+        if factory is None:
+            def factory(host_name: str) -> AIVoiceTTsControl:
+                return connect_controller(host_name, **kwargs)
+
+        self.coalesce = coalesce
+        self._flight = SingleFlight()
+        self._lock = threading.Lock()
+        self._workers: List[_Worker] = [_Worker(host_name, factory) for host_name in host_names]
+
+    def __len__(self) -> int:
+        return len(self._workers)
+
+    def _select_worker(self) -> _Worker:
+        with self._lock:
+            worker = min(self._workers, key=_Worker.load)
+            worker.pending += 1
+            return worker
+
+    def submit(self, func: Callable[..., Any], *args) -> "Future[Any]":
+        """最も空いているホストのワーカースレッドで func(control, *args) を実行します。"""
+        worker = self._select_worker()
+
+        def run():
+            started = time.perf_counter()
+            try:
+                return func(worker.control_future.result(), *args)
+            except Exception:
+                with self._lock:
+                    worker.errors += 1
+                raise
+            finally:
+                elapsed = time.perf_counter() - started
+                with self._lock:
+                    worker.pending -= 1
+                    worker.jobs += 1
+                    worker.busy_seconds += elapsed
+                    refresh_status = worker.pending == 0
+                if refresh_status:
+                    # 待ち行列が空になった時点でホストの状態を確認しておく
+                    try:
+                        worker.status = worker.control_future.result().status
+                    except Exception:
+                        worker.status = HostStatus.NotConnected
+                # ジョブがマスターコントロールを変更した場合に備えて確認し直す
+                worker.observe()
+
+        try:
+            return worker.executor.submit(run)
+        except BaseException:
+            with self._lock:
+                worker.pending -= 1
+            raise
+
+    def synthesize(self, text: str, path: str, voice_preset_name: Optional[str] = None) -> "Future[str]":
+        """テキストを読み上げた音声をファイルに保存するジョブを投入します。
+
+        Parameters
+        ----------
+        voice_preset_name : str, optional
+            使用するボイスプリセット名。省略時は各ホストの現在のボイスプリセットが使用されます。
+
+        coalesce が有効な場合、同じテキスト・ボイスプリセット・マスターコントロールのジョブが実行中であれば
+        新たに合成せず、その音声を path に書き出します。
+        ジョブの振り分け前に判定するため、結果を共有するのは voice_preset_name が指定され、
+        すべてのホストで確認済みのボイスプリセットの各値とマスターコントロールが一致している場合のみです。
+        どちらの場合も、path の拡張子が .wav でなければホストプログラムと同様に .wav を付加します。
+        """
+
+        def select_preset(control: AIVoiceTTsControl) -> None:
+            if voice_preset_name is not None:
+                control.current_voice_preset_name = voice_preset_name
+
+        key = self._coalescing_key(text, voice_preset_name) if self.coalesce else None
+        if key is None:
+            def run(control: AIVoiceTTsControl) -> str:
+                select_preset(control)
+                return control.synthesize(text, path)
+
+            return self.submit(run)
+
+        def render(control: AIVoiceTTsControl) -> bytearray:
+            select_preset(control)
+            return control.synthesize_to_bytes(text).data
+
+        shared = self._flight.submit(key, lambda: self.submit(render))
+        result: "Future[str]" = Future()
+
+        # 合成結果を共有しない場合と同じく、ホストプログラムと同様に拡張子を付加する
+        output = path if os.path.splitext(path)[1].lower() == ".wav" else path + ".wav"
+
+        def deliver(future: "Future[bytearray]") -> None:
+            try:
+                data = future.result()
+                with open(output, "wb") as f:
+                    f.write(data)
+            except BaseException as e:
+                result.set_exception(e)
+            else:
+                result.set_result(output)
+
+        shared.add_done_callback(deliver)
+        return result
+
+    def _coalescing_key(self, text: str, voice_preset_name: Optional[str]) -> Optional[str]:
+        """synthesize() の結果を共有するためのキー。どのホストで実行しても同じ音声になると判定できない場合は None"""
+        if voice_preset_name is None:
+            # 各ホストの現在のボイスプリセットは振り分け前には分からない
+            return None
+        master_controls = {worker.master_control for worker in self._workers}
+        if len(master_controls) != 1 or None in master_controls:
+            return None
+        # 同じ名前でもホストによって内容が異なり得るため、各値を確認済みで一致する場合のみ共有する
+        voice_presets = {worker.voice_presets.get(voice_preset_name) for worker in self._workers}
+        if len(voice_presets) != 1 or None in voice_presets:
+            return None
+        return synthesis_key(text, voice_presets.pop(), master_controls.pop())
+
+    def coalescing_stats(self) -> Dict[str, int]:
+        """synthesize() の実行回数・結果を共有した回数・実行中のジョブ数を取得します。"""
+        return self._flight.stats()
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """ホスト毎の統計情報を取得します。"""
+        with self._lock:
+            return [
+                {
+                    "host_name": worker.host_name,
+                    "jobs": worker.jobs,
+                    "errors": worker.errors,
+                    "pending": worker.pending,
+                    "busy_seconds": worker.busy_seconds,
+                    "mean_seconds": worker.busy_seconds / worker.jobs if worker.jobs else 0.0,
+                    "status": worker.status.name if worker.status is not None else None,
+                }
+                for worker in self._workers
+            ]
+
+    def close(self, disconnect: bool = True) -> None:
+        """各ホストとの接続を解除し、ワーカースレッドを終了します。"""
+        for worker in self._workers:
+            if disconnect:
+                def run(worker=worker):
+                    try:
+                        worker.control_future.result().disconnect()
+                    except Exception:
+                        pass
+                worker.executor.submit(run)
+            worker.executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
@@ -0,0 +1,320 @@
+"""
+A.I.VOICE Synthesis Daemon
+
+This module runs a long-lived process that owns a connected AIVoiceTTsControl
+and serves JSON requests over a local TCP or Unix domain socket.
+
+Usage::
+
+    python -m aivoice_python.server --port 50080
+    python -m aivoice_python.server --unix /tmp/aivoice.sock
+
+Each request is one JSON object per line, for example
+``{"op": "save", "text": "こんにちは", "voice_preset_name": "琴葉 茜"}``,
+and each response is one JSON line ``{"ok": true, "result": ...}`` or
+``{"ok": false, "error": "..."}``.
+"""
+
+import argparse
+import base64
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+import socketserver
+import sys
+import tempfile
+import uuid
+from typing import Any, Callable, Dict, Optional
+
+from .aivoice_control import AIVoiceTTsControl, HostStatus, TextEditMode
+from .cache import synthesis_key
+from .singleflight import SingleFlight
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 50080
+
+
+class SynthesisService:
+    """接続済みの AIVoiceTTsControl を専用スレッドで保持し、リクエストを処理するサービス
+
+    Parameters
+    ----------
+    factory : Callable[[], AIVoiceTTsControl]
+        接続済みの AIVoiceTTsControl を返す関数。専用スレッド上で呼び出されます。
+    output_dir : str, optional
+        音声ファイルを書き出すディレクトリ。リクエストの path はこのディレクトリからの相対パスとして扱い、
+        絶対パスや ".." でディレクトリの外を指すものは受け付けません。
+    coalesce : bool
+        同時に受け付けた同じテキスト・ボイスプリセット・マスターコントロールの save リクエストで、
+        1回の合成結果を共有するかどうか。voice_preset_name を指定したリクエストのみが対象で、
+        ボイスプリセットは名前ではなく確認済みの各値で比較します。
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], AIVoiceTTsControl],
+        output_dir: Optional[str] = None,
+        coalesce: bool = True,
+    ):
+        self.output_dir = output_dir or tempfile.mkdtemp(prefix="aivoice-")
+        os.makedirs(self.output_dir, exist_ok=True)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="aivoice-server")
+        self._control_future = self._executor.submit(factory)
+        self._control_future.result()
+        # 専用スレッドで最後に確認したマスターコントロール
+        self._master_control: Optional[str] = None
+        # 専用スレッドで確認したボイスプリセット名毎の各値 (JSON 文字列)
+        self._voice_presets: Dict[str, str] = {}
+        self._executor.submit(self._observe).result()
+        self._handlers: Dict[str, Callable[[AIVoiceTTsControl, dict], Any]] = {
+            "ping": lambda control, request: "pong",
+            "status": lambda control, request: control.status.name,
+            "version": lambda control, request: control.version,
+            "voice_names": lambda control, request: control.voice_names,
+            "voice_preset_names": lambda control, request: control.voice_preset_names,
+            "get_voice_preset": lambda control, request: control.get_voice_preset(request["preset_name"]),
+            "play_time": self._play_time,
+            "speak": self._speak,
+            "save": self._save,
+            "stats": lambda control, request: self._flight.stats(),
+        }
+        # 専用スレッドを待つ側で実行するハンドラー
+        self._shared_handlers: Dict[str, Callable[[dict], Any]] = {}
+        self._flight = SingleFlight()
+        if coalesce:
+            self._shared_handlers["save"] = self._save_shared
+
+    def _observe(self) -> None:
+        """専用スレッド上でホストのマスターコントロールと、現在および確認済みのボイスプリセットを確認します。"""
+        try:
+            control = self._control_future.result()
+            self._master_control = control.master_control
+            names = set(self._voice_presets)
+            names.add(control.current_voice_preset_name)
+        except Exception:
+            self._master_control = None
+            self._voice_presets = {}
+            return
+        voice_presets = {}
+        for name in names:
+            try:
+                voice_presets[name] = json.dumps(control.get_voice_preset(name), ensure_ascii=False, sort_keys=True)
+            except Exception:
+                # 削除されたボイスプリセット
+                pass
+        self._voice_presets = voice_presets
+
+    def _run(self, handler: Callable[[AIVoiceTTsControl, dict], Any], request: dict) -> Any:
+        """専用スレッドでハンドラーを実行します。"""
+
+        def run() -> Any:
+            try:
+                return handler(self._control_future.result(), request)
+            finally:
+                self._observe()
+
+        return self._executor.submit(run).result()
+
+    @staticmethod
+    def _select_preset(control: AIVoiceTTsControl, request: dict) -> None:
+        voice_preset_name = request.get("voice_preset_name")
+        if voice_preset_name is not None:
+            control.current_voice_preset_name = voice_preset_name
+
+    def _output_path(self, request: dict) -> str:
+        """リクエストの path を output_dir 以下の保存先に解決します。"""
+        path = request.get("path")
+        if path is None:
+            return os.path.join(self.output_dir, uuid.uuid4().hex + ".wav")
+        if not isinstance(path, str) or not path or os.path.isabs(path) or os.path.splitdrive(path)[0]:
+            raise ValueError(f"path には output_dir からの相対パスを指定してください: {path!r}")
+        if ".." in path.replace("\\", "/").split("/"):
+            raise ValueError(f"path に .. は使用できません: {path!r}")
+        root = os.path.realpath(self.output_dir)
+        resolved = os.path.realpath(os.path.join(root, path))
+        if os.path.commonpath([root, resolved]) != root:
+            raise ValueError(f"path が output_dir の外を指しています: {path!r}")
+        return resolved
+
+    def _play_time(self, control: AIVoiceTTsControl, request: dict) -> int:
+        self._select_preset(control, request)
+        return control.play_time(request["text"])
+
+    def _speak(self, control: AIVoiceTTsControl, request: dict) -> bool:
+        self._select_preset(control, request)
+        control.text_edit_mode = TextEditMode.Text
+        control.text = request["text"]
+        return control.play_and_wait(timeout=request.get("timeout"))
+
+    def _save(self, control: AIVoiceTTsControl, request: dict) -> Any:
+        self._select_preset(control, request)
+        path = self._output_path(request)
+        return_audio = request.get("return_audio", False)
+        path = control.synthesize(request["text"], path)
+        if not return_audio:
+            return path
+        try:
+            with open(path, "rb") as f:
+                return base64.b64encode(f.read()).decode("ascii")
+        finally:
+            if request.get("path") is None:
+                os.remove(path)
+
+    def _save_shared(self, request: dict) -> Any:
+        """実行中の同じリクエストがあれば、その合成結果を共有して save を処理します。"""
+        voice_preset_name = request.get("voice_preset_name")
+        master_control = self._master_control
+        voice_preset = self._voice_presets.get(voice_preset_name) if voice_preset_name is not None else None
+        if voice_preset is None or master_control is None:
+            # 現在のボイスプリセットは他のリクエストで変わり得るため、共有しない。
+            # 各値を確認していないボイスプリセットも、合成後に確認するまでは共有しない
+            return self._run(self._save, request)
+        # 不正な保存先は合成する前に拒否する
+        path = self._output_path(request)
+        # 合成結果を共有しない場合と同じく、ホストプログラムと同様に拡張子を付加する
+        if os.path.splitext(path)[1].lower() != ".wav":
+            path += ".wav"
+
+        def render(control: AIVoiceTTsControl, request: dict) -> bytearray:
+            self._select_preset(control, request)
+            return control.synthesize_to_bytes(request["text"]).data
+
+        key = synthesis_key(request["text"], voice_preset, master_control)
+        data = self._flight.do(key, lambda: self._run(render, request))
+        if request.get("return_audio", False):
+            return base64.b64encode(data).decode("ascii")
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def handle(self, request: dict) -> dict:
+        """1件のリクエストを処理し、レスポンスを返します。"""
+        try:
+            op = request["op"]
+            shared_handler = self._shared_handlers.get(op)
+            handler = self._handlers[op]
+        except (KeyError, TypeError):
+            return {"ok": False, "error": f"不明なリクエストです: {request!r}"}
+        try:
+            if shared_handler is not None:
+                result = shared_handler(request)
+            else:
+                result = self._run(handler, request)
+        except Exception as e:
+            return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        return {"ok": True, "result": result}
+
+    def close(self, disconnect: bool = True) -> None:
+        """ホストプログラムとの接続を解除し、専用スレッドを終了します。"""
+        if disconnect:
+            try:
+                self._executor.submit(lambda: self._control_future.result().disconnect()).result()
+            except Exception:
+                pass
+        self._executor.shutdown(wait=True)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """1行1リクエストの JSON を処理するハンドラー"""
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                response = {"ok": False, "error": f"JSON の形式が不正です: {e}"}
+            else:
+                response = self.server.service.handle(request)
+            self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class TCPServer(socketserver.ThreadingTCPServer):
+    """TCP で待ち受けるデーモン"""
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, address, service: SynthesisService):
+        self.service = service
+        super().__init__(address, _RequestHandler)
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+
+    class UnixServer(socketserver.ThreadingUnixStreamServer):
+        """Unix ドメインソケットで待ち受けるデーモン"""
+
+        daemon_threads = True
+
+        def __init__(self, path: str, service: SynthesisService):
+            self.service = service
+            super().__init__(path, _RequestHandler)
+
+
+def connect_default(host_name: Optional[str] = None, **kwargs) -> AIVoiceTTsControl:
+    """ホストプログラムに接続済みの AIVoiceTTsControl を作成します。"""
+    control = AIVoiceTTsControl(**kwargs)
+    if host_name is None:
+        host_names = control.get_available_host_names()
+        if not host_names:
+            raise RuntimeError("利用可能なホストが見つかりません")
+        host_name = host_names[0]
+    control.initialize(host_name)
+    if control.status == HostStatus.NotRunning:
+        control.start_host()
+    control.connect()
+    return control
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m aivoice_python.server",
+        description="A.I.VOICE Editor に接続したまま JSON リクエストを処理するデーモン",
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST, help="待ち受けるアドレス")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="待ち受けるポート番号")
+    parser.add_argument("--unix", metavar="PATH", help="TCP の代わりに Unix ドメインソケットで待ち受ける")
+    parser.add_argument("--editor-dir", help="A.I.VOICE Editor のインストールディレクトリ")
+    parser.add_argument("--host-name", help="接続するホスト名")
+    parser.add_argument("--output-dir", help="保存先が指定されていない音声ファイルの書き出し先")
+    parser.add_argument("--no-coalesce", action="store_true", help="同じ内容の save リクエストを合成結果の共有なしで処理する")
+    parser.add_argument("--simulate", action="store_true", help="A.I.VOICE Editor の代わりにシミュレーターを使用する")
+    args = parser.parse_args(argv)
+
+    kwargs = {"editor_dir": args.editor_dir}
+    if args.simulate:
+        from .simulator import SimulatedTtsControl
+
+        kwargs["backend"] = SimulatedTtsControl()
+
+    service = SynthesisService(
+        lambda: connect_default(args.host_name, **kwargs), args.output_dir, coalesce=not args.no_coalesce
+    )
+    server: socketserver.BaseServer
+    if args.unix:
+        if not hasattr(socketserver, "ThreadingUnixStreamServer"):
+            parser.error("この環境では Unix ドメインソケットを使用できません")
+        server = UnixServer(args.unix, service)
+        address = args.unix
+    else:
+        server = TCPServer((args.host, args.port), service)
+        address = "%s:%d" % server.socket.getsockname()[:2]
+
+    print(f"A.I.VOICE synthesis server listening on {address}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        if args.unix and os.path.exists(args.unix):
+            os.remove(args.unix)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
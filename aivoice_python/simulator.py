@@ -0,0 +1,571 @@
+"""
+A.I.VOICE Editor API Simulator
+
+This module provides a pure-Python stand-in for ``AI.Talk.Editor.Api.TtsControl``
+so that AIVoiceTTsControl can be exercised without Windows or A.I.VOICE Editor.
+"""
+
+from array import array
+import json
+import math
+import os
+import re
+import threading
+import time
+import wave
+
+from typing import Dict, Iterable, List, Optional
+
+
+DEFAULT_HOST_NAME = "A.I.VOICE Editor"
+
+DEFAULT_MASTER_CONTROL = {
+    "Volume": 1.0,
+    "Speed": 1.0,
+    "Pitch": 1.0,
+    "PitchRange": 1.0,
+    "MiddlePause": 150,
+    "LongPause": 370,
+    "SentencePause": 800,
+}
+
+DEFAULT_PRESETS = [
+    {"PresetName": "琴葉 茜", "VoiceName": "akane_west_emo_48"},
+    {"PresetName": "琴葉 葵", "VoiceName": "aoi_emo_48"},
+]
+
+# ポーズとして扱う記号
+_MIDDLE_PAUSE_PATTERN = re.compile(r"[、，,]")
+_LONG_PAUSE_PATTERN = re.compile(r"[。．！？!?]|\.(?=\s|$)")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# HostStatus と同じ値
+_STATUS_NOT_RUNNING = 0
+_STATUS_NOT_CONNECTED = 1
+_STATUS_IDLE = 2
+_STATUS_BUSY = 3
+
+
+def _default_preset(preset_name: str, voice_name: str) -> dict:
+    """既定値で埋めたボイスプリセットを作成します。"""
+    return {
+        "PresetName": preset_name,
+        "VoiceName": voice_name,
+        "MergedVoiceContainer": {"BasePitchVoiceName": voice_name, "MergedVoices": []},
+        "Volume": 1.0,
+        "Speed": 1.0,
+        "Pitch": 1.0,
+        "PitchRange": 1.0,
+        "MiddlePause": 150,
+        "LongPause": 370,
+        "Styles": [
+            {"Name": "J", "Value": 0.0},
+            {"Name": "A", "Value": 0.0},
+            {"Name": "S", "Value": 0.0},
+        ],
+    }
+
+
+class SimulatedTtsControl:
+    """``TtsControl`` 互換のシミュレーター
+
+    ``AIVoiceTTsControl(backend=SimulatedTtsControl())`` のように渡すことで、
+    A.I.VOICE Editor が無い環境でもラッパーを動作させられます。
+    API 呼び出し毎の遅延と合成コストを設定できるため、負荷試験や性能の回帰確認に利用できます。
+
+    Parameters
+    ----------
+    call_latency : float
+        API 呼び出し (プロパティアクセスを含む) 1回あたりの遅延 (秒)
+    synthesis_cost : float
+        音声合成時の1文字あたりのコスト (秒)。GetPlayTime と SaveAudioToFile に適用されます。
+    playback_scale : float
+        Play() 実行後に Busy 状態が続く時間の倍率。0 の場合は即座に Idle に戻ります。
+    ms_per_char : float
+        話速 1.0 における1文字あたりの再生時間 (ミリ秒)
+    sample_rate : int
+        SaveAudioToFile で書き出す WAV のサンプリングレート
+    host_running : bool
+        ホストプログラムが起動済みの状態で開始するかどうか
+    host_names : list[str], optional
+        GetAvailableHostNames が返すホスト名
+    voice_names : list[str], optional
+        利用可能なボイス名。省略時は presets のボイス名が使用されます。
+    presets : list[VoicePreset], optional
+        初期状態で登録されているボイスプリセット
+    idle_timeout : float
+        API を介した操作が無い場合に接続が解除されるまでの時間 (秒)
+    """
+
+    def __init__(
+        self,
+        call_latency: float = 0.0,
+        synthesis_cost: float = 0.0,
+        playback_scale: float = 1.0,
+        ms_per_char: float = 120.0,
+        sample_rate: int = 44100,
+        host_running: bool = True,
+        host_names: Optional[Iterable[str]] = None,
+        voice_names: Optional[Iterable[str]] = None,
+        presets: Optional[Iterable[dict]] = None,
+        idle_timeout: float = 600.0,
+        version: str = "1.4.0.0",
+    ):
+        self.call_latency = call_latency
+        self.synthesis_cost = synthesis_cost
+        self.playback_scale = playback_scale
+        self.ms_per_char = ms_per_char
+        self.sample_rate = sample_rate
+        self.idle_timeout = idle_timeout
+        self.call_counts: Dict[str, int] = {}
+
+        self._lock = threading.RLock()
+        self._version = version
+        self._host_names = list(host_names) if host_names is not None else [DEFAULT_HOST_NAME]
+        self._host_running = host_running
+        self._initialized = False
+        self._connected = False
+        self._last_call = time.monotonic()
+        self._busy_until = 0.0
+
+        presets = list(presets) if presets is not None else DEFAULT_PRESETS
+        self._presets: Dict[str, dict] = {}
+        for preset in presets:
+            merged = _default_preset(preset["PresetName"], preset["VoiceName"])
+            merged.update(preset)
+            self._presets[preset["PresetName"]] = merged
+        if voice_names is not None:
+            self._voice_names = list(voice_names)
+        else:
+            self._voice_names = []
+            for preset in self._presets.values():
+                if preset["VoiceName"] not in self._voice_names:
+                    self._voice_names.append(preset["VoiceName"])
+
+        self._current_preset = next(iter(self._presets), "")
+        self._master_control = dict(DEFAULT_MASTER_CONTROL)
+        self._text = ""
+        self._text_edit_mode = 0
+        self._text_selection_start = 0
+        self._text_selection_length = 0
+        self._list_rows: List[List[str]] = []
+        self._list_selection: List[int] = []
+
+    # ------------------------------------------------------------------
+    # 内部処理
+    # ------------------------------------------------------------------
+
+    def _enter(self, name: str, require_connection: bool = True) -> None:
+        """API 呼び出しの共通処理 (遅延・呼び出し回数・接続状態の確認)"""
+        self.call_counts[name] = self.call_counts.get(name, 0) + 1
+        if self.call_latency > 0:
+            time.sleep(self.call_latency)
+        now = time.monotonic()
+        if self._connected and now - self._last_call > self.idle_timeout:
+            self._connected = False
+        if require_connection:
+            if not self._initialized:
+                raise RuntimeError("API が初期化されていません")
+            if not self._connected:
+                raise RuntimeError("ホストプログラムに接続されていません")
+        self._last_call = now
+
+    def _synthesize_cost(self, text: str) -> None:
+        if self.synthesis_cost > 0:
+            time.sleep(self.synthesis_cost * len(text))
+
+    def _is_busy(self) -> bool:
+        return time.monotonic() < self._busy_until
+
+    def _ensure_not_busy(self) -> None:
+        if self._is_busy():
+            raise RuntimeError("ホストプログラムが処理中です")
+
+    def _target_preset(self, preset_name: str) -> dict:
+        preset = self._presets.get(preset_name)
+        if preset is None:
+            raise RuntimeError(f"ボイスプリセットが見つかりません: {preset_name}")
+        return preset
+
+    def _segments(self) -> List[tuple]:
+        """現在のテキスト入力形式で合成対象となる (プリセット名, テキスト) の一覧"""
+        if self._text_edit_mode == 0:
+            return [(self._current_preset, self._text)]
+        indices = self._list_selection or list(range(len(self._list_rows)))
+        return [tuple(self._list_rows[i]) for i in indices]
+
+    def _segment_play_time(self, preset_name: str, text: str) -> int:
+        preset = self._target_preset(preset_name)
+        master = self._master_control
+        speed = preset.get("Speed", 1.0) * master.get("Speed", 1.0) or 1.0
+        body = _MIDDLE_PAUSE_PATTERN.sub("", _LONG_PAUSE_PATTERN.sub("", text))
+        chars = len(_WHITESPACE_PATTERN.sub("", body))
+        middle = len(_MIDDLE_PAUSE_PATTERN.findall(text))
+        long = len(_LONG_PAUSE_PATTERN.findall(text))
+        pause_ms = (
+            middle * preset.get("MiddlePause", 150) * master.get("MiddlePause", 150) / 150
+            + long * preset.get("LongPause", 370) * master.get("LongPause", 370) / 370
+        )
+        return int(round(chars * self.ms_per_char / speed + pause_ms))
+
+    def _play_time(self) -> int:
+        segments = self._segments()
+        total = sum(self._segment_play_time(p, t) for p, t in segments)
+        if len(segments) > 1:
+            total += (len(segments) - 1) * int(self._master_control.get("SentencePause", 800))
+        return total
+
+    def _render(self, path: str, duration_ms: int, pitch: float) -> None:
+        """指定された長さの WAV ファイルを書き出します。"""
+        frames = int(self.sample_rate * duration_ms / 1000)
+        frequency = 220.0 * pitch
+        period = max(int(self.sample_rate / frequency), 1)
+        cycle = array(
+            "h",
+            (int(3000 * math.sin(2 * math.pi * i / period)) for i in range(period)),
+        )
+        samples = cycle * (frames // period + 1)
+        del samples[frames:]
+        with wave.open(path, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(self.sample_rate)
+            wav.writeframes(samples.tobytes())
+
+    # ------------------------------------------------------------------
+    # プロパティ
+    # ------------------------------------------------------------------
+
+    @property
+    def CurrentVoicePresetName(self) -> str:
+        with self._lock:
+            self._enter("CurrentVoicePresetName")
+            return self._current_preset
+
+    @CurrentVoicePresetName.setter
+    def CurrentVoicePresetName(self, value: str) -> None:
+        with self._lock:
+            self._enter("CurrentVoicePresetName")
+            self._target_preset(value)
+            self._current_preset = value
+
+    @property
+    def MasterControl(self) -> str:
+        with self._lock:
+            self._enter("MasterControl")
+            return json.dumps(self._master_control, ensure_ascii=False)
+
+    @MasterControl.setter
+    def MasterControl(self, value: str) -> None:
+        with self._lock:
+            self._enter("MasterControl")
+            values = json.loads(value)
+            unknown = set(values) - set(DEFAULT_MASTER_CONTROL)
+            if unknown:
+                raise RuntimeError(f"不明なマスターコントロールの項目です: {sorted(unknown)}")
+            self._master_control.update(values)
+
+    @property
+    def IsInitialized(self) -> bool:
+        with self._lock:
+            self._enter("IsInitialized", require_connection=False)
+            return self._initialized
+
+    @property
+    def Text(self) -> str:
+        with self._lock:
+            self._enter("Text")
+            return self._text
+
+    @Text.setter
+    def Text(self, value: str) -> None:
+        with self._lock:
+            self._enter("Text")
+            self._ensure_not_busy()
+            self._text = value
+            self._text_selection_start = 0
+            self._text_selection_length = 0
+
+    @property
+    def TextEditMode(self) -> int:
+        with self._lock:
+            self._enter("TextEditMode")
+            return self._text_edit_mode
+
+    @TextEditMode.setter
+    def TextEditMode(self, value: int) -> None:
+        with self._lock:
+            self._enter("TextEditMode")
+            if value not in (0, 1):
+                raise RuntimeError(f"不正なテキスト入力形式です: {value}")
+            self._text_edit_mode = value
+
+    @property
+    def TextSelectionLength(self) -> int:
+        with self._lock:
+            self._enter("TextSelectionLength")
+            return self._text_selection_length
+
+    @TextSelectionLength.setter
+    def TextSelectionLength(self, value: int) -> None:
+        with self._lock:
+            self._enter("TextSelectionLength")
+            self._text_selection_length = value
+
+    @property
+    def TextSelectionStart(self) -> int:
+        with self._lock:
+            self._enter("TextSelectionStart")
+            return self._text_selection_start
+
+    @TextSelectionStart.setter
+    def TextSelectionStart(self, value: int) -> None:
+        with self._lock:
+            self._enter("TextSelectionStart")
+            self._text_selection_start = value
+
+    @property
+    def Version(self) -> str:
+        with self._lock:
+            self._enter("Version")
+            return self._version
+
+    @property
+    def Status(self) -> int:
+        with self._lock:
+            self._enter("Status", require_connection=False)
+            if not self._host_running:
+                return _STATUS_NOT_RUNNING
+            if not self._connected:
+                return _STATUS_NOT_CONNECTED
+            return _STATUS_BUSY if self._is_busy() else _STATUS_IDLE
+
+    @property
+    def VoiceNames(self) -> List[str]:
+        with self._lock:
+            self._enter("VoiceNames")
+            return list(self._voice_names)
+
+    @property
+    def VoicePresetNames(self) -> List[str]:
+        with self._lock:
+            self._enter("VoicePresetNames")
+            return list(self._presets)
+
+    # ------------------------------------------------------------------
+    # メソッド
+    # ------------------------------------------------------------------
+
+    def AddListItem(self, voice_preset_name: str, text: str) -> None:
+        with self._lock:
+            self._enter("AddListItem")
+            self._target_preset(voice_preset_name)
+            self._list_rows.append([voice_preset_name, text])
+
+    def AddVoicePreset(self, voice_preset_json: str) -> None:
+        with self._lock:
+            self._enter("AddVoicePreset")
+            values = json.loads(voice_preset_json)
+            name = values["PresetName"]
+            if name in self._presets:
+                raise RuntimeError(f"ボイスプリセットは既に存在します: {name}")
+            if values["VoiceName"] not in self._voice_names:
+                raise RuntimeError(f"ボイスが見つかりません: {values['VoiceName']}")
+            preset = _default_preset(name, values["VoiceName"])
+            preset.update(values)
+            self._presets[name] = preset
+
+    def ClearListItems(self) -> None:
+        with self._lock:
+            self._enter("ClearListItems")
+            self._list_rows.clear()
+            self._list_selection.clear()
+
+    def Connect(self) -> None:
+        with self._lock:
+            self._enter("Connect", require_connection=False)
+            if not self._initialized:
+                raise RuntimeError("API が初期化されていません")
+            if not self._host_running:
+                raise RuntimeError("ホストプログラムが起動していません")
+            self._connected = True
+
+    def Disconnect(self) -> None:
+        with self._lock:
+            self._enter("Disconnect", require_connection=False)
+            self._connected = False
+
+    def GetAvailableHostNames(self) -> List[str]:
+        with self._lock:
+            self._enter("GetAvailableHostNames", require_connection=False)
+            return list(self._host_names)
+
+    def GetListCount(self) -> int:
+        with self._lock:
+            self._enter("GetListCount")
+            return len(self._list_rows)
+
+    def GetListSelectionCount(self) -> int:
+        with self._lock:
+            self._enter("GetListSelectionCount")
+            return len(self._list_selection)
+
+    def GetListSelectionIndices(self) -> List[int]:
+        with self._lock:
+            self._enter("GetListSelectionIndices")
+            return list(self._list_selection)
+
+    def GetListSentence(self, index: int) -> str:
+        with self._lock:
+            self._enter("GetListSentence")
+            return self._list_rows[index][1]
+
+    def GetListVoicePreset(self) -> str:
+        with self._lock:
+            self._enter("GetListVoicePreset")
+            if not self._list_selection:
+                raise RuntimeError("行が選択されていません")
+            return self._list_rows[self._list_selection[0]][0]
+
+    def GetPlayTime(self) -> int:
+        with self._lock:
+            self._enter("GetPlayTime")
+            self._ensure_not_busy()
+            segments = self._segments()
+            self._synthesize_cost("".join(t for _, t in segments))
+            return self._play_time()
+
+    def GetVoicePreset(self, preset_name: str) -> str:
+        with self._lock:
+            self._enter("GetVoicePreset")
+            return json.dumps(self._target_preset(preset_name), ensure_ascii=False)
+
+    def Initialize(self, service_name: str) -> None:
+        with self._lock:
+            self._enter("Initialize", require_connection=False)
+            if service_name not in self._host_names:
+                raise RuntimeError(f"ホストが見つかりません: {service_name}")
+            self._initialized = True
+
+    def InsertListItem(self, voice_preset_name: str, text: str) -> None:
+        with self._lock:
+            self._enter("InsertListItem")
+            self._target_preset(voice_preset_name)
+            index = self._list_selection[0] if self._list_selection else len(self._list_rows)
+            self._list_rows.insert(index, [voice_preset_name, text])
+
+    def Play(self) -> None:
+        with self._lock:
+            self._enter("Play")
+            if self._is_busy():
+                # 再生中の場合は一時停止
+                self._busy_until = 0.0
+                return
+            segments = self._segments()
+            self._synthesize_cost("".join(t for _, t in segments))
+            duration = self._play_time() / 1000 * self.playback_scale
+            self._busy_until = time.monotonic() + duration
+
+    def ReloadPhraseDictionary(self) -> None:
+        with self._lock:
+            self._enter("ReloadPhraseDictionary")
+            self._ensure_not_busy()
+
+    def ReloadSymbolDictionary(self) -> None:
+        with self._lock:
+            self._enter("ReloadSymbolDictionary")
+            self._ensure_not_busy()
+
+    def ReloadVoicePreset(self) -> None:
+        with self._lock:
+            self._enter("ReloadVoicePreset")
+            self._ensure_not_busy()
+
+    def ReloadWordDictionary(self) -> None:
+        with self._lock:
+            self._enter("ReloadWordDictionary")
+            self._ensure_not_busy()
+
+    def RemoveListItem(self, index: Optional[int] = None) -> None:
+        with self._lock:
+            self._enter("RemoveListItem")
+            if index is not None:
+                indices = [index]
+            else:
+                indices = list(self._list_selection)
+            for i in sorted(indices, reverse=True):
+                del self._list_rows[i]
+            self._list_selection = [i for i in self._list_selection if i < len(self._list_rows)]
+
+    def SaveAudioToFile(self, path: str) -> None:
+        with self._lock:
+            self._enter("SaveAudioToFile")
+            self._ensure_not_busy()
+            segments = self._segments()
+            text = "".join(t for _, t in segments)
+            if not text.strip():
+                raise RuntimeError("テキストが空です")
+            self._synthesize_cost(text)
+            if os.path.splitext(path)[1].lower() != ".wav":
+                # ファイル形式に応じた拡張子を付加する
+                path += ".wav"
+            pitch = self._target_preset(segments[0][0]).get("Pitch", 1.0)
+            self._render(path, self._play_time(), pitch)
+
+    def SetListSelectionIndices(self, indices) -> None:
+        with self._lock:
+            self._enter("SetListSelectionIndices")
+            if isinstance(indices, int):
+                indices = [indices]
+            indices = sorted(set(indices))
+            for index in indices:
+                if not 0 <= index < len(self._list_rows):
+                    raise RuntimeError(f"不正な行インデックスです: {index}")
+            self._list_selection = indices
+
+    def SetListSelectionRange(self, start_index: int, length: int) -> None:
+        with self._lock:
+            self._enter("SetListSelectionRange")
+            if start_index < 0 or length < 0 or start_index + length > len(self._list_rows):
+                raise RuntimeError(f"不正な選択範囲です: {start_index}, {length}")
+            self._list_selection = list(range(start_index, start_index + length))
+
+    def SetListSentence(self, sentence: str, synthesize: bool) -> None:
+        with self._lock:
+            self._enter("SetListSentence")
+            if synthesize:
+                self._synthesize_cost(sentence * len(self._list_selection))
+            for index in self._list_selection:
+                self._list_rows[index][1] = sentence
+
+    def SetListVoicePreset(self, voice_preset_name: str) -> None:
+        with self._lock:
+            self._enter("SetListVoicePreset")
+            self._target_preset(voice_preset_name)
+            for index in self._list_selection:
+                self._list_rows[index][0] = voice_preset_name
+
+    def SetVoicePreset(self, voice_preset_json: str) -> None:
+        with self._lock:
+            self._enter("SetVoicePreset")
+            values = json.loads(voice_preset_json)
+            self._target_preset(values["PresetName"]).update(values)
+
+    def StartHost(self) -> None:
+        with self._lock:
+            self._enter("StartHost", require_connection=False)
+            if not self._initialized:
+                raise RuntimeError("API が初期化されていません")
+            self._host_running = True
+
+    def Stop(self) -> None:
+        with self._lock:
+            self._enter("Stop")
+            self._busy_until = 0.0
+
+    def TerminateHost(self) -> None:
+        with self._lock:
+            self._enter("TerminateHost", require_connection=False)
+            self._host_running = False
+            self._connected = False
+            self._busy_until = 0.0
@@ -0,0 +1,98 @@
+"""
+A.I.VOICE Request Coalescing
+
+This module lets concurrent identical synthesis requests share one in-flight
+render instead of queueing the same work on the host several times.
+"""
+
+from concurrent.futures import Future
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class _Call:
+    __slots__ = ("future", "waiters")
+
+    def __init__(self, future: "Future[Any]"):
+        self.future = future
+        self.waiters = 1
+
+
+class SingleFlight:
+    """同じキーの処理が実行中であれば、新たに実行せずその結果を共有するクラス
+
+    結果 (例外を含む) は実行中に同じキーで呼び出したすべての呼び出し元に返されます。
+    処理が完了した後の呼び出しは新たに実行されるため、結果をキャッシュするものではありません。
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    def _join(self, key: Hashable) -> Optional[_Call]:
+        """実行中の呼び出しに合流します。実行中でなければ None を返します。"""
+        call = self._calls.get(key)
+        if call is not None:
+            call.waiters += 1
+            self.coalesced += 1
+        return call
+
+    def _finish(self, key: Hashable, call: _Call) -> None:
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """key の処理が実行中であればその完了を待って結果を返し、そうでなければ func() を実行します。"""
+        with self._lock:
+            call = self._join(key)
+            if call is None:
+                call = self._calls[key] = _Call(Future())
+                self.executions += 1
+                leader = True
+            else:
+                leader = False
+        if not leader:
+            return call.future.result()
+
+        try:
+            result = func()
+        except BaseException as e:
+            self._finish(key, call)
+            call.future.set_exception(e)
+            raise
+        self._finish(key, call)
+        call.future.set_result(result)
+        return result
+
+    def submit(self, key: Hashable, start: Callable[[], "Future[Any]"]) -> "Future[Any]":
+        """key の処理が実行中であればその Future を、そうでなければ start() が返す Future を返します。
+
+        start() は処理を開始して Future を返す関数です (例: ``lambda: executor.submit(func)``)。
+        返される Future は同じキーの呼び出し元で共有されます。
+        """
+        with self._lock:
+            call = self._join(key)
+            if call is not None:
+                return call.future
+            call = self._calls[key] = _Call(start())
+            self.executions += 1
+        call.future.add_done_callback(lambda _: self._finish(key, call))
+        return call.future
+
+    def waiters(self, key: Hashable) -> int:
+        """key の実行中の処理を待っている呼び出し元の数 (実行した呼び出し元を含む)"""
+        with self._lock:
+            call = self._calls.get(key)
+            return call.waiters if call is not None else 0
+
+    def stats(self) -> Dict[str, int]:
+        """実行回数・合流した呼び出し回数・実行中のキーの数を取得します。"""
+        with self._lock:
+            return {
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls),
+            }
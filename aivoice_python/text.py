@@ -0,0 +1,56 @@
+"""
+A.I.VOICE Text Utilities
+
+This module provides helpers for preparing text before it is sent to the host.
+"""
+
+import re
+from typing import List
+
+# 文末として扱う記号 (直後の閉じ括弧も含める)
+_SENTENCE_PATTERN = re.compile(r".*?(?:[。．！？!?]+[」』）)]*|\.(?=\s)|\n+|$)", re.S)
+# 長すぎる文を分割する位置として扱う記号
+_PAUSE_PATTERN = re.compile(r".*?(?:[、，,；;：:]+|$)", re.S)
+
+
+def _split(pattern: re.Pattern, text: str) -> List[str]:
+    return [m.group(0) for m in pattern.finditer(text) if m.group(0)]
+
+
+def split_sentences(text: str, max_chars: int = 120) -> List[str]:
+    """テキストを文末記号や改行で文に分割します。
+
+    max_chars より長い文は読点などのポーズ位置で分割し、それでも長い場合は max_chars 毎に分割します。
+    空白のみの文は除外されます。
+
+    Parameters
+    ----------
+    text : str
+        分割するテキスト
+    max_chars : int
+        1つの文の最大文字数
+    """
+    if max_chars < 1:
+        raise ValueError("max_chars は 1 以上である必要があります")
+
+    chunks = []
+    for sentence in _split(_SENTENCE_PATTERN, text):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        if len(sentence) <= max_chars:
+            chunks.append(sentence)
+            continue
+
+        current = ""
+        for part in _split(_PAUSE_PATTERN, sentence):
+            if current and len(current) + len(part) > max_chars:
+                chunks.append(current)
+                current = ""
+            current += part
+            while len(current) > max_chars:
+                chunks.append(current[:max_chars])
+                current = current[max_chars:]
+        if current.strip():
+            chunks.append(current)
+    return [chunk.strip() for chunk in chunks if chunk.strip()]
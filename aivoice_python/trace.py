@@ -0,0 +1,287 @@
+"""
+A.I.VOICE API Call Tracing
+
+This module records every call forwarded to ``TtsControl`` into a JSON lines
+trace, and replays such a trace as a headless backend so that workloads
+captured against a real host can be rerun with reproducible timings.
+
+Each line of a trace is one call::
+
+    {"t": 0.0123, "op": "call", "name": "SaveAudioToFile", "args": ["out.wav"],
+     "ret": null, "dt": 0.2345, "wav": [44100, 1, 2, 88200]}
+
+- ``t``: 記録開始からの経過時間 (秒)
+- ``op``: "call" (メソッド呼び出し)・"get" (プロパティの取得)・"set" (プロパティの設定)
+- ``name``: メソッド名またはプロパティ名
+- ``args``: 引数 (``set`` の場合は設定した値のみ)
+- ``ret``: 戻り値 (エラーの場合は無し)
+- ``err``: エラーの場合の [例外の型名, メッセージ]
+- ``dt``: 所要時間 (秒)
+- ``wav``: SaveAudioToFile で保存した音声の [サンプリングレート, チャンネル数, 量子化バイト数, data のバイト数]
+"""
+
+from collections import deque
+import json
+import os
+import threading
+import time
+from typing import IO, Deque, Dict, Iterable, List, Optional, Tuple, Union
+
+from .audio import WavFormat, build_wav_header, read_wav_format
+
+
+class TraceMismatchError(Exception):
+    """再生中の呼び出しがトレースと一致しない場合の例外"""
+
+
+class RecordedError(Exception):
+    """トレースに記録されたエラーを再生した例外
+
+    Attributes
+    ----------
+    type_name : str
+        記録時の例外の型名
+    """
+
+    def __init__(self, type_name: str, message: str):
+        super().__init__(message)
+        self.type_name = type_name
+
+
+def _encode(value):
+    """戻り値や引数を JSON で表せる値に変換します。"""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_encode(item) for item in value]
+    try:
+        # .NET の配列などは list として記録する
+        return [_encode(item) for item in iter(value)]
+    except TypeError:
+        pass
+    try:
+        # .NET の列挙型などは数値として記録する
+        return int(value)
+    except (TypeError, ValueError):
+        return str(value)
+
+
+def _saved_wav(path: str) -> Optional[List[int]]:
+    """SaveAudioToFile で保存された音声のフォーマットを取得します。"""
+    for candidate in (path, path + ".wav"):
+        try:
+            wav_format = read_wav_format(candidate)
+        except (OSError, ValueError):
+            continue
+        return [wav_format.sample_rate, wav_format.channels, wav_format.sample_width, wav_format.data_size]
+    return None
+
+
+def load_trace(path: str) -> List[dict]:
+    """トレースファイルを読み込みます。"""
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class RecordingTtsControl:
+    """すべての呼び出しをトレースファイルに記録する TtsControl のラッパー
+
+    AIVoiceTTsControl(record_trace="trace.jsonl") のように指定するか、
+    backend に ``RecordingTtsControl(backend, "trace.jsonl")`` を渡して使用します。
+    記録した呼び出しは ReplayTtsControl で再生できます。
+
+    Parameters
+    ----------
+    inner : object
+        呼び出しを転送する TtsControl
+    trace : str | IO[str]
+        トレースの保存先のファイルパス、またはテキストファイルオブジェクト。
+        ファイルパスの場合は追記し、1行毎に書き出します。
+    """
+
+    def __init__(self, inner, trace: Union[str, IO[str]]):
+        file: IO[str]
+        if isinstance(trace, str):
+            file = open(trace, "a", encoding="utf-8", buffering=1)
+            owns_file = True
+        else:
+            file = trace
+            owns_file = False
+        object.__setattr__(self, "_inner", inner)
+        object.__setattr__(self, "_file", file)
+        object.__setattr__(self, "_owns_file", owns_file)
+        object.__setattr__(self, "_lock", threading.Lock())
+        object.__setattr__(self, "_started", time.perf_counter())
+
+    def _record(self, op: str, name: str, args: tuple, func):
+        started = time.perf_counter()
+        try:
+            result = func()
+        except Exception as e:
+            elapsed = time.perf_counter() - started
+            self._write({
+                "t": round(started - self._started, 6), "op": op, "name": name, "args": _encode(args),
+                "err": [type(e).__name__, str(e)], "dt": round(elapsed, 6),
+            })
+            raise
+        elapsed = time.perf_counter() - started
+        if op == "get" and callable(result):
+            # メソッドの取得は呼び出し時に記録する
+            return result
+        record = {
+            "t": round(started - self._started, 6), "op": op, "name": name, "args": _encode(args),
+            "ret": _encode(result), "dt": round(elapsed, 6),
+        }
+        if name == "SaveAudioToFile" and args:
+            wav = _saved_wav(args[0])
+            if wav is not None:
+                record["wav"] = wav
+        self._write(record)
+        return result
+
+    def _write(self, record: dict) -> None:
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def __getattr__(self, name: str):
+        inner = self._inner
+        attribute = getattr(type(inner), name, None)
+        if attribute is not None and callable(attribute) and not isinstance(attribute, property):
+            method = getattr(inner, name)
+
+            def call(*args):
+                return self._record("call", name, args, lambda: method(*args))
+
+            return call
+
+        value = self._record("get", name, (), lambda: getattr(inner, name))
+        if callable(value):
+
+            def call(*args):
+                return self._record("call", name, args, lambda: value(*args))
+
+            return call
+        return value
+
+    def __setattr__(self, name: str, value) -> None:
+        self._record("set", name, (value,), lambda: setattr(self._inner, name, value))
+
+    def flush(self) -> None:
+        """書き込み済みのトレースをファイルに反映します。"""
+        with self._lock:
+            self._file.flush()
+
+    def close(self) -> None:
+        """トレースファイルを閉じます (ファイルオブジェクトを渡した場合は閉じずに反映のみ行います)。"""
+        with self._lock:
+            if self._owns_file:
+                self._file.close()
+            else:
+                self._file.flush()
+
+
+class ReplayTtsControl:
+    """トレースファイルの記録を返す TtsControl 互換のバックエンド
+
+    ホストプログラムや DLL を必要としないため、Linux 上でも AIVoiceTTsControl(backend=ReplayTtsControl(...)) として
+    記録時のワークロードを再実行できます。
+
+    呼び出しはメソッド・プロパティ毎に記録された順に記録の戻り値 (またはエラー) を返し、
+    記録時の所要時間に time_scale を掛けた時間だけ待機します。
+    引数は比較しません (一時ファイルのパスなどは実行毎に異なるため)。
+    あるメソッド・プロパティの記録を使い切った後は、最後の記録を繰り返します。
+    SaveAudioToFile では記録時と同じフォーマット・長さの無音の WAV ファイルを書き出します。
+
+    Parameters
+    ----------
+    trace : str | Iterable[dict]
+        トレースファイルのパス、または load_trace() で読み込んだ記録
+    time_scale : float
+        所要時間に掛ける倍率。0 の場合は待機しません。
+    strict : bool
+        True の場合、呼び出しが記録とまったく同じ順序で行われなければ TraceMismatchError を送出します。
+    """
+
+    def __init__(self, trace: Union[str, Iterable[dict]], time_scale: float = 1.0, strict: bool = False):
+        records = load_trace(trace) if isinstance(trace, str) else list(trace)
+        streams: Dict[Tuple[str, str], Deque[dict]] = {}
+        for record in records:
+            streams.setdefault((record["op"], record["name"]), deque()).append(record)
+        object.__setattr__(self, "_records", records)
+        object.__setattr__(self, "_streams", streams)
+        object.__setattr__(self, "_last", {})
+        object.__setattr__(self, "_position", 0)
+        object.__setattr__(self, "_lock", threading.Lock())
+        object.__setattr__(self, "time_scale", time_scale)
+        object.__setattr__(self, "strict", strict)
+        object.__setattr__(self, "replayed", 0)
+
+    def _next(self, op: str, name: str) -> dict:
+        key = (op, name)
+        with self._lock:
+            if self.strict:
+                position = self._position
+                if position >= len(self._records):
+                    raise TraceMismatchError(f"トレースの終端を超えて呼び出されました: {op} {name}")
+                expected = self._records[position]
+                if (expected["op"], expected["name"]) != key:
+                    raise TraceMismatchError(
+                        f"{position} 番目の呼び出しが一致しません: {op} {name} (記録: {expected['op']} {expected['name']})"
+                    )
+                object.__setattr__(self, "_position", position + 1)
+            record: dict
+            stream = self._streams.get(key)
+            if stream:
+                record = stream.popleft()
+                self._last[key] = record
+            elif key in self._last:
+                record = self._last[key]
+            else:
+                raise TraceMismatchError(f"トレースに記録されていない呼び出しです: {op} {name}")
+            object.__setattr__(self, "replayed", self.replayed + 1)
+        return record
+
+    def _replay(self, record: dict, args: tuple):
+        if self.time_scale > 0 and record.get("dt"):
+            time.sleep(record["dt"] * self.time_scale)
+        error = record.get("err")
+        if error is not None:
+            raise RecordedError(error[0], error[1])
+        wav = record.get("wav")
+        if wav is not None and args:
+            self._write_silence(args[0], wav)
+        return record.get("ret")
+
+    @staticmethod
+    def _write_silence(path: str, wav: List[int]) -> None:
+        if os.path.splitext(path)[1].lower() != ".wav":
+            path += ".wav"
+        sample_rate, channels, sample_width, data_size = wav
+        header = build_wav_header(WavFormat(sample_rate, channels, sample_width, 44, data_size), data_size)
+        with open(path, "wb") as f:
+            f.write(header)
+            f.truncate(len(header) + data_size)
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        streams = self._streams
+        if ("call", name) in streams and ("get", name) not in streams:
+
+            def call(*args):
+                return self._replay(self._next("call", name), args)
+
+            return call
+        return self._replay(self._next("get", name), ())
+
+    def __setattr__(self, name: str, value) -> None:
+        if name in ("time_scale", "strict"):
+            object.__setattr__(self, name, value)
+            return
+        self._replay(self._next("set", name), (value,))
+
+    def remaining(self) -> int:
+        """まだ再生していない記録の数 (記録時より呼び出しが減った場合に 0 より大きくなります)"""
+        with self._lock:
+            return sum(len(stream) for stream in self._streams.values())
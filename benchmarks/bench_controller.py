@@ -0,0 +1,266 @@
+"""
+Benchmarks for AIVoiceTTsControl
+
+Runs the controller's hot paths against SimulatedTtsControl and measures the
+wrapper overhead, i.e. the time spent in AIVoiceTTsControl on top of the same
+sequence of calls issued directly to the backend.
+
+Usage::
+
+    python benchmarks/bench_controller.py --output bench.json
+    python benchmarks/bench_controller.py --call-latency 0.0005 --compare bench.json
+"""
+
+import argparse
+import gc
+import itertools
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from aivoice_python import AIVoiceTTsControl, SimulatedTtsControl, __version__
+
+DEFAULT_LIST_SIZES = (10, 1000, 10000)
+TEXT = "こんにちは、今日はいい天気ですね。"
+
+
+def connect(call_latency: float, **kwargs) -> AIVoiceTTsControl:
+    """シミュレーターに接続済みの AIVoiceTTsControl を作成します。"""
+    control = AIVoiceTTsControl(backend=SimulatedTtsControl(call_latency=call_latency), **kwargs)
+    control.initialize(control.get_available_host_names()[0])
+    control.connect()
+    return control
+
+
+def measure(
+    name: str,
+    iterations: int,
+    wrapped: Callable[[int], None],
+    direct: Callable[[int], None],
+    backend: SimulatedTtsControl,
+    setup: Optional[Callable[[], None]] = None,
+    repeat: int = 5,
+    **params,
+) -> Dict:
+    """wrapped(i) と direct(i) をそれぞれ iterations 回実行し、1回あたりの所要時間を比較します。
+
+    ファイル I/O などによるばらつきを抑えるため、両者を交互に repeat 回ずつ実行し、最小値を使用します。
+    """
+
+    def run(func: Callable[[int], None]) -> tuple:
+        if setup is not None:
+            setup()
+        calls_before = sum(backend.call_counts.values())
+        # timeit と同様に計測中はガベージコレクションを止める
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            for i in range(iterations):
+                func(i)
+            elapsed = time.perf_counter() - started
+        finally:
+            if gc_enabled:
+                gc.enable()
+        return elapsed, sum(backend.call_counts.values()) - calls_before
+
+    wrapped_seconds, host_calls = run(wrapped)
+    direct_seconds = run(direct)[0]
+    for _ in range(repeat - 1):
+        wrapped_seconds = min(wrapped_seconds, run(wrapped)[0])
+        direct_seconds = min(direct_seconds, run(direct)[0])
+
+    per_call = wrapped_seconds / iterations
+    baseline = direct_seconds / iterations
+    return {
+        "name": name,
+        "params": params,
+        "iterations": iterations,
+        "seconds": wrapped_seconds,
+        "per_iteration_us": per_call * 1e6,
+        "baseline_per_iteration_us": baseline * 1e6,
+        "overhead_us": (per_call - baseline) * 1e6,
+        "host_calls_per_iteration": host_calls / iterations,
+    }
+
+
+def bench_text_and_save(call_latency: float, iterations: int, work_dir: str) -> Dict:
+    """テキストの設定と音声ファイルへの保存"""
+    control = connect(call_latency)
+    backend = control._backend
+    path = os.path.join(work_dir, "bench.wav")
+
+    def wrapped(i: int) -> None:
+        control.text = TEXT
+        control.save_audio_to_file(path)
+
+    def direct(i: int) -> None:
+        backend.Text = TEXT
+        backend.SaveAudioToFile(path)
+
+    return measure("text_and_save", iterations, wrapped, direct, backend)
+
+
+def bench_preset_switch(call_latency: float, iterations: int) -> Dict:
+    """ボイスプリセットの切り替え"""
+    control = connect(call_latency)
+    backend = control._backend
+    names = control.voice_preset_names
+
+    def wrapped(i: int) -> None:
+        control.current_voice_preset_name = names[i % len(names)]
+
+    def direct(i: int) -> None:
+        backend.CurrentVoicePresetName = names[i % len(names)]
+
+    return measure("preset_switch", iterations, wrapped, direct, backend)
+
+
+def bench_add_list_item(call_latency: float, rows: int) -> Dict:
+    """リスト形式の行の追加"""
+    control = connect(call_latency)
+    backend = control._backend
+    preset_name = control.voice_preset_names[0]
+
+    def wrapped(i: int) -> None:
+        control.add_list_item(preset_name, TEXT)
+
+    def direct(i: int) -> None:
+        backend.AddListItem(preset_name, TEXT)
+
+    return measure("add_list_item", rows, wrapped, direct, backend, setup=backend.ClearListItems, rows=rows)
+
+
+def bench_add_voice_preset(call_latency: float, iterations: int) -> Dict:
+    """ボイスプリセットの追加 (JSON へのシリアライズを含む)"""
+    control = connect(call_latency)
+    backend = control._backend
+    preset = control.get_voice_preset(control.voice_preset_names[0])
+    # 繰り返し実行しても名前が重複しないよう通し番号を使う
+    serial = itertools.count()
+
+    def wrapped(i: int) -> None:
+        control.add_voice_preset(dict(preset, PresetName=f"bench-{next(serial)}"))
+
+    def direct(i: int) -> None:
+        backend.AddVoicePreset(json.dumps(dict(preset, PresetName=f"bench-{next(serial)}"), ensure_ascii=False))
+
+    return measure("add_voice_preset", iterations, wrapped, direct, backend)
+
+
+def bench_get_voice_preset(call_latency: float, iterations: int, cache_metadata: bool) -> Dict:
+    """ボイスプリセットの取得 (JSON の解析を含む)"""
+    control = connect(call_latency, cache_metadata=cache_metadata)
+    backend = control._backend
+    preset_name = control.voice_preset_names[0]
+
+    def wrapped(i: int) -> None:
+        control.get_voice_preset(preset_name)
+
+    def direct(i: int) -> None:
+        backend.GetVoicePreset(preset_name)
+
+    return measure("get_voice_preset", iterations, wrapped, direct, backend, cache_metadata=cache_metadata)
+
+
+def run_all(call_latency: float, iterations: int, list_sizes=DEFAULT_LIST_SIZES) -> List[Dict]:
+    """すべてのベンチマークを実行します。"""
+    work_dir = tempfile.mkdtemp(prefix="aivoice-bench-")
+    try:
+        results = [
+            bench_text_and_save(call_latency, iterations, work_dir),
+            bench_preset_switch(call_latency, iterations),
+        ]
+        results += [bench_add_list_item(call_latency, rows) for rows in list_sizes]
+        results += [
+            bench_add_voice_preset(call_latency, iterations),
+            bench_get_voice_preset(call_latency, iterations, cache_metadata=False),
+            bench_get_voice_preset(call_latency, iterations, cache_metadata=True),
+        ]
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return results
+
+
+def result_key(result: Dict) -> str:
+    """比較のために結果を識別する文字列"""
+    params = ",".join(f"{k}={v}" for k, v in sorted(result["params"].items()))
+    return f"{result['name']}[{params}]" if params else result["name"]
+
+
+def compare(previous: Dict, current: Dict, threshold: float) -> List[str]:
+    """前回の結果と比較し、ホストプログラムの呼び出し回数が増えたか、
+    オーバーヘッドが threshold 倍を超えて増えたベンチマークの一覧を返します。
+
+    2 マイクロ秒または直接呼び出しの所要時間の 20% 未満の増加は計測誤差として無視します。
+    """
+    before = {result_key(r): r for r in previous["results"]}
+    regressions = []
+    for result in current["results"]:
+        old = before.get(result_key(result))
+        if old is None:
+            continue
+        if result["host_calls_per_iteration"] > old["host_calls_per_iteration"]:
+            regressions.append(
+                f"{result_key(result)}: host calls {old['host_calls_per_iteration']:.2f}"
+                f" -> {result['host_calls_per_iteration']:.2f}"
+            )
+        overhead = max(old["overhead_us"], 0.0)
+        tolerance = max(2.0, old["baseline_per_iteration_us"] * 0.2)
+        limit = max(overhead * threshold, overhead + tolerance)
+        if result["overhead_us"] > limit:
+            regressions.append(
+                f"{result_key(result)}: overhead {old['overhead_us']:.2f}us -> {result['overhead_us']:.2f}us"
+            )
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="AIVoiceTTsControl のベンチマーク")
+    parser.add_argument("--output", default="bench.json", help="結果を書き出す JSON ファイル")
+    parser.add_argument("--call-latency", type=float, default=0.0, help="シミュレーターの API 呼び出し1回あたりの遅延 (秒)")
+    parser.add_argument("--iterations", type=int, default=1000, help="各ベンチマークの繰り返し回数")
+    parser.add_argument(
+        "--list-sizes", type=int, nargs="+", default=list(DEFAULT_LIST_SIZES), help="add_list_item で追加する行数"
+    )
+    parser.add_argument("--compare", metavar="PATH", help="比較対象の以前の結果")
+    parser.add_argument("--threshold", type=float, default=2.0, help="回帰とみなすオーバーヘッドの増加率")
+    args = parser.parse_args(argv)
+
+    report = {
+        "version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "call_latency": args.call_latency,
+        "results": run_all(args.call_latency, args.iterations, args.list_sizes),
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    for result in report["results"]:
+        print(
+            f"{result_key(result):40} {result['per_iteration_us']:10.2f}us"
+            f"  overhead {result['overhead_us']:8.2f}us  host calls {result['host_calls_per_iteration']:.2f}"
+        )
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            previous = json.load(f)
+        regressions = compare(previous, report, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
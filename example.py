@@ -6,7 +6,6 @@ This example demonstrates how to use the aivoice_python library
 to control A.I.VOICE Editor.
 """
 
-import time
 from aivoice_python import AIVoiceTTsControl, HostStatus
 
 
@@ -51,11 +50,9 @@ def main():
     tts_control.text = "Hello world! This is a test of A.I.VOICE Editor API."
 
     # 再生
-    play_time = tts_control.get_play_time()
     tts_control.save_audio_to_file("output.wav")
-    # tts_control.play()
-    # Play()は再生完了を待たないので予め取得した再生時間+α分sleepで待つ
-    # time.sleep((play_time + 500) / 1000)
+    # play_and_wait()はステータスがBusyでなくなるまで待機する
+    # tts_control.play_and_wait()
 
     # A.I.VOICE Editorとの接続を終了する
     tts_control.disconnect()
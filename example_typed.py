@@ -114,6 +114,10 @@ def main():
         if host_names:
             tts_control.initialize(host_names[0])
             tts_control.connect()
+
+            # 必要なプリセットのみ追加・更新する
+            report = tts_control.sync_voice_presets(presets.values())
+            print(f"追加: {report['added']} 更新: {report['updated']}")
             print(f"利用可能なプリセット: {tts_control.voice_preset_names}")
             # 3つのプリセットを試してみる
             test_texts = [
@@ -123,14 +127,8 @@ def main():
             ]
             
             for preset_name, text in test_texts:
-
-                if preset_name not in tts_control.voice_preset_names:
-                    tts_control.add_voice_preset(presets[preset_name])
-
                 print(f"\n=== {preset_name}なプリセットでテスト ===")
                 
-                # プリセット設定を更新
-                tts_control.set_voice_preset(presets[preset_name])
                 # 現在のプリセット名を更新
                 tts_control.current_voice_preset_name = preset_name
                 
@@ -0,0 +1,66 @@
+"""
+Shared fixtures for the tests
+"""
+
+import os
+import sys
+from typing import List, Optional, Tuple
+import unittest
+from unittest.mock import patch
+
+# テスト用のパッケージパスを追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from aivoice_python import AIVoiceTTsControl, SimulatedTtsControl
+
+
+def create_simulated_control(
+    host_name: Optional[str] = None,
+    control_options: Optional[dict] = None,
+    **options,
+) -> Tuple[AIVoiceTTsControl, SimulatedTtsControl]:
+    """シミュレーターに接続済みの AIVoiceTTsControl とシミュレーターを作成します。
+
+    Parameters
+    ----------
+    host_name : str, optional
+        接続するホスト名。指定した場合はシミュレーターのホストもこの1つになります。
+        省略時はシミュレーターの最初のホストに接続します。
+    control_options : dict, optional
+        AIVoiceTTsControl に渡す引数
+    **options
+        SimulatedTtsControl に渡す引数
+    """
+    if host_name is not None:
+        options.setdefault("host_names", [host_name])
+    backend = SimulatedTtsControl(**options)
+    control = AIVoiceTTsControl(backend=backend, **(control_options or {}))
+    control.initialize(host_name or control.get_available_host_names()[0])
+    control.connect()
+    return control, backend
+
+
+class FakeClock:
+    """time.monotonic と time.sleep を置き換え、sleep した時間だけ進む時計
+
+    シミュレーターの再生時間や待機処理を、実際の経過時間に依存せずに確かめるために使用します。
+    """
+
+    def __init__(self, start: float = 1000.0):
+        self.now = start
+        self.sleeps: List[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += max(seconds, 0.0)
+
+    def install(self, test_case: unittest.TestCase) -> "FakeClock":
+        """テストの終了まで time.monotonic と time.sleep を置き換えます。"""
+        for name in ("monotonic", "sleep"):
+            patcher = patch(f"time.{name}", getattr(self, name))
+            patcher.start()
+            test_case.addCleanup(patcher.stop)
+        return self
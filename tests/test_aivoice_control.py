@@ -2,15 +2,24 @@
 Basic tests for AIVoiceTTsControl
 """
 
+import json
 import unittest
 from unittest.mock import Mock, patch
 import sys
 import os
+import shutil
+import tempfile
+import threading
+import time
+import wave
 
 # テスト用のパッケージパスを追加
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from aivoice_python import HostStatus, TextEditMode
+from aivoice_python import aivoice_control
+from aivoice_python.aivoice_control import next_poll_interval
+from tests.conftest import FakeClock, create_simulated_control
 
 
 class TestHostStatus(unittest.TestCase):
@@ -35,13 +44,58 @@ class TestTextEditMode(unittest.TestCase):
 
 class TestAIVoiceTTsControl(unittest.TestCase):
     """AIVoiceTTsControlのテスト（モック使用）"""
+
+    def setUp(self):
+        # 読み込み済みの TtsControl 型のキャッシュを破棄
+        aivoice_control._tts_control_types.clear()
+        self.mock_clr = Mock()
+        clr_patcher = patch.dict('sys.modules', {'clr': self.mock_clr})
+        clr_patcher.start()
+        self.addCleanup(clr_patcher.stop)
+        self.addCleanup(aivoice_control._tts_control_types.clear)
+
+    def test_import_does_not_load_clr(self):
+        """パッケージのインポート時に pythonnet が読み込まれないかテスト"""
+        import subprocess
+
+        code = "import sys, aivoice_python; print('clr' in sys.modules)"
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=os.path.join(os.path.dirname(__file__), '..'),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        self.assertEqual(result.stdout.strip(), "False")
+
+    def test_optional_features_are_imported_lazily(self):
+        """オプション機能が最初に参照したときに読み込まれるかテスト"""
+        import subprocess
+
+        code = (
+            "import sys, aivoice_python; print('asyncio' in sys.modules);"
+            "aivoice_python.AsyncAIVoiceTTsControl; print('asyncio' in sys.modules)"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=os.path.join(os.path.dirname(__file__), '..'),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        self.assertEqual(result.stdout.split(), ["False", "True"])
+        import aivoice_python
+        for name in aivoice_python.__all__:
+            self.assertTrue(hasattr(aivoice_python, name), name)
+        with self.assertRaises(AttributeError):
+            aivoice_python.missing_name
     
     @patch('os.path.isfile')
-    @patch('aivoice_python.aivoice_control.clr.AddReference')
-    def test_initialization_success(self, mock_add_reference, mock_isfile):
+    def test_initialization_success(self, mock_isfile):
         """正常な初期化のテスト"""
         # A.I.VOICE Editorがインストールされている場合をモック
         mock_isfile.return_value = True
+        mock_add_reference = self.mock_clr.AddReference
         mock_add_reference.return_value = None
         
         # AI.Talk.Editor.Apiモジュールをモック
@@ -57,6 +111,11 @@ class TestAIVoiceTTsControl(unittest.TestCase):
             self.assertIsNotNone(control)
             mock_add_reference.assert_called_once()
             mock_tts_control_class.assert_called_once()
+
+            # 2つ目のインスタンスでは DLL を読み込み直さない
+            AIVoiceTTsControl()
+            mock_add_reference.assert_called_once()
+            self.assertEqual(mock_tts_control_class.call_count, 2)
     
     @patch('os.path.isfile')
     def test_initialization_failure(self, mock_isfile):
@@ -70,11 +129,11 @@ class TestAIVoiceTTsControl(unittest.TestCase):
             AIVoiceTTsControl()
     
     @patch('os.path.isfile')
-    @patch('aivoice_python.aivoice_control.clr.AddReference')
-    def test_custom_editor_dir(self, mock_add_reference, mock_isfile):
+    def test_custom_editor_dir(self, mock_isfile):
         """カスタムエディターディレクトリのテスト"""
         # カスタムパスでのテスト
         mock_isfile.return_value = True
+        mock_add_reference = self.mock_clr.AddReference
         mock_add_reference.return_value = None
         
         # AI.Talk.Editor.Apiモジュールをモック
@@ -100,5 +159,678 @@ class TestAIVoiceTTsControl(unittest.TestCase):
             mock_add_reference.assert_called_with(expected_reference_path)
 
 
+class TestSynthesizeMany(unittest.TestCase):
+    """synthesize_manyのテスト（シミュレーター使用）"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_outputs_follow_input_order(self):
+        """入力順に音声ファイルが保存されるかテスト"""
+        control, backend = create_simulated_control(sample_rate=8000)
+        items = ["短い", ("琴葉 葵", "これは少し長めの文章です"), "中くらいの文"]
+
+        paths = control.synthesize_many(items, self.tmp_dir)
+
+        self.assertEqual(len(paths), 3)
+        frames = []
+        for path in paths:
+            with wave.open(path, "rb") as wav:
+                frames.append(wav.getnframes())
+        self.assertLess(frames[0], frames[2])
+        self.assertLess(frames[2], frames[1])
+        self.assertEqual(backend.call_counts["SaveAudioToFile"], 3)
+
+    def test_fewer_calls_than_synthesize_loop(self):
+        """synthesize() を繰り返すよりホストプログラムの呼び出しが少ないかテスト"""
+        items = [("琴葉 茜", "おはようございます"), ("琴葉 葵", "おはよう"), ("琴葉 茜", "今日は晴れです")] * 10
+
+        control, backend = create_simulated_control()
+        for index, (voice_preset_name, text) in enumerate(items):
+            control.current_voice_preset_name = voice_preset_name
+            control.synthesize(text, os.path.join(self.tmp_dir, f"loop-{index}.wav"))
+        loop_calls = sum(backend.call_counts.values())
+
+        control, backend = create_simulated_control()
+        backend.call_counts.clear()
+        paths = control.synthesize_many(items, self.tmp_dir)
+
+        self.assertTrue(all(os.path.isfile(path) for path in paths))
+        self.assertLess(sum(backend.call_counts.values()), loop_calls)
+        # 同じ内容の行は1回だけ合成し、ボイスプリセットの切り替えと復元は1回ずつ
+        self.assertEqual(backend.call_counts["SaveAudioToFile"], 3)
+        self.assertEqual(backend.call_counts["CurrentVoicePresetName"], 3)
+        self.assertEqual(control.current_voice_preset_name, "琴葉 茜")
+
+    def test_duplicates_share_audio(self):
+        """同じ内容の行に同じ音声が保存されるかテスト"""
+        control, _ = create_simulated_control()
+        paths = control.synthesize_many(["テスト", "別の文", "テスト"], self.tmp_dir)
+        with open(paths[0], "rb") as first, open(paths[2], "rb") as third:
+            self.assertEqual(first.read(), third.read())
+
+    def test_restores_text_edit_mode(self):
+        """処理後にテキスト入力形式が元に戻るかテスト"""
+        control, _ = create_simulated_control()
+        control.synthesize_many(["テスト"], self.tmp_dir)
+        self.assertEqual(control.text_edit_mode, TextEditMode.Text)
+
+    def test_list_rows_are_untouched(self):
+        """リスト形式の行と選択状態が変更されないかテスト"""
+        control, backend = create_simulated_control()
+        control.text_edit_mode = TextEditMode.List
+        control.add_list_item("琴葉 茜", "一行目")
+        control.add_list_item("琴葉 葵", "二行目")
+        control.set_list_selection_indices([1])
+        rows = control.get_list_items()
+        backend.call_counts.clear()
+
+        control.synthesize_many(["テスト"] * 5, self.tmp_dir)
+
+        self.assertEqual(control.text_edit_mode, TextEditMode.List)
+        self.assertEqual(control.get_list_items(), rows)
+        self.assertEqual(control.get_list_selection_indices(), [1])
+        self.assertNotIn("ClearListItems", backend.call_counts)
+        self.assertNotIn("AddListItem", backend.call_counts)
+
+
+class TestMetadataCache(unittest.TestCase):
+    """ボイス名・ボイスプリセットのキャッシュのテスト（シミュレーター使用）"""
+
+    def test_lookups_are_cached(self):
+        """2回目以降の取得でホストへ問い合わせないかテスト"""
+        control, backend = create_simulated_control()
+        for _ in range(3):
+            control.voice_names
+            control.voice_preset_names
+            control.get_voice_preset("琴葉 茜")
+        self.assertEqual(backend.call_counts["VoiceNames"], 1)
+        self.assertEqual(backend.call_counts["VoicePresetNames"], 1)
+        self.assertEqual(backend.call_counts["GetVoicePreset"], 1)
+
+    def test_cached_preset_is_not_shared(self):
+        """返されたプリセットを変更してもキャッシュに影響しないかテスト"""
+        control, _ = create_simulated_control()
+        control.get_voice_preset("琴葉 茜")["Speed"] = 3.0
+        self.assertEqual(control.get_voice_preset("琴葉 茜")["Speed"], 1.0)
+
+    def test_invalidated_by_preset_changes(self):
+        """ボイスプリセットの追加・更新でキャッシュが破棄されるかテスト"""
+        control, _ = create_simulated_control()
+        control.voice_preset_names
+        control.add_voice_preset({"PresetName": "テスト", "VoiceName": "akane_west_emo_48"})
+        self.assertIn("テスト", control.voice_preset_names)
+
+        control.get_voice_preset("テスト")
+        control.set_voice_preset({"PresetName": "テスト", "VoiceName": "akane_west_emo_48", "Speed": 2.0})
+        self.assertEqual(control.get_voice_preset("テスト")["Speed"], 2.0)
+
+    def test_refresh_and_disabled_cache(self):
+        """refresh() とキャッシュ無効化のテスト"""
+        control, backend = create_simulated_control()
+        control.voice_names
+        control.refresh()
+        control.voice_names
+        self.assertEqual(backend.call_counts["VoiceNames"], 2)
+
+        control.cache_metadata = False
+        control.voice_names
+        control.voice_names
+        self.assertEqual(backend.call_counts["VoiceNames"], 4)
+
+
+class TestWriteElision(unittest.TestCase):
+    """プロパティ書き込みの省略のテスト（シミュレーター使用）"""
+
+    def test_redundant_writes_are_skipped(self):
+        """同じ値の再設定でホストへ書き込まないかテスト"""
+        control, backend = create_simulated_control()
+        for _ in range(3):
+            control.current_voice_preset_name = "琴葉 葵"
+            control.text_edit_mode = TextEditMode.List
+            control.master_control = '{"Volume": 1.5}'
+        control.master_control = '{ "Volume" : 1.5 }'
+
+        self.assertEqual(backend.call_counts["CurrentVoicePresetName"], 1)
+        self.assertEqual(backend.call_counts["TextEditMode"], 1)
+        # 書き込み1回と、書き込み後の読み直し1回
+        self.assertEqual(backend.call_counts["MasterControl"], 2)
+        self.assertEqual(control.current_voice_preset_name, "琴葉 葵")
+
+    def test_partial_master_control_writes(self):
+        """一部の項目のみの書き込みの後も、ホストプログラムの値を保持するかテスト"""
+        from aivoice_python import synthesis_key
+
+        control, backend = create_simulated_control()
+        control.master_control = '{"Volume": 1.5}'
+        control.master_control = '{"Speed": 2.0}'
+
+        self.assertEqual(json.loads(control.master_control), json.loads(backend.MasterControl))
+        self.assertEqual(json.loads(control.master_control)["Volume"], 1.5)
+        self.assertEqual(json.loads(control.master_control)["Speed"], 2.0)
+        preset = control.get_voice_preset(control.current_voice_preset_name)
+        self.assertEqual(
+            synthesis_key("あ", preset, control.master_control),
+            synthesis_key("あ", preset, backend.MasterControl),
+        )
+
+        calls = backend.call_counts["MasterControl"]
+        control.master_control = '{"Volume": 1.5}'
+        self.assertEqual(backend.call_counts["MasterControl"], calls)
+
+    def test_changed_values_are_written(self):
+        """値が変化した場合は書き込まれるかテスト"""
+        control, backend = create_simulated_control()
+        control.current_voice_preset_name = "琴葉 葵"
+        control.current_voice_preset_name = "琴葉 茜"
+        self.assertEqual(backend.call_counts["CurrentVoicePresetName"], 2)
+
+    def test_resync_on_connect(self):
+        """再接続後は改めてホストへ書き込まれるかテスト"""
+        control, backend = create_simulated_control()
+        control.text_edit_mode = TextEditMode.List
+        control.connect()
+        control.text_edit_mode = TextEditMode.List
+        self.assertEqual(backend.call_counts["TextEditMode"], 2)
+
+    def test_opt_out(self):
+        """elide_writes=False の場合は毎回書き込まれるかテスト"""
+        control, backend = create_simulated_control()
+        control.elide_writes = False
+        control.text_edit_mode = TextEditMode.List
+        control.text_edit_mode = TextEditMode.List
+        self.assertEqual(backend.call_counts["TextEditMode"], 2)
+
+
+class TestWaitUntilIdle(unittest.TestCase):
+    """wait_until_idle / play_and_waitのテスト（シミュレーター使用）"""
+
+    def test_next_poll_interval(self):
+        """終了予定時刻に近いほど確認間隔が短くなるかテスト"""
+        far = next_poll_interval(0.0, 1.0, None)
+        near = next_poll_interval(0.98, 1.0, far)
+        self.assertEqual(far, 0.1)
+        self.assertAlmostEqual(near, 0.01)
+        self.assertEqual(next_poll_interval(2.0, 1.0, near), 0.005)
+
+    def test_next_poll_interval_backoff(self):
+        """終了予定時刻が不明な場合に間隔が倍々に延びるかテスト"""
+        self.assertEqual(next_poll_interval(0.0, None, None), 0.005)
+        self.assertEqual(next_poll_interval(0.0, None, 0.005), 0.01)
+        self.assertEqual(next_poll_interval(0.0, None, 0.08), 0.1)
+
+    def test_play_and_wait(self):
+        """再生完了直後に戻るかテスト"""
+        clock = FakeClock().install(self)
+        control, backend = create_simulated_control(playback_scale=0.1)
+        control.text = "こんにちは、世界。"
+        play_time = control.get_play_time()
+        backend.call_counts.clear()
+
+        start = clock.now
+        self.assertTrue(control.play_and_wait(expected_ms=play_time * 0.1))
+        elapsed = clock.now - start
+
+        # 再生終了後、最短の確認間隔 (5 ミリ秒) 以内に戻る
+        self.assertGreaterEqual(elapsed, play_time * 0.1 / 1000)
+        self.assertLessEqual(elapsed, play_time * 0.1 / 1000 + 0.005)
+        # 終了予定時刻までは粗く確認する
+        self.assertLessEqual(backend.call_counts["Status"], 10)
+        self.assertEqual(control.status, HostStatus.Idle)
+
+    def test_wait_until_idle_timeout(self):
+        """タイムアウト時に False を返すかテスト"""
+        control, _ = create_simulated_control()
+        control.text = "長い文章を再生しています。"
+        control.play()
+        self.assertFalse(control.wait_until_idle(timeout=0.02))
+        control.stop()
+        self.assertTrue(control.wait_until_idle(timeout=0.02))
+
+
+class TestReconnect(unittest.TestCase):
+    """自動再接続とキープアライブのテスト（シミュレーター使用）"""
+
+    def _create(self, **kwargs):
+        control, backend = create_simulated_control(control_options=kwargs, idle_timeout=0.05)
+        events = []
+        control.add_event_listener(lambda event, info: events.append((event, info)))
+        return control, backend, events
+
+    def test_reconnects_and_replays_state(self):
+        """接続切れの後に再接続して状態を設定し直すかテスト"""
+        control, backend, events = self._create(auto_reconnect=True)
+        control.current_voice_preset_name = "琴葉 葵"
+        time.sleep(0.1)
+
+        control.text = "テスト"
+
+        self.assertEqual([event for event, _ in events], ["retry", "reconnect"])
+        self.assertEqual(events[0][1]["name"], "Text")
+        self.assertEqual(backend.call_counts["Connect"], 2)
+        self.assertEqual(backend.call_counts["CurrentVoicePresetName"], 2)
+        self.assertEqual(control.status, HostStatus.Idle)
+
+    def test_without_auto_reconnect(self):
+        """auto_reconnect が無効な場合は例外が発生するかテスト"""
+        control, _, events = self._create()
+        time.sleep(0.1)
+        with self.assertRaises(RuntimeError):
+            control.text = "テスト"
+        self.assertEqual(events, [])
+
+    def test_other_errors_are_not_retried(self):
+        """接続切れ以外のエラーはやり直さないかテスト"""
+        control, backend, events = self._create(auto_reconnect=True)
+        with self.assertRaises(RuntimeError):
+            control.get_voice_preset("存在しない")
+        self.assertEqual(events, [])
+        self.assertEqual(backend.call_counts["GetVoicePreset"], 1)
+
+    def test_replays_state_without_elision(self):
+        """elide_writes=False でも設定した値を再接続時に設定し直すかテスト"""
+        control, backend, events = self._create(auto_reconnect=True, elide_writes=False)
+        control.current_voice_preset_name = "琴葉 葵"
+        control.master_control = '{"Volume": 1.5}'
+        control.master_control = '{"Speed": 2.0}'
+        backend.Disconnect()
+        backend._master_control["Volume"] = 1.0
+        backend._master_control["Speed"] = 1.0
+
+        control.text = "テスト"
+
+        self.assertEqual([event for event, _ in events], ["retry", "reconnect"])
+        self.assertEqual(backend.CurrentVoicePresetName, "琴葉 葵")
+        master = json.loads(backend.MasterControl)
+        self.assertEqual((master["Volume"], master["Speed"]), (1.5, 2.0))
+
+    def test_keepalive_skips_running_jobs(self):
+        """job_lock が保持されている間はキープアライブが再接続しないかテスト"""
+        control, backend, events = self._create(auto_reconnect=True)
+        ticked = threading.Event()
+        control.add_event_listener(lambda event, info: ticked.set())
+        backend.Disconnect()
+        with control.job_lock:
+            control.start_keepalive(interval=0.01)
+            self.assertFalse(ticked.wait(0.1))
+            self.assertEqual(backend.call_counts["Connect"], 1)
+        self.assertTrue(ticked.wait(5))
+        control.stop_keepalive()
+        self.assertEqual(backend.call_counts["Connect"], 2)
+
+    def test_keepalive(self):
+        """キープアライブで接続が維持されるかテスト"""
+        control, _, events = self._create()
+        control.start_keepalive(interval=0.01)
+        time.sleep(0.15)
+        control.stop_keepalive()
+
+        control.text = "テスト"
+        self.assertIn("keepalive", [event for event, _ in events])
+
+
+class TestSynthesizeStream(unittest.TestCase):
+    """synthesize_streamのテスト（シミュレーター使用）"""
+
+    def test_yields_chunks_in_order(self):
+        """文毎の音声が順番に返されるかテスト"""
+        control, backend = create_simulated_control()
+        text = "一文目です。二文目は少し長めの文です！三文目"
+        chunks = list(control.synthesize_stream(text))
+
+        self.assertEqual([sentence for sentence, _ in chunks], ["一文目です。", "二文目は少し長めの文です！", "三文目"])
+        for _, audio in chunks:
+            self.assertEqual(audio[:4], b"RIFF")
+        self.assertEqual(backend.call_counts["SaveAudioToFile"], 3)
+
+    def test_prefetch(self):
+        """先読みで次の文の合成が呼び出し側の処理と並行するかテスト"""
+        control, backend = create_simulated_control()
+        saved = threading.Semaphore(0)
+        save_audio_to_file = backend.SaveAudioToFile
+
+        def save_and_signal(path):
+            save_audio_to_file(path)
+            saved.release()
+
+        backend.SaveAudioToFile = save_and_signal
+        text = "あいうえお。" * 4
+
+        stream = control.synthesize_stream(text)
+        next(stream)
+        # 1文目を受け取った呼び出し側が処理している間に、2文目が合成される
+        self.assertTrue(saved.acquire(timeout=5))
+        self.assertTrue(saved.acquire(timeout=5))
+        stream.close()
+
+        backend.call_counts.clear()
+        stream = control.synthesize_stream(text, prefetch=False)
+        next(stream)
+        self.assertEqual(backend.call_counts["SaveAudioToFile"], 1)
+        stream.close()
+
+    def test_close_early(self):
+        """途中で中断しても例外が発生しないかテスト"""
+        control, _ = create_simulated_control()
+        stream = control.synthesize_stream("一。二。三。")
+        next(stream)
+        stream.close()
+        self.assertEqual(control.status, HostStatus.Idle)
+
+
+class TestSynthesizeToBytes(unittest.TestCase):
+    """synthesize_to_bytesのテスト（シミュレーター使用）"""
+
+    def test_returns_pcm_and_metadata(self):
+        """PCM データとフォーマット情報を返し、一時ファイルを残さないかテスト"""
+        control, _ = create_simulated_control(sample_rate=16000)
+        control.text = "こんにちは"
+        play_time = control.get_play_time()
+
+        with patch('aivoice_python.aivoice_control.default_temp_dir', return_value=tempfile.mkdtemp()) as tmp:
+            audio = control.synthesize_to_bytes("こんにちは")
+            self.assertEqual(os.listdir(tmp.return_value), [])
+            os.rmdir(tmp.return_value)
+
+        self.assertEqual(audio.sample_rate, 16000)
+        self.assertEqual(audio.channels, 1)
+        self.assertEqual(audio.frames, int(16000 * play_time / 1000))
+        self.assertEqual(len(audio.pcm), audio.frames * 2)
+
+
+class TestPlayTime(unittest.TestCase):
+    """play_time・estimate_play_timeのテスト（シミュレーター使用）"""
+
+    def test_play_time_is_cached(self):
+        """同じテキストとプリセットでは再度合成しないかテスト"""
+        control, backend = create_simulated_control()
+        first = control.play_time("こんにちは。")
+        self.assertEqual(control.play_time("こんにちは。"), first)
+        self.assertEqual(backend.call_counts["GetPlayTime"], 1)
+
+        control.current_voice_preset_name = "琴葉 葵"
+        control.play_time("こんにちは。")
+        self.assertEqual(backend.call_counts["GetPlayTime"], 2)
+
+    def test_synthesize_records_play_time(self):
+        """synthesize() で保存した音声の長さが再生時間として使われるかテスト"""
+        control, backend = create_simulated_control()
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            control.synthesize("こんにちは。", os.path.join(tmp_dir, "out.wav"))
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        self.assertEqual(control.estimate_play_time("こんにちは。"), backend.GetPlayTime())
+        control.play_time("こんにちは。")
+        self.assertEqual(backend.call_counts["GetPlayTime"], 1)
+
+    def test_synthesize_without_local_state(self):
+        """値を手元に保持しない設定では、再生時間のために余分な読み込みをしないかテスト"""
+        for options in ({"cache_metadata": False}, {"elide_writes": False}):
+            control, backend = create_simulated_control(control_options=options)
+            tmp_dir = tempfile.mkdtemp()
+            try:
+                control.synthesize("こんにちは。", os.path.join(tmp_dir, "out.wav"))
+                backend.call_counts.clear()
+                control.synthesize("こんばんは。", os.path.join(tmp_dir, "out.wav"))
+            finally:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+            for name in ("CurrentVoicePresetName", "GetVoicePreset", "MasterControl"):
+                self.assertNotIn(name, backend.call_counts)
+            self.assertEqual(backend.call_counts["SaveAudioToFile"], 1)
+
+    def test_estimate_is_calibrated(self):
+        """実測値で補正された見積もりをホストを呼び出さずに返すかテスト"""
+        control, backend = create_simulated_control(ms_per_char=80)
+        for text in ("あいうえお。", "かきくけこ、さしすせそ。"):
+            control.play_time(text)
+        calls = sum(backend.call_counts.values())
+
+        self.assertAlmostEqual(control.estimate_play_time("たちつてと。"), 770)
+        self.assertEqual(sum(backend.call_counts.values()), calls)
+
+    def test_cache_size_limit(self):
+        """保持する件数が上限を超えないかテスト"""
+        control, _ = create_simulated_control(control_options={"play_time_cache_size": 2})
+        for text in ("あ", "い", "う"):
+            control.play_time(text)
+        self.assertEqual(len(control._play_time_cache), 2)
+
+
+class TestNormalizer(unittest.TestCase):
+    """normalizerのテスト（シミュレーター使用）"""
+
+    def setUp(self):
+        from aivoice_python import TextNormalizer
+
+        self.control, self.backend = create_simulated_control(control_options={"normalizer": TextNormalizer()})
+
+    def test_variants_share_play_time(self):
+        """全角・半角の違いだけのテキストが同じ再生時間のキャッシュを使うかテスト"""
+        self.control.play_time("ＡＩボイス！！")
+        self.assertEqual(self.backend.Text, "AIボイス!")
+        self.control.play_time("AIボイス!")
+        self.control.play_time(" AIボイス！ ")
+        self.assertEqual(self.backend.call_counts["GetPlayTime"], 1)
+
+    def test_synthesize_many_normalizes_rows(self):
+        """synthesize_many() で合成するテキストが変換されるかテスト"""
+        rendered = []
+        save_audio_to_file = self.backend.SaveAudioToFile
+
+        def save_and_record(path):
+            rendered.append((self.backend.CurrentVoicePresetName, self.backend.Text))
+            save_audio_to_file(path)
+
+        self.backend.SaveAudioToFile = save_and_record
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            self.control.synthesize_many(["ｶﾀｶﾅ", ("琴葉 葵", "１２３")], tmp_dir)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        self.assertEqual(rendered, [("琴葉 茜", "カタカナ"), ("琴葉 葵", "123")])
+
+
+class TestMasterControl(unittest.TestCase):
+    """get_master_control・update_master_controlのテスト（シミュレーター使用）"""
+
+    def test_partial_update(self):
+        """指定した項目のみ変更し、他の項目を保持するかテスト"""
+        control, backend = create_simulated_control()
+        self.assertTrue(control.update_master_control(Volume=1.5))
+        master = json.loads(backend.MasterControl)
+        self.assertEqual(master["Volume"], 1.5)
+        self.assertEqual(master["SentencePause"], 800)
+        self.assertEqual(control.get_master_control()["Volume"], 1.5)
+
+    def test_unchanged_value_is_not_written(self):
+        """値が変わらない場合はホストプログラムを呼び出さないかテスト"""
+        control, backend = create_simulated_control()
+        control.update_master_control(Volume=1.5)
+        calls = backend.call_counts["MasterControl"]
+        self.assertFalse(control.update_master_control(Volume=1.5, Speed=1.0))
+        control.get_master_control()
+        self.assertEqual(backend.call_counts["MasterControl"], calls)
+
+        self.assertTrue(control.update_master_control(Volume=1.2))
+        # 書き込みと、書き込み後の読み直し
+        self.assertEqual(backend.call_counts["MasterControl"], calls + 2)
+
+    def test_cache_is_dropped_on_refresh(self):
+        """refresh() 後はホストプログラムの値を読み直すかテスト"""
+        control, backend = create_simulated_control()
+        control.update_master_control(Volume=1.5)
+        backend.MasterControl = json.dumps({"Volume": 0.5})
+        self.assertEqual(control.get_master_control()["Volume"], 1.5)
+
+        control.refresh()
+        self.assertEqual(control.get_master_control()["Volume"], 0.5)
+        self.assertTrue(control.update_master_control(Volume=1.5))
+
+    def test_mixed_with_raw_writes(self):
+        """master_control への直接の書き込みと組み合わせても、ホストプログラムの値を基準にするかテスト"""
+        control, backend = create_simulated_control()
+        control.master_control = '{"Volume": 1.5}'
+        self.assertTrue(control.update_master_control(Speed=2.0))
+        control.master_control = '{"Pitch": 1.2}'
+
+        self.assertFalse(control.update_master_control(Volume=1.5, Speed=2.0, Pitch=1.2))
+        master = control.get_master_control()
+        self.assertEqual((master["Volume"], master["Speed"], master["Pitch"]), (1.5, 2.0, 1.2))
+        self.assertEqual(master, json.loads(backend.MasterControl))
+
+    def test_without_elision(self):
+        """elide_writes=False の場合は読み込まずに書き込むかテスト"""
+        control, backend = create_simulated_control()
+        control.elide_writes = False
+        calls = backend.call_counts.get("MasterControl", 0)
+        control.update_master_control(Volume=1.5)
+        control.update_master_control(Speed=2.0)
+        self.assertEqual(backend.call_counts["MasterControl"], calls + 2)
+        master = json.loads(backend.MasterControl)
+        self.assertEqual((master["Volume"], master["Speed"]), (1.5, 2.0))
+
+    def test_unknown_field(self):
+        """不明な項目を指定した場合に TypeError を送出するかテスト"""
+        control, _ = create_simulated_control()
+        with self.assertRaises(TypeError):
+            control.update_master_control(volume=1.5)
+
+
+class TestSyncVoicePresets(unittest.TestCase):
+    """sync_voice_presetsのテスト（シミュレーター使用）"""
+
+    def test_only_changed_presets_are_sent(self):
+        """追加・変更が必要なプリセットのみ送信し、再読込みは1回だけ行うかテスト"""
+        control, backend = create_simulated_control()
+        presets = [
+            {"PresetName": "琴葉 茜", "VoiceName": "akane_west_emo_48", "Speed": 1.0},
+            {"PresetName": "琴葉 葵", "VoiceName": "aoi_emo_48", "Speed": 1.2},
+            {"PresetName": "新しい茜", "VoiceName": "akane_west_emo_48", "Volume": 0.9},
+        ]
+
+        report = control.sync_voice_presets(presets)
+
+        self.assertEqual(report["added"], ["新しい茜"])
+        self.assertEqual(report["updated"], ["琴葉 葵"])
+        self.assertEqual(report["unchanged"], ["琴葉 茜"])
+        self.assertTrue(report["reloaded"])
+        self.assertEqual(backend.call_counts["AddVoicePreset"], 1)
+        self.assertEqual(backend.call_counts["SetVoicePreset"], 1)
+        self.assertEqual(backend.call_counts["ReloadVoicePreset"], 1)
+        self.assertEqual(control.get_voice_preset("琴葉 葵")["Speed"], 1.2)
+        # 指定しなかった値は維持される
+        self.assertEqual(control.get_voice_preset("琴葉 葵")["Pitch"], 1.0)
+
+        report = control.sync_voice_presets(presets)
+        self.assertEqual(report["unchanged"], ["琴葉 茜", "琴葉 葵", "新しい茜"])
+        self.assertFalse(report["reloaded"])
+        self.assertEqual(backend.call_counts["SetVoicePreset"], 1)
+        self.assertEqual(backend.call_counts["ReloadVoicePreset"], 1)
+
+    def test_styles_are_compared_by_name(self):
+        """スタイルが並び順ではなく名前で比較されるかテスト"""
+        control, backend = create_simulated_control()
+        preset = {
+            "PresetName": "琴葉 茜",
+            "VoiceName": "akane_west_emo_48",
+            "Styles": [{"Name": "S", "Value": 0.0}, {"Name": "J", "Value": 0.0}, {"Name": "A", "Value": 0.0}],
+        }
+        report = control.sync_voice_presets([preset])
+        self.assertEqual(report["unchanged"], ["琴葉 茜"])
+
+        preset["Styles"] = [{"Name": "A", "Value": 0.5}]
+        report = control.sync_voice_presets([preset])
+        self.assertEqual(report["updated"], ["琴葉 茜"])
+        self.assertEqual(backend.call_counts["SetVoicePreset"], 1)
+
+        preset["Styles"] = [{"Name": "X", "Value": 0.0}]
+        report = control.sync_voice_presets([preset])
+        self.assertEqual(report["updated"], ["琴葉 茜"])
+
+    def test_unspecified_styles_are_kept(self):
+        """更新時に指定しなかったスタイルや項目が維持されるかテスト"""
+        control, backend = create_simulated_control()
+        before = control.get_voice_preset("琴葉 茜")
+        preset = {"PresetName": "琴葉 茜", "Styles": [{"Name": "J", "Value": 0.5}]}
+
+        report = control.sync_voice_presets([preset])
+
+        self.assertEqual(report["updated"], ["琴葉 茜"])
+        after = json.loads(backend.GetVoicePreset("琴葉 茜"))
+        self.assertEqual(
+            {style["Name"]: style["Value"] for style in after["Styles"]},
+            {**{style["Name"]: style["Value"] for style in before["Styles"]}, "J": 0.5},
+        )
+        self.assertEqual(after["VoiceName"], before["VoiceName"])
+        self.assertEqual(after["Speed"], before["Speed"])
+
+    def test_duplicate_names(self):
+        """プリセット名の重複を拒否するかテスト"""
+        control, backend = create_simulated_control()
+        preset = {"PresetName": "琴葉 茜", "VoiceName": "akane_west_emo_48"}
+        with self.assertRaises(ValueError):
+            control.sync_voice_presets([preset, preset])
+
+    def test_load_voice_presets(self):
+        """ディレクトリ内の JSON ファイルを読み込むかテスト"""
+        from aivoice_python import load_voice_presets
+
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            with open(os.path.join(tmp_dir, "a.json"), "w", encoding="utf-8") as f:
+                f.write('{"PresetName": "A", "VoiceName": "akane_west_emo_48"}')
+            with open(os.path.join(tmp_dir, "b.json"), "w", encoding="utf-8") as f:
+                f.write('[{"PresetName": "B", "VoiceName": "aoi_emo_48"}, {"PresetName": "C", "VoiceName": "aoi_emo_48"}]')
+            with open(os.path.join(tmp_dir, "notes.txt"), "w", encoding="utf-8") as f:
+                f.write("ignored")
+            presets = load_voice_presets(tmp_dir)
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        self.assertEqual([p["PresetName"] for p in presets], ["A", "B", "C"])
+
+
+class TestGetListItems(unittest.TestCase):
+    """get_list_itemsのテスト（シミュレーター使用）"""
+
+    def test_snapshot_restores_selection(self):
+        """すべての行を取得し、選択状態を元に戻すかテスト"""
+        control, backend = create_simulated_control()
+        backend.AddListItem("琴葉 茜", "一行目")
+        backend.AddListItem("琴葉 葵", "二行目")
+        backend.AddListItem("琴葉 茜", "三行目")
+        control.set_list_selection_indices([0, 2])
+
+        items = control.get_list_items()
+
+        self.assertEqual(items, [("琴葉 茜", "一行目"), ("琴葉 葵", "二行目"), ("琴葉 茜", "三行目")])
+        self.assertEqual(items[1].voice_preset_name, "琴葉 葵")
+        self.assertEqual(control.get_list_selection_indices(), [0, 2])
+
+    def test_cache(self):
+        """結果が行を変更する呼び出しまで保持されるかテスト"""
+        control, backend = create_simulated_control()
+        control.clear_list_items()
+        control.add_list_item("琴葉 茜", "一行目")
+        self.assertEqual(control.get_list_items(), [("琴葉 茜", "一行目")])
+        self.assertNotIn("GetListSentence", backend.call_counts)
+
+        control.set_list_selection_indexes(0)
+        control.set_list_sentence("変更", False)
+        self.assertEqual(control.get_list_items(), [("琴葉 茜", "変更")])
+        calls = backend.call_counts["GetListSentence"]
+        control.get_list_items()
+        self.assertEqual(backend.call_counts["GetListSentence"], calls)
+
+        control.refresh()
+        control.get_list_items()
+        self.assertEqual(backend.call_counts["GetListSentence"], calls + 1)
+
+
 if __name__ == '__main__':
     unittest.main()
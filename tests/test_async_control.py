@@ -0,0 +1,66 @@
+"""
+Tests for AsyncAIVoiceTTsControl
+"""
+
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+
+# テスト用のパッケージパスを追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from aivoice_python import AIVoiceTTsControl, AsyncAIVoiceTTsControl, HostStatus, SimulatedTtsControl
+
+
+class TestAsyncAIVoiceTTsControl(unittest.IsolatedAsyncioTestCase):
+    """AsyncAIVoiceTTsControlのテスト（シミュレーター使用）"""
+
+    async def asyncSetUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.backend = SimulatedTtsControl(playback_scale=0.02)
+        self.control = AsyncAIVoiceTTsControl(backend=self.backend, poll_interval=0.005)
+        await self.control.open()
+
+    async def asyncTearDown(self):
+        await self.control.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    async def test_speak_waits_for_playback(self):
+        """speak() が再生完了後に戻るかテスト"""
+        await self.control.speak("こんにちは、世界。")
+        # 戻った時点で再生が終わっている
+        self.assertFalse(self.backend._is_busy())
+        self.assertEqual(self.backend.call_counts["Play"], 1)
+        self.assertEqual(await self.control.status(), HostStatus.Idle)
+
+    async def test_concurrent_saves(self):
+        """並行して呼び出した save() がすべて完了するかテスト"""
+        paths = [os.path.join(self.tmp_dir, f"{i}.wav") for i in range(5)]
+        results = await asyncio.gather(
+            *(self.control.save(f"テスト{i}", path) for i, path in enumerate(paths))
+        )
+        self.assertEqual(results, paths)
+        for path in paths:
+            self.assertTrue(os.path.isfile(path))
+
+    async def test_calls_run_on_single_thread(self):
+        """すべての呼び出しが同じワーカースレッドで実行されるかテスト"""
+        threads = await asyncio.gather(
+            *(self.control.run(lambda control: threading.get_ident()) for _ in range(5))
+        )
+        self.assertEqual(len(set(threads)), 1)
+        self.assertNotEqual(threads[0], threading.get_ident())
+
+    async def test_factory(self):
+        """factory で生成した制御クラスが使用されるかテスト"""
+        control = AsyncAIVoiceTTsControl(lambda: AIVoiceTTsControl(backend=SimulatedTtsControl()))
+        async with await control.open():
+            self.assertIn("琴葉 茜", await control.get("voice_preset_names"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,187 @@
+"""
+Tests for audio utilities
+"""
+
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import unittest
+import wave
+
+# テスト用のパッケージパスを追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from aivoice_python import read_wav
+from aivoice_python.audio import WavFormat, build_wav_header, concatenate_wavs, parse_wav_header, read_wav_format
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def write_wav(path: str, frames: bytes, sample_rate: int = 8000, channels: int = 1) -> None:
+    """テスト用の WAV ファイルを書き出します"""
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(frames)
+
+
+def write_wav_with_list_chunk(path: str, frames: bytes, list_size: int) -> None:
+    """fmt と data の間に list_size バイトの LIST チャンクを持つ WAV ファイルを書き出します"""
+    fmt = struct.pack("<HHIIHH", 1, 1, 8000, 16000, 2, 16)
+    body = (
+        b"WAVE"
+        + b"fmt " + struct.pack("<I", len(fmt)) + fmt
+        + b"LIST" + struct.pack("<I", list_size) + b"\0" * (list_size + (list_size & 1))
+        + b"data" + struct.pack("<I", len(frames)) + frames
+    )
+    with open(path, "wb") as f:
+        f.write(b"RIFF" + struct.pack("<I", len(body)) + body)
+
+
+class TestReadWav(unittest.TestCase):
+    """WAV 読み込みのテスト"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_read_wav(self):
+        """PCM データとフォーマット情報を取得できるかテスト"""
+        path = os.path.join(self.tmp_dir, "a.wav")
+        frames = struct.pack("<4h", 1, -1, 2, -2)
+        write_wav(path, frames, sample_rate=16000, channels=2)
+
+        audio = read_wav(path)
+        self.assertEqual(bytes(audio.pcm), frames)
+        self.assertEqual(audio.sample_rate, 16000)
+        self.assertEqual(audio.channels, 2)
+        self.assertEqual(audio.sample_width, 2)
+        self.assertEqual(audio.frames, 2)
+        self.assertEqual(audio.pcm.obj, audio.data)
+
+    def test_skips_extra_chunks(self):
+        """fmt と data 以外のチャンクを読み飛ばすかテスト"""
+        fmt = struct.pack("<HHIIHH", 1, 1, 8000, 16000, 2, 16)
+        data = struct.pack("<2h", 5, 6)
+        body = (
+            b"WAVE"
+            + b"fmt " + struct.pack("<I", len(fmt)) + fmt
+            + b"LIST" + struct.pack("<I", 3) + b"abc\0"
+            + b"data" + struct.pack("<I", len(data)) + data
+        )
+        wav_format = parse_wav_header(b"RIFF" + struct.pack("<I", len(body)) + body)
+        self.assertEqual(wav_format.data_size, 4)
+        self.assertEqual(wav_format.data_offset, 12 + 8 + 16 + 8 + 4 + 8)
+
+    def test_read_wav_format(self):
+        """ヘッダーのみの読み込みでフォーマットを取得できるかテスト"""
+        path = os.path.join(self.tmp_dir, "a.wav")
+        write_wav(path, b"\0" * 100)
+        wav_format = read_wav_format(path)
+        self.assertEqual(wav_format.sample_rate, 8000)
+        self.assertEqual(wav_format.data_size, 100)
+
+    def test_read_wav_format_skips_large_chunks(self):
+        """data チャンクの前に大きなチャンクがある場合もフォーマットを取得できるかテスト"""
+        path = os.path.join(self.tmp_dir, "a.wav")
+        write_wav_with_list_chunk(path, struct.pack("<2h", 5, 6), list_size=8193)
+        wav_format = read_wav_format(path)
+        self.assertEqual(wav_format.sample_rate, 8000)
+        self.assertEqual(wav_format.data_size, 4)
+        self.assertEqual(wav_format.data_offset, 12 + 8 + 16 + 8 + 8194 + 8)
+
+    def test_build_wav_header(self):
+        """作成したヘッダーを解析すると同じフォーマットになるかテスト"""
+        header = build_wav_header(WavFormat(44100, 2, 2, 44, 400), 400)
+        self.assertEqual(len(header), 44)
+        wav_format = parse_wav_header(header, len(header) + 400)
+        self.assertEqual(
+            (wav_format.sample_rate, wav_format.channels, wav_format.sample_width, wav_format.data_offset, wav_format.data_size),
+            (44100, 2, 2, 44, 400),
+        )
+
+    def test_invalid_file(self):
+        """WAV 以外のデータで例外が発生するかテスト"""
+        with self.assertRaises(ValueError):
+            parse_wav_header(b"not a wav file")
+
+    @unittest.skipIf(numpy is None, "NumPy がインストールされていません")
+    def test_to_array(self):
+        """NumPy 配列としてコピー無しで取得できるかテスト"""
+        path = os.path.join(self.tmp_dir, "a.wav")
+        write_wav(path, struct.pack("<4h", 1, -1, 2, -2), channels=2)
+        array = read_wav(path).to_array()
+        self.assertEqual(array.shape, (2, 2))
+        self.assertEqual(array.tolist(), [[1, -1], [2, -2]])
+
+
+class TestConcatenateWavs(unittest.TestCase):
+    """WAV 連結のテスト"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.output = os.path.join(self.tmp_dir, "out.wav")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _write(self, name: str, samples, **kwargs) -> str:
+        path = os.path.join(self.tmp_dir, name)
+        write_wav(path, struct.pack(f"<{len(samples)}h", *samples), **kwargs)
+        return path
+
+    def _read_samples(self, path: str):
+        with wave.open(path, "rb") as wav:
+            frames = wav.readframes(wav.getnframes())
+        return list(struct.unpack(f"<{len(frames) // 2}h", frames))
+
+    def test_concatenate(self):
+        """PCM データが順番に連結されるかテスト"""
+        a = self._write("a.wav", [1, 2, 3])
+        b = self._write("b.wav", [4, 5])
+        wav_format = concatenate_wavs([a, b], self.output)
+        self.assertEqual(self._read_samples(self.output), [1, 2, 3, 4, 5])
+        self.assertEqual(wav_format.data_size, 10)
+
+    def test_concatenate_with_metadata_chunks(self):
+        """data チャンクの前に大きなメタデータがあるファイルも連結できるかテスト"""
+        a = os.path.join(self.tmp_dir, "a.wav")
+        write_wav_with_list_chunk(a, struct.pack("<2h", 1, 2), list_size=5000)
+        b = self._write("b.wav", [3])
+        concatenate_wavs([a, b], self.output)
+        self.assertEqual(self._read_samples(self.output), [1, 2, 3])
+
+    def test_silence(self):
+        """ファイル間に無音が挿入されるかテスト"""
+        a = self._write("a.wav", [1, 2], sample_rate=1000)
+        b = self._write("b.wav", [3], sample_rate=1000)
+        c = self._write("c.wav", [4], sample_rate=1000)
+        concatenate_wavs([a, b, c], self.output, silence_ms=3)
+        self.assertEqual(self._read_samples(self.output), [1, 2, 0, 0, 0, 3, 0, 0, 0, 4])
+
+    def test_format_mismatch(self):
+        """フォーマットが異なる場合に例外が発生するかテスト"""
+        a = self._write("a.wav", [1], sample_rate=8000)
+        b = self._write("b.wav", [1], sample_rate=16000)
+        with self.assertRaises(ValueError):
+            concatenate_wavs([a, b], self.output)
+
+    @unittest.skipIf(numpy is None, "NumPy がインストールされていません")
+    def test_crossfade(self):
+        """隣り合うファイルが重なってクロスフェードされるかテスト"""
+        a = self._write("a.wav", [1000] * 4, sample_rate=1000)
+        b = self._write("b.wav", [3000] * 4, sample_rate=1000)
+        concatenate_wavs([a, b], self.output, crossfade_ms=3)
+        self.assertEqual(self._read_samples(self.output), [1000, 1000, 2000, 3000, 3000])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+"""
+Tests for the benchmark suite
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+# テスト用のパッケージパスを追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import bench_controller
+
+
+class TestBenchmarks(unittest.TestCase):
+    """ベンチマークのテスト"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def run_main(self, *args) -> int:
+        with redirect_stdout(StringIO()):
+            return bench_controller.main(["--iterations", "3", "--list-sizes", "2", *args])
+
+    def test_writes_results(self):
+        """結果が JSON ファイルに書き出されるかテスト"""
+        output = os.path.join(self.tmp_dir, "bench.json")
+        self.assertEqual(self.run_main("--output", output), 0)
+
+        with open(output, encoding="utf-8") as f:
+            report = json.load(f)
+        names = [bench_controller.result_key(r) for r in report["results"]]
+        self.assertIn("text_and_save", names)
+        self.assertIn("add_list_item[rows=2]", names)
+        self.assertIn("get_voice_preset[cache_metadata=True]", names)
+        for result in report["results"]:
+            self.assertEqual(result["iterations"], 2 if result["name"] == "add_list_item" else 3)
+
+    def test_compare_detects_more_host_calls(self):
+        """ホストプログラムの呼び出し回数の増加を回帰として検出するかテスト"""
+        result = {
+            "name": "preset_switch", "params": {}, "overhead_us": 1.0,
+            "baseline_per_iteration_us": 1.0, "host_calls_per_iteration": 1.0,
+        }
+        previous = {"results": [result]}
+        self.assertEqual(bench_controller.compare(previous, previous, 2.0), [])
+
+        current = {"results": [dict(result, host_calls_per_iteration=2.0)]}
+        self.assertEqual(len(bench_controller.compare(previous, current, 2.0)), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
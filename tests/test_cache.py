@@ -0,0 +1,143 @@
+"""
+Tests for AudioCache
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+# テスト用のパッケージパスを追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from aivoice_python import AudioCache, synthesis_key
+from tests.conftest import create_simulated_control
+
+
+class TestSynthesisKey(unittest.TestCase):
+    """synthesis_keyのテスト"""
+
+    def test_ignores_json_key_order_and_whitespace(self):
+        """JSONのキー順や余分な空白がキーに影響しないかテスト"""
+        key1 = synthesis_key(" こんにちは  世界 ", '{"Speed": 1, "Pitch": 1}', '{"Volume": 1}')
+        key2 = synthesis_key("こんにちは 世界", {"Pitch": 1, "Speed": 1}, {"Volume": 1})
+        self.assertEqual(key1, key2)
+
+    def test_depends_on_preset(self):
+        """ボイスプリセットが異なればキーも異なるかテスト"""
+        key1 = synthesis_key("テスト", {"Speed": 1}, {"Volume": 1})
+        key2 = synthesis_key("テスト", {"Speed": 2}, {"Volume": 1})
+        self.assertNotEqual(key1, key2)
+
+
+class TestAudioCache(unittest.TestCase):
+    """AudioCacheのテスト"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.tmp_dir, "cache")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _source(self, name: str, size: int) -> str:
+        path = os.path.join(self.tmp_dir, name)
+        with open(path, "wb") as f:
+            f.write(b"\0" * size)
+        return path
+
+    def test_hit_and_miss(self):
+        """ヒット数・ミス数が記録されるかテスト"""
+        cache = AudioCache(self.cache_dir)
+        self.assertIsNone(cache.get("a"))
+        cache.put("a", self._source("a.wav", 10))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_lru_eviction(self):
+        """最大サイズを超えた場合に最も古いエントリが削除されるかテスト"""
+        cache = AudioCache(self.cache_dir, max_bytes=25)
+        cache.put("a", self._source("a.wav", 10))
+        cache.put("b", self._source("b.wav", 10))
+        cache.get("a")
+        cache.put("c", self._source("c.wav", 10))
+
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertIn("c", cache)
+        self.assertEqual(cache.total_bytes, 20)
+        self.assertEqual(cache.evictions, 1)
+
+    def test_reload_existing_entries(self):
+        """既存のキャッシュディレクトリを読み込めるかテスト"""
+        AudioCache(self.cache_dir).put("a", self._source("a.wav", 10))
+        self.assertIn("a", AudioCache(self.cache_dir))
+
+    def test_copy_to(self):
+        """キャッシュファイルを複製し、存在しない場合は False を返すかテスト"""
+        cache = AudioCache(self.cache_dir)
+        destination = os.path.join(self.tmp_dir, "copy.wav")
+        self.assertFalse(cache.copy_to("a", destination))
+        cache.put("a", self._source("a.wav", 10))
+        self.assertTrue(cache.copy_to("a", destination))
+        self.assertEqual(os.path.getsize(destination), 10)
+
+        # 外部から削除された場合はミスとして扱う
+        os.remove(os.path.join(self.cache_dir, "a" + AudioCache.SUFFIX))
+        self.assertFalse(cache.copy_to("a", os.path.join(self.tmp_dir, "again.wav")))
+        self.assertNotIn("a", cache)
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 2)
+
+    def test_copy_is_not_interrupted_by_eviction(self):
+        """複製中に別のスレッドの put() がそのファイルを削除しないかテスト"""
+        cache = AudioCache(self.cache_dir, max_bytes=15)
+        cache.put("a", self._source("a.wav", 10))
+        # "a" を追い出す put() を、複製の途中で別のスレッドから開始する
+        putter = threading.Thread(target=cache.put, args=("b", self._source("b.wav", 10)))
+        copyfile = shutil.copyfile
+
+        def copy_while_putting(src, dst):
+            putter.start()
+            putter.join(0.1)
+            self.assertTrue(putter.is_alive())
+            copyfile(src, dst)
+
+        with patch("aivoice_python.cache.shutil.copyfile", copy_while_putting):
+            self.assertTrue(cache.copy_to("a", os.path.join(self.tmp_dir, "copy.wav")))
+        putter.join()
+        self.assertNotIn("a", cache)
+        self.assertEqual(os.path.getsize(os.path.join(self.tmp_dir, "copy.wav")), 10)
+
+    def test_synthesize_uses_cache(self):
+        """キャッシュヒット時にホストで合成されないかテスト"""
+        control, backend = create_simulated_control(control_options={"audio_cache": AudioCache(self.cache_dir)})
+
+        first = control.synthesize("こんにちは", os.path.join(self.tmp_dir, "1.wav"))
+        second = control.synthesize("こんにちは", os.path.join(self.tmp_dir, "2.wav"))
+
+        self.assertEqual(backend.call_counts["SaveAudioToFile"], 1)
+        with open(first, "rb") as f1, open(second, "rb") as f2:
+            self.assertEqual(f1.read(), f2.read())
+        self.assertEqual(control.audio_cache.hits, 1)
+
+    def test_synthesize_without_extension(self):
+        """ホストが拡張子を付加した場合も、保存したファイルをキャッシュして返すかテスト"""
+        control, backend = create_simulated_control(control_options={"audio_cache": AudioCache(self.cache_dir)})
+
+        first = control.synthesize("こんにちは", os.path.join(self.tmp_dir, "out"))
+        second = control.synthesize("こんにちは", os.path.join(self.tmp_dir, "again"))
+
+        self.assertEqual(first, os.path.join(self.tmp_dir, "out.wav"))
+        self.assertEqual(second, os.path.join(self.tmp_dir, "again.wav"))
+        self.assertTrue(os.path.isfile(first))
+        self.assertTrue(os.path.isfile(second))
+        self.assertEqual(backend.call_counts["SaveAudioToFile"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
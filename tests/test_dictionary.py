@@ -0,0 +1,115 @@
+"""
+Tests for DictionaryManager
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+
+# テスト用のパッケージパスを追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from aivoice_python import DictionaryManager, DictionaryType, HostStatus
+from tests.conftest import create_simulated_control
+
+
+class TestDictionaryManager(unittest.TestCase):
+    """DictionaryManagerのテスト（シミュレーター使用）"""
+
+    def setUp(self):
+        self.control, self.backend = create_simulated_control()
+
+    def test_requests_are_coalesced(self):
+        """同じ種類の再読込み要求が1回にまとめられるかテスト"""
+        events = []
+        self.control.add_event_listener(lambda event, info: events.append((event, info)))
+        edited = []
+        with DictionaryManager(self.control, window=10) as manager:
+            for i in range(5):
+                manager.edit(DictionaryType.Word, lambda i=i: edited.append(i))
+            manager.request_reload(DictionaryType.Phrase)
+            manager.request_reload(DictionaryType.Phrase)
+
+            self.assertEqual(manager.flush(), {DictionaryType.Word: 5, DictionaryType.Phrase: 2})
+            self.assertEqual(manager.flush(), {})
+
+        self.assertEqual(edited, [0, 1, 2, 3, 4])
+        self.assertEqual(self.backend.call_counts["ReloadWordDictionary"], 1)
+        self.assertEqual(self.backend.call_counts["ReloadPhraseDictionary"], 1)
+        self.assertNotIn("ReloadSymbolDictionary", self.backend.call_counts)
+        self.assertIn(("dictionary_reload", {"kind": DictionaryType.Word, "requests": 5}), events)
+        self.assertEqual(manager.stats()["reloads"], {"word": 1, "phrase": 1, "symbol": 0})
+
+    def test_reload_after_window(self):
+        """要求が途切れてから window 秒後に再読込みされるかテスト"""
+        manager = DictionaryManager(self.control, window=0.05)
+        try:
+            manager.request_reload(DictionaryType.Symbol)
+            manager.request_reload(DictionaryType.Symbol)
+            deadline = time.monotonic() + 5
+            while "ReloadSymbolDictionary" not in self.backend.call_counts and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(self.backend.call_counts.get("ReloadSymbolDictionary"), 1)
+        finally:
+            manager.close()
+
+    def test_waits_for_running_job(self):
+        """合成中は再読込みを待つかテスト"""
+        manager = DictionaryManager(self.control, window=10)
+        manager.request_reload(DictionaryType.Word)
+        with self.control.job_lock:
+            thread = threading.Thread(target=manager.flush)
+            thread.start()
+            thread.join(0.1)
+            self.assertTrue(thread.is_alive())
+            self.assertNotIn("ReloadWordDictionary", self.backend.call_counts)
+        thread.join(5)
+        self.assertEqual(self.backend.call_counts["ReloadWordDictionary"], 1)
+        manager.close()
+
+    def test_waits_for_playback(self):
+        """job_lock を保持しない再生の途中には再読込みしないかテスト"""
+        self.backend.ms_per_char = 20
+        self.control.text = "再生中の長いテキストです。"
+        self.control.play()
+        with DictionaryManager(self.control, window=10) as manager:
+            manager.request_reload(DictionaryType.Word)
+            self.assertEqual(manager.flush(), {DictionaryType.Word: 1})
+        self.assertEqual(self.control.status, HostStatus.Idle)
+
+    def test_failed_reload_is_retried(self):
+        """再読込みに失敗した要求が破棄されず、再試行されるかテスト"""
+        events = []
+        self.control.add_event_listener(lambda event, info: events.append(event))
+        manager = DictionaryManager(self.control, window=10)
+        manager.request_reload(DictionaryType.Word)
+        self.backend.Disconnect()
+
+        self.assertEqual(manager.flush(), {})
+        self.assertIn("dictionary_error", events)
+        self.assertEqual(manager.stats()["pending"], 1)
+
+        self.backend.Connect()
+        self.assertEqual(manager.flush(), {DictionaryType.Word: 1})
+        self.assertEqual(manager.stats()["pending"], 0)
+        self.assertEqual(manager.stats()["reloads"]["word"], 1)
+        manager.close()
+
+    def test_edit_errors_are_reported(self):
+        """編集の例外がイベントとして通知され、再読込みは行われるかテスト"""
+        events = []
+        self.control.add_event_listener(lambda event, info: events.append(event))
+
+        def broken():
+            raise OSError("辞書ファイルを開けません")
+
+        with DictionaryManager(self.control, window=10) as manager:
+            manager.edit(DictionaryType.Word, broken)
+        self.assertIn("dictionary_error", events)
+        self.assertEqual(self.backend.call_counts["ReloadWordDictionary"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+"""
+Tests for DurationEstimator
+"""
+
+import os
+import sys
+import unittest
+
+# テスト用のパッケージパスを追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from aivoice_python import DurationEstimator
+from aivoice_python.duration import pause_settings
+
+# 見積もりの精度を確かめるための固定の再生時間 (ミリ秒)。見積もりの計算式からは求めない
+REFERENCE_DURATIONS = [
+    ("こんにちは。", 820),
+    ("今日はいい天気ですね。", 1620),
+    ("明日の会議は、午後三時からです。", 2540),
+    ("チョコレートを買ってきてください。", 1790),
+    ("東京、大阪、名古屋。", 1930),
+    ("ありがとうございました！", 1380),
+]
+
+
+class TestDurationEstimator(unittest.TestCase):
+    """DurationEstimatorのテスト"""
+
+    def test_count_mora(self):
+        """小書きの仮名を前の文字と合わせて数えるかテスト"""
+        estimator = DurationEstimator()
+        self.assertEqual(estimator.count_mora("きょう"), 2)
+        self.assertEqual(estimator.count_mora("チョコレート"), 5)
+        self.assertEqual(estimator.count_mora("がっこう"), 4)
+        self.assertEqual(estimator.count_mora("天気"), 4)
+        self.assertEqual(estimator.count_mora("、。"), 0)
+
+    def test_estimate_uses_speed_and_pauses(self):
+        """話速とポーズの長さが見積もりに反映されるかテスト"""
+        estimator = DurationEstimator(ms_per_mora=100)
+        self.assertEqual(estimator.estimate("あいう、えお。"), 1020)
+        self.assertEqual(estimator.estimate("あいう、えお。", speed=2.0, middle_pause=100, long_pause=200), 550)
+
+    def test_observe_calibrates(self):
+        """実測値で1モーラあたりの時間が補正されるかテスト"""
+        estimator = DurationEstimator(ms_per_mora=100)
+        estimator.observe("あいうえお。", 770)
+        estimator.observe("かきくけこさしすせそ。", 1170)
+        self.assertEqual(estimator.samples, 2)
+        self.assertAlmostEqual(estimator.ms_per_mora, 80)
+
+        estimator.observe("あいうえお", 200, speed=2.0)
+        self.assertAlmostEqual(estimator.ms_per_mora, 80)
+
+        estimator.reset()
+        self.assertEqual(estimator.ms_per_mora, 100)
+
+    def test_calibrated_estimates_match_reference(self):
+        """補正後の見積もりが固定の再生時間に近いかテスト"""
+        estimator = DurationEstimator()
+        for text, play_time in REFERENCE_DURATIONS[:3]:
+            estimator.observe(text, play_time)
+        self.assertAlmostEqual(estimator.ms_per_mora, 91.05, places=2)
+
+        for text, play_time in REFERENCE_DURATIONS[3:]:
+            self.assertLess(abs(estimator.estimate(text) - play_time), play_time * 0.05, text)
+
+    def test_pause_settings(self):
+        """ボイスプリセットとマスターコントロールから設定を求めるかテスト"""
+        speed, middle, long = pause_settings(
+            {"Speed": 1.5, "MiddlePause": 300, "LongPause": 370},
+            '{"Speed": 2.0, "MiddlePause": 75, "LongPause": 740}',
+        )
+        self.assertEqual(speed, 3.0)
+        self.assertEqual(middle, 150)
+        self.assertEqual(long, 740)
+
+
+if __name__ == '__main__':
+    unittest.main()
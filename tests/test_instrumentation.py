@@ -0,0 +1,109 @@
+"""
+Tests for Instrumentation
+"""
+
+import os
+import sys
+import unittest
+from contextlib import contextmanager
+from unittest.mock import patch
+
+# テスト用のパッケージパスを追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from aivoice_python import AIVoiceTTsControl, Instrumentation, SimulatedTtsControl
+from tests.conftest import create_simulated_control
+
+
+class TestInstrumentation(unittest.TestCase):
+    """Instrumentationのテスト（シミュレーター使用）"""
+
+    def setUp(self):
+        self.instrumentation = Instrumentation()
+        self.control, _ = create_simulated_control(control_options={"instrumentation": self.instrumentation})
+
+    def test_counts_calls(self):
+        """メソッド・プロパティ毎に呼び出し回数が記録されるかテスト"""
+        self.control.text = "テスト"
+        self.control.text = "テスト2"
+        self.control.status
+
+        snapshot = self.instrumentation.snapshot()
+        self.assertEqual(snapshot["set_Text"]["count"], 2)
+        self.assertEqual(snapshot["get_Status"]["count"], 1)
+        self.assertEqual(snapshot["Connect"]["count"], 1)
+        self.assertEqual(snapshot["Connect"]["errors"], 0)
+
+    def test_counts_errors(self):
+        """例外が発生した呼び出しがエラーとして記録されるかテスト"""
+        with self.assertRaises(RuntimeError):
+            self.control.get_voice_preset("存在しない")
+        self.assertEqual(self.instrumentation.snapshot()["GetVoicePreset"]["errors"], 1)
+
+    def test_hooks_and_spans(self):
+        """フックとスパンが呼び出されるかテスト"""
+        calls = []
+        spans = []
+
+        @contextmanager
+        def span(name):
+            spans.append(("start", name))
+            yield
+            spans.append(("end", name))
+
+        self.instrumentation.add_hook(lambda name, elapsed, error: calls.append((name, error)))
+        self.instrumentation.add_span_factory(span)
+        self.control.play()
+
+        self.assertEqual(calls, [("Play", None)])
+        self.assertEqual(spans, [("start", "Play"), ("end", "Play")])
+
+    def test_failing_hooks_and_spans_do_not_affect_calls(self):
+        """フックやスパンの例外が呼び出しの結果や例外を変えないかテスト"""
+
+        def hook(name, elapsed, error):
+            raise ValueError("hook boom")
+
+        @contextmanager
+        def span(name):
+            yield
+            raise ValueError("span boom")
+
+        def broken_factory(name):
+            raise ValueError("factory boom")
+
+        self.instrumentation.add_hook(hook)
+        self.instrumentation.add_span_factory(span)
+        self.instrumentation.add_span_factory(broken_factory)
+        with patch("builtins.print") as warn:
+            self.control.text = "abc"
+            self.assertEqual(self.control.tts_control.Text, "abc")
+            with self.assertRaises(RuntimeError):
+                self.control.get_voice_preset("存在しない")
+
+        self.assertTrue(warn.called)
+        self.assertEqual(self.instrumentation.snapshot()["set_Text"]["count"], 1)
+        self.assertEqual(self.instrumentation.snapshot()["GetVoicePreset"]["errors"], 1)
+
+    def test_render_prometheus(self):
+        """Prometheus のテキスト形式で出力できるかテスト"""
+        self.control.text = "テスト"
+        text = self.instrumentation.render_prometheus()
+        self.assertIn('aivoice_host_calls_total{method="set_Text"} 1', text)
+        self.assertIn('aivoice_host_call_duration_seconds_bucket{method="set_Text",le="+Inf"} 1', text)
+        self.assertIn('aivoice_host_call_duration_seconds_count{method="set_Text"} 1', text)
+        self.assertTrue(text.endswith("\n"))
+
+    def test_events_are_counted(self):
+        """再接続などのイベントが記録されるかテスト"""
+        self.control._emit("reconnect")
+        self.assertIn('aivoice_events_total{event="reconnect"} 1', self.instrumentation.render_prometheus())
+
+    def test_disabled_by_default(self):
+        """指定しない場合はラッパーを挟まないかテスト"""
+        backend = SimulatedTtsControl()
+        self.assertIs(AIVoiceTTsControl(backend=backend).tts_control, backend)
+
+
+if __name__ == '__main__':
+    unittest.main()
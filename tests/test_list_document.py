@@ -0,0 +1,136 @@
+"""
+Tests for ListDocument
+"""
+
+import os
+import random
+import sys
+import unittest
+
+# テスト用のパッケージパスを追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from aivoice_python import ListDocument, ListItem
+from aivoice_python.list_document import list_edit_script
+from tests.conftest import create_simulated_control
+
+AKANE = "琴葉 茜"
+AOI = "琴葉 葵"
+
+
+class TestListDocument(unittest.TestCase):
+    """ListDocumentのテスト（シミュレーター使用）"""
+
+    def setUp(self):
+        self.control, self.backend = create_simulated_control()
+
+    def host_rows(self):
+        return [ListItem(*row) for row in self.backend._list_rows]
+
+    def test_initial_sync_appends_rows(self):
+        """空のリストへの同期で行が末尾に追加されるかテスト"""
+        document = ListDocument(self.control)
+        document.items = [(AKANE, "一行目"), (AOI, "二行目")]
+        report = document.sync()
+
+        self.assertEqual(self.host_rows(), document.items)
+        self.assertEqual(report["inserted"], 2)
+        self.assertEqual(report["calls"], 2)
+
+    def test_small_change_in_large_script(self):
+        """大きな台本の一部の変更が少ない呼び出しで反映されるかテスト"""
+        document = ListDocument(self.control)
+        document.items = [(AKANE if i % 2 else AOI, f"セリフ{i}") for i in range(1000)]
+        document.sync()
+        self.backend.call_counts.clear()
+
+        document.items[10] = ListItem(AOI, "書き換えたセリフ")
+        document.items[500] = ListItem(AKANE, document.items[500].sentence)
+        del document.items[700]
+        document.items.insert(900, ListItem(AKANE, "追加したセリフ"))
+        report = document.sync()
+
+        self.assertEqual(self.host_rows(), document.items)
+        self.assertLessEqual(report["calls"], 10)
+        self.assertEqual(report["calls"], sum(self.backend.call_counts.values()))
+        self.assertNotIn("ClearListItems", self.backend.call_counts)
+        self.assertEqual(self.backend.call_counts["SetListSentence"], 1)
+
+    def test_rows_are_updated_one_at_a_time(self):
+        """複数行の選択に依存せず1行ずつ変更するかテスト"""
+        document = ListDocument(self.control)
+        document.items = [(AKANE, f"セリフ{i}") for i in range(10)]
+        document.sync()
+        self.backend.call_counts.clear()
+
+        for i in (1, 4, 7):
+            document.items[i] = ListItem(AOI, document.items[i].sentence)
+        report = document.sync()
+
+        self.assertEqual(self.host_rows(), document.items)
+        self.assertEqual(report["voice_presets"], 3)
+        self.assertEqual(self.backend.call_counts["SetListVoicePreset"], 3)
+        self.assertEqual(self.backend.call_counts["SetListSelectionRange"], 3)
+
+    def test_selection_is_restored(self):
+        """同期後に元の選択行が (行の追加・削除後の位置で) 選択し直されるかテスト"""
+        document = ListDocument(self.control)
+        document.items = [(AKANE, f"セリフ{i}") for i in range(10)]
+        document.sync()
+        self.control.set_list_selection_indices([2, 5, 8])
+        self.backend.call_counts.clear()
+
+        document.items[0] = ListItem(AOI, "変更")
+        del document.items[5]
+        document.items.insert(1, ListItem(AKANE, "追加"))
+        report = document.sync()
+
+        self.assertEqual(report["calls"], sum(self.backend.call_counts.values()))
+        self.assertEqual(self.host_rows(), document.items)
+        self.assertEqual(self.control.get_list_selection_indices(), [3, 8])
+
+    def test_random_edits(self):
+        """ランダムな編集の後も手元とホストの内容が一致するかテスト"""
+        rng = random.Random(0)
+        document = ListDocument(self.control)
+        document.items = [(rng.choice([AKANE, AOI]), f"セリフ{i}") for i in range(50)]
+        document.sync()
+        for _ in range(20):
+            for _ in range(rng.randint(1, 5)):
+                action = rng.choice(["insert", "delete", "sentence", "preset"])
+                if action == "insert" or not document.items:
+                    index = rng.randint(0, len(document.items))
+                    document.items.insert(index, ListItem(AKANE, f"追加{rng.random()}"))
+                elif action == "delete":
+                    del document.items[rng.randrange(len(document.items))]
+                elif action == "sentence":
+                    index = rng.randrange(len(document.items))
+                    document.items[index] = document.items[index]._replace(sentence=f"変更{rng.random()}")
+                else:
+                    index = rng.randrange(len(document.items))
+                    document.items[index] = document.items[index]._replace(voice_preset_name=rng.choice([AKANE, AOI]))
+            document.sync()
+            self.assertEqual(self.host_rows(), document.items)
+
+    def test_pull(self):
+        """ホストプログラムの行を読み込めるかテスト"""
+        self.control.add_list_item(AKANE, "一行目")
+        self.control.add_list_item(AOI, "二行目")
+        document = ListDocument(self.control)
+        document.pull()
+        self.assertEqual(document.items, [ListItem(AKANE, "一行目"), ListItem(AOI, "二行目")])
+        self.assertEqual(document.diff(), [])
+
+    def test_edit_script(self):
+        """操作の一覧が求められるかテスト"""
+        old = [ListItem(AKANE, "a"), ListItem(AKANE, "b"), ListItem(AKANE, "c")]
+        new = [ListItem(AKANE, "a"), ListItem(AKANE, "B"), ListItem(AKANE, "c"), ListItem(AOI, "d")]
+        self.assertEqual(
+            list_edit_script(old, new),
+            [("insert", 3, ListItem(AOI, "d")), ("sentence", 1, "B")],
+        )
+        self.assertEqual(list_edit_script(old, old), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+"""
+Tests for TextNormalizer
+"""
+
+import os
+import sys
+import unittest
+
+# テスト用のパッケージパスを追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from aivoice_python import TextNormalizer, normalize_text
+from aivoice_python.normalize import read_number
+
+
+class TestReadNumber(unittest.TestCase):
+    """read_numberのテスト"""
+
+    def test_integers(self):
+        """整数を漢数字の読みに変換するかテスト"""
+        self.assertEqual(read_number("0"), "零")
+        self.assertEqual(read_number("10"), "十")
+        self.assertEqual(read_number("123"), "百二十三")
+        self.assertEqual(read_number("1,234"), "千二百三十四")
+        self.assertEqual(read_number("20001"), "二万一")
+        self.assertEqual(read_number("110000001"), "一億千万一")
+
+    def test_fraction_and_leading_zero(self):
+        """小数と先頭が 0 の数字を1桁ずつ読むかテスト"""
+        self.assertEqual(read_number("3.14"), "三点一四")
+        self.assertEqual(read_number("007"), "〇〇七")
+
+
+class TestTextNormalizer(unittest.TestCase):
+    """TextNormalizerのテスト"""
+
+    def test_nfkc_and_whitespace(self):
+        """全角英数字・半角カナ・空白が統一されるかテスト"""
+        normalize = TextNormalizer()
+        self.assertEqual(normalize("ＡＢＣ　　１２３"), "ABC 123")
+        self.assertEqual(normalize("ｶﾀｶﾅ"), "カタカナ")
+        self.assertEqual(normalize("  あ\n\tい  "), "あ い")
+
+    def test_symbols_and_punctuation(self):
+        """記号の置き換えと連続する句読点の短縮をテスト"""
+        normalize = TextNormalizer()
+        self.assertEqual(normalize("えっ...本当～"), "えっ…本当〜")
+        self.assertEqual(normalize("すごい！！！本当？？"), "すごい!本当?")
+        self.assertEqual(normalize("ねえーー"), "ねえーー")
+        self.assertEqual(TextNormalizer(symbols={}, collapse_punctuation=False)("あ...!!"), "あ...!!")
+
+    def test_apostrophe_is_kept(self):
+        """英語の短縮形のアポストロフィが括弧に置き換えられないかテスト"""
+        normalize = TextNormalizer()
+        self.assertEqual(normalize("It’s fine"), "It’s fine")
+        self.assertEqual(normalize("“It’s”"), "「It’s」")
+
+    def test_read_numbers(self):
+        """数字と単位を読みに変換するかテスト"""
+        normalize = TextNormalizer(read_numbers=True)
+        self.assertEqual(normalize("１２３％です"), "百二十三パーセントです")
+        self.assertEqual(normalize("価格は1,500円"), "価格は千五百円")
+        self.assertEqual(TextNormalizer()("123%"), "123%")
+
+    def test_cache(self):
+        """同じテキストの2回目以降はキャッシュから返すかテスト"""
+        normalize = TextNormalizer(cache_size=1)
+        normalize("あ")
+        normalize("あ")
+        self.assertEqual(normalize.cache_info().hits, 1)
+        normalize("い")
+        normalize("あ")
+        self.assertEqual(normalize.cache_info().misses, 3)
+        normalize.cache_clear()
+        self.assertEqual(normalize.cache_info().currsize, 0)
+
+    def test_normalize_text(self):
+        """既定の設定で正規化するかテスト"""
+        self.assertEqual(normalize_text("ｶﾀｶﾅ！！"), "カタカナ!")
+
+
+if __name__ == '__main__':
+    unittest.main()
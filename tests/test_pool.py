@@ -0,0 +1,151 @@
+"""
+Tests for ControllerPool
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# テスト用のパッケージパスを追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from aivoice_python import ControllerPool
+from tests.conftest import create_simulated_control
+
+
+HOST_NAMES = ["host-a", "host-b"]
+
+
+class TestControllerPool(unittest.TestCase):
+    """ControllerPoolのテスト（シミュレーター使用）"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        # ホスト毎に別のシミュレーターに接続する
+        self.factory = lambda host_name: create_simulated_control(host_name, synthesis_cost=0.001)[0]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_jobs_are_spread_across_hosts(self):
+        """ジョブが複数のホストに振り分けられるかテスト"""
+        with ControllerPool(HOST_NAMES, factory=self.factory) as pool:
+            futures = [
+                pool.synthesize(f"テスト{i}", os.path.join(self.tmp_dir, f"{i}.wav"))
+                for i in range(10)
+            ]
+            for future in futures:
+                self.assertTrue(os.path.isfile(future.result()))
+
+            stats = pool.stats()
+            self.assertEqual([s["host_name"] for s in stats], HOST_NAMES)
+            self.assertEqual(sum(s["jobs"] for s in stats), 10)
+            for s in stats:
+                self.assertGreater(s["jobs"], 0)
+                self.assertEqual(s["pending"], 0)
+
+    def test_errors_are_counted(self):
+        """ジョブの例外が伝播し、エラー数が記録されるかテスト"""
+        with ControllerPool(["host-a"], factory=self.factory) as pool:
+            future = pool.submit(lambda control: control.get_voice_preset("存在しない"))
+            with self.assertRaises(RuntimeError):
+                future.result()
+            self.assertEqual(pool.stats()[0]["errors"], 1)
+
+    def test_one_worker_per_host(self):
+        """ホスト毎にワーカーを1つだけ作成するかテスト"""
+        with ControllerPool(HOST_NAMES, factory=self.factory) as pool:
+            self.assertEqual(len(pool), 2)
+
+    def test_identical_jobs_are_coalesced(self):
+        """実行中のジョブと同じ内容のジョブが合成結果を共有するかテスト"""
+        with ControllerPool(["host-a"], factory=self.factory) as pool:
+            # 接続とマスターコントロールの確認を待つ
+            pool.submit(lambda control: None).result()
+            paths = [os.path.join(self.tmp_dir, f"{i}.wav") for i in range(5)]
+            futures = [pool.synthesize("速報です。", path, voice_preset_name="琴葉 茜") for path in paths]
+            other = pool.synthesize("別の文です。", os.path.join(self.tmp_dir, "other.wav"), voice_preset_name="琴葉 茜")
+
+            self.assertEqual([f.result() for f in futures], paths)
+            other.result()
+            with open(paths[0], "rb") as f:
+                first = f.read()
+            for path in paths[1:]:
+                with open(path, "rb") as f:
+                    self.assertEqual(f.read(), first)
+            self.assertEqual(pool.coalescing_stats()["executions"], 2)
+            self.assertEqual(pool.coalescing_stats()["coalesced"], 4)
+            self.assertEqual(pool.stats()[0]["jobs"], 3)
+
+    def test_unresolved_jobs_are_not_coalesced(self):
+        """ボイスプリセットやマスターコントロールがホストにより異なり得る場合は共有しないかテスト"""
+        with ControllerPool(HOST_NAMES, factory=self.factory) as pool:
+            for future in [pool.submit(lambda control: None) for _ in HOST_NAMES]:
+                future.result()
+            futures = [pool.synthesize("速報です。", os.path.join(self.tmp_dir, f"{i}.wav")) for i in range(3)]
+            for future in futures:
+                future.result()
+            self.assertEqual(pool.coalescing_stats()["executions"], 0)
+
+            def set_volume(control):
+                control.master_control = '{"Volume": 1.5}'
+
+            pool.submit(set_volume).result()
+            futures = [
+                pool.synthesize("速報です。", os.path.join(self.tmp_dir, f"preset{i}.wav"), voice_preset_name="琴葉 茜")
+                for i in range(3)
+            ]
+            for future in futures:
+                future.result()
+            self.assertEqual(pool.coalescing_stats()["executions"], 0)
+
+    def test_presets_that_differ_between_hosts_are_not_coalesced(self):
+        """同じ名前のボイスプリセットの内容がホストにより異なる場合は共有しないかテスト"""
+
+        def factory(host_name):
+            control = self.factory(host_name)
+            if host_name == "host-b":
+                control.set_voice_preset({**control.get_voice_preset("琴葉 茜"), "Speed": 1.5})
+            return control
+
+        for host_factory, shared in ((self.factory, 3), (factory, 0)):
+            with ControllerPool(HOST_NAMES, factory=host_factory) as pool:
+                for future in [pool.submit(lambda control: None) for _ in HOST_NAMES]:
+                    future.result()
+                futures = [
+                    pool.synthesize("速報です。", os.path.join(self.tmp_dir, f"{i}.wav"), voice_preset_name="琴葉 茜")
+                    for i in range(3)
+                ]
+                for future in futures:
+                    future.result()
+                stats = pool.coalescing_stats()
+                self.assertEqual(stats["executions"] + stats["coalesced"], shared)
+
+    def test_coalesced_jobs_append_extension(self):
+        """合成結果を共有するジョブでも、共有しない場合と同じく拡張子が付加されるかテスト"""
+        with ControllerPool(["host-a"], factory=self.factory) as pool:
+            pool.submit(lambda control: None).result()
+            single = pool.synthesize("速報です。", os.path.join(self.tmp_dir, "a")).result()
+            shared = pool.synthesize("速報です。", os.path.join(self.tmp_dir, "b"), voice_preset_name="琴葉 茜").result()
+            self.assertEqual(pool.coalescing_stats()["executions"], 1)
+        self.assertEqual([single, shared], [os.path.join(self.tmp_dir, name) for name in ("a.wav", "b.wav")])
+        self.assertEqual(sorted(os.listdir(self.tmp_dir)), ["a.wav", "b.wav"])
+
+    def test_coalesce_disabled(self):
+        """coalesce=False の場合はジョブ毎に合成するかテスト"""
+        with ControllerPool(["host-a"], factory=self.factory, coalesce=False) as pool:
+            futures = [pool.synthesize("速報です。", os.path.join(self.tmp_dir, f"{i}.wav")) for i in range(3)]
+            for future in futures:
+                self.assertTrue(os.path.isfile(future.result()))
+            self.assertEqual(pool.stats()[0]["jobs"], 3)
+
+    def test_factory_requires_host_names(self):
+        """factory のみを指定した場合に例外が発生するかテスト"""
+        with self.assertRaises(ValueError):
+            ControllerPool(factory=self.factory)
+
+
+if __name__ == '__main__':
+    unittest.main()
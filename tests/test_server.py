@@ -0,0 +1,137 @@
+"""
+Tests for the synthesis daemon and its client
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+
+# テスト用のパッケージパスを追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from aivoice_python import AIVoiceClient, AIVoiceClientError, SimulatedTtsControl, TextEditMode
+from aivoice_python.server import SynthesisService, TCPServer, connect_default
+
+
+class TestSynthesisServer(unittest.TestCase):
+    """合成デーモンのテスト（シミュレーター使用）"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        backend = SimulatedTtsControl(playback_scale=0.01)
+        self.service = SynthesisService(lambda: connect_default(backend=backend), self.tmp_dir)
+        self.server = TCPServer(("127.0.0.1", 0), self.service)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.client = AIVoiceClient(self.server.server_address[:2], timeout=5)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.shutdown()
+        self.server.server_close()
+        self.service.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_metadata(self):
+        """ステータスやプリセット名を取得できるかテスト"""
+        self.assertEqual(self.client.ping(), "pong")
+        self.assertEqual(self.client.status(), "Idle")
+        self.assertIn("琴葉 茜", self.client.voice_preset_names())
+        self.assertEqual(self.client.get_voice_preset("琴葉 茜")["VoiceName"], "akane_west_emo_48")
+
+    def test_save(self):
+        """音声ファイルのパスとバイト列を取得できるかテスト"""
+        path = self.client.save("こんにちは", voice_preset_name="琴葉 葵")
+        self.assertTrue(os.path.isfile(path))
+
+        data = self.client.synthesize_bytes("こんにちは")
+        self.assertEqual(data[:4], b"RIFF")
+        self.assertEqual(os.listdir(self.tmp_dir), [os.path.basename(path)])
+
+    def test_save_path_is_under_output_dir(self):
+        """保存先が output_dir 以下に限られるかテスト"""
+        path = self.client.save("こんにちは", path="greeting.wav", voice_preset_name="琴葉 葵")
+        self.assertEqual(path, os.path.join(os.path.realpath(self.tmp_dir), "greeting.wav"))
+        self.assertTrue(os.path.isfile(path))
+
+        outside = os.path.join(tempfile.gettempdir(), "outside.wav")
+        for bad_path in (outside, "../outside.wav", "sub/../../outside.wav"):
+            for voice_preset_name in (None, "琴葉 葵"):
+                with self.assertRaises(AIVoiceClientError):
+                    self.client.save("こんにちは", path=bad_path, voice_preset_name=voice_preset_name)
+        self.assertFalse(os.path.exists(outside))
+
+    def test_speak(self):
+        """読み上げが完了するかテスト"""
+        self.assertTrue(self.client.speak("テスト"))
+
+    def test_speak_switches_to_text_mode(self):
+        """リストモードのホストでもテキストモードで読み上げるかテスト"""
+        control = self.service._control_future.result()
+        self.service._run(lambda control, request: setattr(control, "text_edit_mode", TextEditMode.List), {})
+        self.assertTrue(self.client.speak("テスト"))
+        self.assertEqual(control.text_edit_mode, TextEditMode.Text)
+
+    def test_concurrent_saves_are_coalesced(self):
+        """同時に受け付けた同じ内容の save が合成結果を共有するかテスト"""
+        clients = [AIVoiceClient(self.server.server_address[:2], timeout=5) for _ in range(4)]
+        results = [None] * len(clients)
+
+        def save(index):
+            results[index] = clients[index].synthesize_bytes("同じ文章です。" * 20, voice_preset_name="琴葉 茜")
+
+        threads = [threading.Thread(target=save, args=(i,)) for i in range(len(clients))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for client in clients:
+            client.close()
+
+        self.assertTrue(all(r == results[0] and r[:4] == b"RIFF" for r in results))
+        stats = self.client.stats()
+        self.assertEqual(stats["executions"] + stats["coalesced"], len(clients))
+
+    def test_saves_without_preset_are_not_coalesced(self):
+        """ボイスプリセットを指定しない save は合成結果を共有しないかテスト"""
+        self.client.synthesize_bytes("こんにちは")
+        self.client.save("こんにちは", voice_preset_name="琴葉 茜")
+        self.assertEqual(self.client.stats()["executions"], 1)
+
+    def test_unobserved_presets_are_not_coalesced(self):
+        """各値を確認していないボイスプリセットの save は、確認するまで合成結果を共有しないかテスト"""
+        self.client.save("こんにちは", voice_preset_name="琴葉 葵")
+        self.assertEqual(self.client.stats()["executions"], 0)
+        self.client.save("こんにちは", voice_preset_name="琴葉 葵")
+        self.assertEqual(self.client.stats()["executions"], 1)
+
+    def test_coalesced_save_appends_extension(self):
+        """合成結果を共有する save でも、共有しない場合と同じく拡張子が付加されるかテスト"""
+        shared = self.client.save("こんにちは", path="shared", voice_preset_name="琴葉 茜")
+        self.assertEqual(self.client.stats()["executions"], 1)
+
+        service = SynthesisService(lambda: connect_default(backend=SimulatedTtsControl()), self.tmp_dir, coalesce=False)
+        try:
+            response = service.handle({"op": "save", "text": "こんにちは", "path": "single", "voice_preset_name": "琴葉 茜"})
+        finally:
+            service.close()
+        self.assertTrue(response["ok"])
+        self.assertEqual(
+            [os.path.basename(shared), os.path.basename(response["result"])], ["shared.wav", "single.wav"]
+        )
+        self.assertEqual(sorted(os.listdir(self.tmp_dir)), ["shared.wav", "single.wav"])
+
+    def test_errors(self):
+        """ホストのエラーが伝播するかテスト"""
+        with self.assertRaises(AIVoiceClientError):
+            self.client.get_voice_preset("存在しない")
+        with self.assertRaises(AIVoiceClientError):
+            self.client.request("unknown")
+        self.assertEqual(self.client.ping(), "pong")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+"""
+Tests for SimulatedTtsControl
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+import wave
+
+# テスト用のパッケージパスを追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from aivoice_python import AIVoiceTTsControl, HostStatus, SimulatedTtsControl, TextEditMode
+from tests.conftest import FakeClock, create_simulated_control
+
+
+class TestSimulatedTtsControl(unittest.TestCase):
+    """SimulatedTtsControlのテスト"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_status_transitions(self):
+        """ホストステータスが遷移するかテスト"""
+        control = AIVoiceTTsControl(backend=SimulatedTtsControl(host_running=False))
+        self.assertEqual(control.status, HostStatus.NotRunning)
+
+        control.initialize(control.get_available_host_names()[0])
+        control.start_host()
+        self.assertEqual(control.status, HostStatus.NotConnected)
+
+        control.connect()
+        self.assertEqual(control.status, HostStatus.Idle)
+
+        control.disconnect()
+        self.assertEqual(control.status, HostStatus.NotConnected)
+
+    def test_play_is_busy_until_finished(self):
+        """再生中はBusyになり、再生時間経過後にIdleへ戻るかテスト"""
+        clock = FakeClock().install(self)
+        control, _ = create_simulated_control(playback_scale=0.05)
+        control.text = "こんにちは"
+        play_time = control.get_play_time()
+        control.play()
+        self.assertEqual(control.status, HostStatus.Busy)
+
+        clock.sleep(play_time * 0.05 / 1000 * 0.9)
+        self.assertEqual(control.status, HostStatus.Busy)
+        clock.sleep(play_time * 0.05 / 1000 * 0.1)
+        self.assertEqual(control.status, HostStatus.Idle)
+
+    def test_requires_connection(self):
+        """未接続状態でAPIを呼び出すと例外が発生するかテスト"""
+        control = AIVoiceTTsControl(backend=SimulatedTtsControl())
+        with self.assertRaises(RuntimeError):
+            control.text = "テスト"
+
+    def test_save_audio_to_file_writes_wav(self):
+        """SaveAudioToFileで再生時間に応じたWAVが書き出されるかテスト"""
+        control, _ = create_simulated_control(sample_rate=8000)
+        control.text = "こんにちは、世界。"
+        play_time = control.get_play_time()
+
+        path = os.path.join(self.tmp_dir, "output.wav")
+        control.save_audio_to_file(path)
+
+        with wave.open(path, "rb") as wav:
+            self.assertEqual(wav.getframerate(), 8000)
+            self.assertEqual(wav.getnchannels(), 1)
+            self.assertEqual(wav.getsampwidth(), 2)
+            self.assertEqual(wav.getnframes(), int(8000 * play_time / 1000))
+
+    def test_voice_presets(self):
+        """ボイスプリセットの追加・更新ができるかテスト"""
+        control, _ = create_simulated_control()
+        control.add_voice_preset({"PresetName": "テスト", "VoiceName": "akane_west_emo_48"})
+        self.assertIn("テスト", control.voice_preset_names)
+
+        control.set_voice_preset({"PresetName": "テスト", "VoiceName": "akane_west_emo_48", "Speed": 2.0})
+        preset = control.get_voice_preset("テスト")
+        self.assertEqual(preset["Speed"], 2.0)
+        self.assertEqual(preset["LongPause"], 370)
+
+    def test_list_items(self):
+        """リスト形式の行操作ができるかテスト"""
+        control, _ = create_simulated_control()
+        control.text_edit_mode = TextEditMode.List
+        control.add_list_item("琴葉 茜", "一行目")
+        control.add_list_item("琴葉 葵", "二行目")
+        self.assertEqual(control.get_list_count(), 2)
+
+        control.set_list_selection_range(1, 1)
+        self.assertEqual(control.get_list_voice_preset(), "琴葉 葵")
+        self.assertEqual(control.get_list_sentence(1), "二行目")
+
+        control.clear_list_items()
+        self.assertEqual(control.get_list_count(), 0)
+
+    def test_call_latency(self):
+        """API呼び出し毎の遅延が適用されるかテスト"""
+        clock = FakeClock().install(self)
+        control, _ = create_simulated_control(call_latency=0.01)
+        clock.sleeps.clear()
+        for _ in range(5):
+            control.status
+        self.assertEqual(clock.sleeps, [0.01] * 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+"""
+Tests for SingleFlight
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import os
+import sys
+import threading
+import unittest
+
+# テスト用のパッケージパスを追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from aivoice_python import SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+    """SingleFlightのテスト"""
+
+    def test_concurrent_calls_share_result(self):
+        """実行中の同じキーの呼び出しが結果を共有するかテスト"""
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def work():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return "result"
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            leader = executor.submit(flight.do, "key", work)
+            started.wait(5)
+            followers = [executor.submit(flight.do, "key", work) for _ in range(3)]
+            while flight.waiters("key") < 4:
+                pass
+            release.set()
+            results = [leader.result()] + [f.result() for f in followers]
+
+        self.assertEqual(results, ["result"] * 4)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(flight.stats(), {"executions": 1, "coalesced": 3, "in_flight": 0})
+
+        # 完了後の呼び出しは新たに実行される
+        flight.do("key", work)
+        self.assertEqual(len(calls), 2)
+
+    def test_errors_are_propagated(self):
+        """例外が共有した呼び出し元すべてに伝播するかテスト"""
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+
+        def work():
+            started.set()
+            release.wait(5)
+            raise RuntimeError("failed")
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(flight.do, "key", work)
+            started.wait(5)
+            follower = executor.submit(flight.do, "key", work)
+            while flight.waiters("key") < 2:
+                pass
+            release.set()
+            for future in (leader, follower):
+                with self.assertRaises(RuntimeError):
+                    future.result()
+        self.assertEqual(flight.stats()["in_flight"], 0)
+
+    def test_submit_shares_future(self):
+        """submit() が実行中の Future を共有するかテスト"""
+        flight = SingleFlight()
+        release = threading.Event()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            first = flight.submit("key", lambda: executor.submit(release.wait, 5))
+            second = flight.submit("key", lambda: executor.submit(release.wait, 5))
+            other = flight.submit("other", lambda: executor.submit(lambda: "other"))
+            self.assertIs(first, second)
+            release.set()
+            self.assertTrue(first.result())
+            self.assertEqual(other.result(), "other")
+        self.assertEqual(flight.stats(), {"executions": 2, "coalesced": 1, "in_flight": 0})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+"""
+Tests for text utilities
+"""
+
+import os
+import sys
+import unittest
+
+# テスト用のパッケージパスを追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from aivoice_python.text import split_sentences
+
+
+class TestSplitSentences(unittest.TestCase):
+    """split_sentencesのテスト"""
+
+    def test_sentence_boundaries(self):
+        """文末記号と改行で分割されるかテスト"""
+        self.assertEqual(
+            split_sentences("こんにちは。今日は「いい天気」ですね！\nHello world. Bye"),
+            ["こんにちは。", "今日は「いい天気」ですね！", "Hello world.", "Bye"],
+        )
+
+    def test_long_sentence_is_split_at_pauses(self):
+        """長い文が読点で分割されるかテスト"""
+        self.assertEqual(
+            split_sentences("あああ、いいい、ううう。", max_chars=8),
+            ["あああ、いいい、", "ううう。"],
+        )
+
+    def test_very_long_sentence(self):
+        """ポーズ位置が無い長い文が最大文字数で分割されるかテスト"""
+        self.assertEqual(split_sentences("あ" * 10, max_chars=4), ["ああああ", "ああああ", "ああ"])
+
+    def test_blank(self):
+        """空白のみのテキストでは何も返さないかテスト"""
+        self.assertEqual(split_sentences(" \n　"), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
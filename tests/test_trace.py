@@ -0,0 +1,123 @@
+"""
+Tests for RecordingTtsControl and ReplayTtsControl
+"""
+
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+# テスト用のパッケージパスを追加
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from aivoice_python import (
+    AIVoiceTTsControl,
+    RecordedError,
+    RecordingTtsControl,
+    ReplayTtsControl,
+    SimulatedTtsControl,
+    TraceMismatchError,
+    load_trace,
+)
+
+
+def run_workload(control: AIVoiceTTsControl, out_dir: str):
+    """記録・再生で共通のワークロードを実行します"""
+    control.initialize(control.get_available_host_names()[0])
+    control.connect()
+    control.current_voice_preset_name = "琴葉 葵"
+    play_time = control.play_time("こんにちは。")
+    path = control.synthesize("さようなら。", os.path.join(out_dir, "out.wav"))
+    return play_time, control.voice_preset_names, control.synthesize_to_bytes("またね。").frames, path
+
+
+class TestTrace(unittest.TestCase):
+    """トレースの記録と再生のテスト（シミュレーター使用）"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.trace_path = os.path.join(self.tmp_dir, "trace.jsonl")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_record_and_replay(self):
+        """記録したワークロードをホスト無しで同じ結果で再生できるかテスト"""
+        with AIVoiceTTsControl(backend=SimulatedTtsControl(), record_trace=self.trace_path) as control:
+            recorded = run_workload(control, self.tmp_dir)
+
+        records = load_trace(self.trace_path)
+        self.assertIn({"op": "set", "name": "CurrentVoicePresetName", "args": ["琴葉 葵"]},
+                      [{k: r[k] for k in ("op", "name", "args")} for r in records])
+        saves = [r for r in records if r["name"] == "SaveAudioToFile"]
+        self.assertTrue(all("wav" in r for r in saves))
+
+        os.remove(recorded[3])
+        replay = ReplayTtsControl(self.trace_path, time_scale=0, strict=True)
+        with AIVoiceTTsControl(backend=replay) as control:
+            replayed = run_workload(control, self.tmp_dir)
+        self.assertEqual(replayed[:3], recorded[:3])
+        self.assertTrue(os.path.isfile(replayed[3]))
+        self.assertEqual(replay.remaining(), 0)
+
+    def test_replay_with_fewer_calls(self):
+        """記録時より呼び出しが減っても再生でき、残りの記録数が分かるかテスト"""
+        with AIVoiceTTsControl(backend=SimulatedTtsControl(), record_trace=self.trace_path, cache_metadata=False) as control:
+            control.initialize(control.get_available_host_names()[0])
+            control.connect()
+            for _ in range(3):
+                control.voice_names
+
+        replay = ReplayTtsControl(self.trace_path, time_scale=0)
+        with AIVoiceTTsControl(backend=replay) as control:
+            control.initialize(control.get_available_host_names()[0])
+            control.connect()
+            for _ in range(3):
+                self.assertEqual(control.voice_names, ["akane_west_emo_48", "aoi_emo_48"])
+        self.assertEqual(replay.remaining(), 2)
+
+        with self.assertRaises(TraceMismatchError):
+            replay.Play()
+
+    def test_strict_order(self):
+        """strict の場合に記録と異なる順序の呼び出しを検出するかテスト"""
+        stream = io.StringIO()
+        backend = RecordingTtsControl(SimulatedTtsControl(), stream)
+        backend.Initialize(backend.GetAvailableHostNames()[0])
+
+        replay = ReplayTtsControl(load_lines(stream), time_scale=0, strict=True)
+        with self.assertRaises(TraceMismatchError):
+            replay.Initialize("A.I.VOICE Editor")
+
+    def test_recorded_error(self):
+        """記録されたエラーが再生時に送出されるかテスト"""
+        stream = io.StringIO()
+        backend = RecordingTtsControl(SimulatedTtsControl(), stream)
+        with self.assertRaises(Exception):
+            backend.Connect()
+
+        replay = ReplayTtsControl(load_lines(stream), time_scale=0)
+        with self.assertRaises(RecordedError) as context:
+            replay.Connect()
+        self.assertEqual(context.exception.type_name, load_lines(stream)[0]["err"][0])
+
+    def test_time_scale(self):
+        """記録時の所要時間に倍率を掛けて待機するかテスト"""
+        records = [{"op": "call", "name": "Play", "args": [], "ret": None, "dt": 0.05}]
+        replay = ReplayTtsControl(records, time_scale=0.5)
+        with patch("time.sleep") as sleep:
+            replay.Play()
+        sleep.assert_called_once_with(0.025)
+
+
+def load_lines(stream: io.StringIO):
+    """StringIO に記録したトレースを読み込みます"""
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+if __name__ == '__main__':
+    unittest.main()